@@ -2,8 +2,9 @@
 The primary application script for Bike Share Sim.
 """
 from sim.sim import Simulation
+from sim.output import TextSink
 
 if __name__ == '__main__':
     
     # 120-minute simulation
-    Simulation(120)
+    Simulation(120, sink = TextSink())
@@ -0,0 +1,3 @@
+"""
+Benchmarks of the simulation, see benchmarks/run.py.
+"""
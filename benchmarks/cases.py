@@ -0,0 +1,114 @@
+"""
+What the benchmarks measure, shared by the standalone script (run.py) and
+the pytest-benchmark suite (test_benchmarks.py).
+
+There are two kinds of cases:
+
+- Micro cases time one hot path of a built simulation, such as drawing a
+  destination or finding a dock, many times over.
+- End-to-end cases time Simulation.run at a given number of stations and
+  length. The system grows with the number of stations at the density of
+  the default 9-station system: the same bikes and customers per station.
+"""
+from sim.sim import Simulation
+from sim.events import CHECK_IN
+from sim.consts import NUM_STATIONS, NUM_BIKES, LAMBDA, MEDIUM_STATION
+
+DAY = 1440
+
+# (num_stations, length) of every end-to-end case, by scale
+SCALES = {
+    'small': [(9, 60), (9, DAY), (100, DAY)],
+    'medium': [(9, 30 * DAY), (100, 7 * DAY), (1000, DAY), (10000, 60)],
+    'large': [(1000, 30 * DAY), (10000, DAY)],
+    'full': [(10000, 30 * DAY)],
+}
+
+def scale_cases(scale):
+    """
+    Returns
+    -------
+    The (num_stations, length) cases of the given scale and all smaller
+    ones, e.g. 'medium' runs the small cases too.
+    """
+    names = list(SCALES)
+    if scale not in names:
+        raise ValueError(f'scale must be one of {names}')
+
+    cases = []
+    for name in names[:names.index(scale) + 1]:
+        cases.extend(SCALES[name])
+    return cases
+
+def build(num_stations, engine = 'event', backend = 'objects', seed = 0,
+          **options):
+    """
+    Returns
+    -------
+    A Simulation that has not run yet, with num_stations stations and as
+    many bikes and customers per station as the default system.
+
+    Parameters
+    ----------
+    num_stations: [int >= 2] The number of stations.
+
+    engine: [str] (optional) 'event' or 'minute'.
+
+    backend: [str] (optional) 'objects' or 'arrays'.
+
+    seed: [int] (optional) Seeds the simulation.
+
+    options: Other keyword arguments for Simulation.
+    """
+    options.setdefault('dock_logs', False)
+    return Simulation(
+        engine = engine, backend = backend, seed = seed,
+        num_stations = num_stations, station_size = MEDIUM_STATION,
+        num_bikes = NUM_BIKES * num_stations // NUM_STATIONS,
+        checkout_rate = LAMBDA * num_stations / NUM_STATIONS,
+        layout = 'grid', **options
+    )
+
+def count_events(simulation):
+    """
+    Returns
+    -------
+    The number of customer events simulated so far: check-outs, check-ins,
+    failed check-outs and reroutes.
+    """
+    stats = simulation.stats
+    if simulation.engine == 'event':
+        riding = sum(1 for _, kind, _ in simulation.events if kind == CHECK_IN)
+    else:
+        riding = len(simulation.bikes_in_transit) \
+            + len(simulation.bikes_to_dock)
+    return 2 * stats.rides + riding + stats.unmet_demand + stats.reroutes
+
+def micro_cases(simulation):
+    """
+    Returns
+    -------
+    A dict of name to a callable running one hot path of the simulation
+    once. None of them change the docks, so they can be called any number
+    of times.
+    """
+    station = max(simulation.stations, key = lambda s: s.available_bikes)
+    other = simulation.num_stations - 1
+
+    return {
+        'get_available_dock': lambda: simulation.get_available_dock(
+            station, 'check out'
+        ),
+        'get_available_station': lambda: simulation.get_available_station(
+            'check out'
+        ),
+        'determine_destination': lambda: simulation.determine_destination(
+            station.id
+        ),
+        'determine_trip_duration':
+            lambda: simulation.determine_trip_duration(station.id, other),
+        'available_bikes': lambda: station.available_bikes,
+        'nearest_free_station': lambda: simulation.determine_reroute(
+            station.id
+        ),
+    }
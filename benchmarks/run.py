@@ -0,0 +1,207 @@
+"""
+Times the hot paths of the simulation and whole runs at growing scales, and
+writes the results to a JSON file.
+
+Run from the root of the repository, e.g.
+
+    python -m benchmarks.run --scale medium --output results.json
+    python -m benchmarks.run --compare results.json --output new.json
+
+End-to-end results report throughput in customer events per second (see
+cases.count_events), so runs of different lengths and sizes can be plotted
+on one curve. With --compare, every case found in an earlier results file is
+printed with its speed-up.
+"""
+import sys
+import json
+import time
+import timeit
+import platform
+import argparse
+import subprocess
+import numpy as np
+from sim.sim import Simulation
+from .cases import build, count_events, micro_cases, scale_cases, SCALES
+
+def time_micro(name, function, repeats):
+    """
+    Returns
+    -------
+    A result dict for one micro case: the best and mean seconds per call
+    over `repeats` rounds of as many calls as fill about 0.2 seconds.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeats, number)]
+    return {
+        'name': name,
+        'kind': 'micro',
+        'calls': number,
+        'times': times,
+        'best': min(times),
+        'mean': sum(times) / len(times),
+        'calls_per_second': 1 / min(times),
+    }
+
+def time_run(num_stations, length, engine, backend, repeats, seed = 0):
+    """
+    Returns
+    -------
+    A result dict for one end-to-end case: the seconds to build the
+    simulation and to run it, with the number of events simulated.
+    """
+    setups = []
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        simulation = build(num_stations, engine, backend, seed)
+        setups.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        simulation.run(length)
+        times.append(time.perf_counter() - start)
+
+    events = count_events(simulation)
+    return {
+        'name': f'run[{engine}-{backend}-{num_stations}-{length}]',
+        'kind': 'run',
+        'engine': engine,
+        'backend': backend,
+        'num_stations': num_stations,
+        'length': length,
+        'events': events,
+        'setup': min(setups),
+        'times': times,
+        'best': min(times),
+        'mean': sum(times) / len(times),
+        'events_per_second': events / max(min(times), 1e-9),
+    }
+
+def machine_info():
+    """
+    Returns
+    -------
+    A dict describing where and on what code the benchmarks ran.
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output = True, text = True,
+            check = True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+def compare(results, previous):
+    """
+    Returns
+    -------
+    Lines of text with the speed-up of every result over the result of the
+    same name in previous, >1 being faster now.
+    """
+    best = {result['name']: result['best'] for result in previous}
+    lines = []
+    for result in results:
+        if result['name'] in best:
+            speedup = best[result['name']] / result['best']
+            lines.append(f"{result['name']:<50} {speedup:6.2f}x")
+    return lines
+
+def parse_args(args = None):
+    parser = argparse.ArgumentParser(
+        description = 'Benchmark the bike share simulation.'
+    )
+    parser.add_argument(
+        '--scale', choices = list(SCALES), default = 'small',
+        help = 'largest end-to-end cases to run (default: small)'
+    )
+    parser.add_argument(
+        '--engines', nargs = '+', choices = Simulation.engines,
+        default = ['event', 'minute']
+    )
+    parser.add_argument(
+        '--backends', nargs = '+', choices = Simulation.backends,
+        default = ['objects']
+    )
+    parser.add_argument(
+        '--repeats', type = int, default = 3,
+        help = 'rounds per case; the best is reported (default: 3)'
+    )
+    parser.add_argument(
+        '--micro-stations', type = int, nargs = '+', default = [9, 10000],
+        help = 'system sizes for the micro cases (default: 9 10000)'
+    )
+    parser.add_argument(
+        '--skip-micro', action = 'store_true', help = 'only time whole runs'
+    )
+    parser.add_argument(
+        '--skip-runs', action = 'store_true', help = 'only time hot paths'
+    )
+    parser.add_argument(
+        '--output', help = 'JSON file to write the results to'
+    )
+    parser.add_argument(
+        '--compare', help = 'JSON results of an earlier run to compare to'
+    )
+    return parser.parse_args(args)
+
+def main(args = None):
+    """
+    Runs the benchmarks chosen on the command line and returns the results
+    written to --output.
+    """
+    options = parse_args(args)
+    if options.repeats < 1:
+        raise ValueError('repeats must be at least 1')
+
+    results = []
+    if not options.skip_micro:
+        for num_stations in options.micro_stations:
+            for backend in options.backends:
+                simulation = build(num_stations, backend = backend)
+                for name, function in micro_cases(simulation).items():
+                    result = time_micro(
+                        f'{name}[{backend}-{num_stations}]', function,
+                        options.repeats
+                    )
+                    result['num_stations'] = num_stations
+                    result['backend'] = backend
+                    results.append(result)
+                    print(f"{result['name']:<50} "
+                          f"{result['best'] * 1e6:10.2f} us/call")
+
+    if not options.skip_runs:
+        for num_stations, length in scale_cases(options.scale):
+            for engine in options.engines:
+                for backend in options.backends:
+                    result = time_run(
+                        num_stations, length, engine, backend,
+                        options.repeats
+                    )
+                    results.append(result)
+                    print(f"{result['name']:<50} {result['best']:10.3f} s "
+                          f"{result['events_per_second']:12,.0f} events/s")
+
+    output = {'machine': machine_info(), 'results': results}
+    if options.output is not None:
+        with open(options.output, 'w') as file:
+            json.dump(output, file, indent = 2)
+
+    if options.compare is not None:
+        with open(options.compare) as file:
+            previous = json.load(file)['results']
+        print('\nSpeed-up over', options.compare)
+        print('\n'.join(compare(results, previous)))
+
+    return output
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,25 @@
+"""
+The benchmarks as a pytest-benchmark suite, skipped unless pytest-benchmark
+is installed. Runs the micro cases and the small end-to-end cases:
+
+    python -m pytest benchmarks --benchmark-json results.json
+"""
+import pytest
+from .cases import build, micro_cases, scale_cases
+
+pytest.importorskip('pytest_benchmark')
+
+MICRO = list(micro_cases(build(9)))
+
+@pytest.mark.parametrize('num_stations', [9, 1000])
+@pytest.mark.parametrize('name', MICRO)
+def test_micro(benchmark, name, num_stations):
+    benchmark(micro_cases(build(num_stations))[name])
+
+@pytest.mark.parametrize('engine', ['event', 'minute'])
+@pytest.mark.parametrize('num_stations, length', scale_cases('small'))
+def test_run(benchmark, engine, num_stations, length):
+    benchmark.pedantic(
+        lambda simulation: simulation.run(length),
+        setup = lambda: ((build(num_stations, engine),), {}), rounds = 3
+    )
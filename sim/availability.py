@@ -0,0 +1,82 @@
+"""
+An index of which stations currently have bikes to rent or docks to return to.
+"""
+import numpy as np
+from .indexset import IndexedSet
+
+class AvailabilityIndex:
+    """
+    Keeps the ids of stations with at least one bike and of stations with at
+    least one empty dock. Stations report every change in occupancy here, so
+    picking a random available station costs the same no matter how many
+    stations are in the system.
+
+    The number of bikes and empty docks of every station is also kept in
+    the arrays self.bikes and self.docks, so fill levels can be read for all
+    stations at once.
+    """
+
+    def __init__(self, stations):
+        """
+        Parameters
+        ----------
+        stations: [list of Station] The stations to watch. Station ids must 
+                  match their list indexes.
+        """
+        self.with_bikes = IndexedSet()
+        self.with_docks = IndexedSet()
+        self.bikes = np.zeros(len(stations), dtype = np.int32)
+        self.docks = np.zeros(len(stations), dtype = np.int32)
+
+        for station in stations:
+            station.availability = self
+            self.update(station)
+
+    def update(self, station):
+        """
+        Files the station under the right sets after its occupancy changed.
+
+        Parameters
+        ----------
+        station: [Station] The station that changed.
+        """
+        self.bikes[station.id] = station.available_bikes
+        self.docks[station.id] = station.available_docks
+
+        if station.available_bikes:
+            self.with_bikes.add(station.id)
+        else:
+            self.with_bikes.discard(station.id)
+
+        if station.available_docks:
+            self.with_docks.add(station.id)
+        else:
+            self.with_docks.discard(station.id)
+
+    def fill_levels(self):
+        """
+        Returns
+        -------
+        An array with the share of docks holding a bike at every station.
+        """
+        return self.bikes / np.maximum(self.bikes + self.docks, 1)
+
+    def sample(self, availability, rng):
+        """
+        Returns
+        -------
+        The id of a uniformly random station with at least one available bike
+        or one available dock, or None if there is no such station.
+
+        Parameters
+        ----------
+        availability: [str] Either 'check in' or 'check out'
+
+        rng: [BlockRNG] The random number source of the simulation.
+        """
+        if availability == 'check out':
+            return self.with_bikes.sample(rng)
+        elif availability == 'check in':
+            return self.with_docks.sample(rng)
+
+        raise ValueError("availability must be 'check in' or 'check out'")
@@ -0,0 +1,269 @@
+"""
+Batteries of electric bikes and which docked bikes are ready to ride.
+
+The charge of a bike only ever changes at a constant rate between the
+moments it is touched: it charges while docked, drains while ridden and
+holds still on a rebalancing truck. BatteryBank stores the charge of every
+bike in arrays along with the time and rate it was last set at, so the
+charge at any later time is one closed-form expression, and nothing is
+updated minute by minute.
+
+ReadyDocks indexes which docks hold a bike that can be checked out: any
+classic bike, or an electric bike charged to ELECTRIC_MIN_CHARGE, kept apart
+by bike type. A docked bike that still needs charging is filed under the
+minute it will be ready, so finding a ready bike of either type never scans
+the docks or the bikes.
+"""
+import math
+import heapq
+import numpy as np
+from .indexset import IndexedSet
+from .fleet import CLASSIC, ELECTRIC
+from .consts import (
+    ELECTRIC_MAX_CHARGE, ELECTRIC_MIN_CHARGE, ELECTRIC_CHARGE_RATE,
+    ELECTRIC_DRAIN_RATE
+)
+
+# Change in charge per minute
+CHARGING = ELECTRIC_CHARGE_RATE
+RIDING = -ELECTRIC_DRAIN_RATE
+IDLE = 0
+
+def charge_after(charge, rate, minutes):
+    """
+    Returns
+    -------
+    The charge of a battery after some minutes at a constant rate, between
+    0 and ELECTRIC_MAX_CHARGE. Works on scalars and arrays alike.
+
+    Parameters
+    ----------
+    charge: [float | array] The charge to start from.
+
+    rate: [int | array] The change in charge per minute, e.g. CHARGING.
+
+    minutes: [int | array] How long the rate held.
+    """
+    return np.clip(charge + rate * minutes, 0, ELECTRIC_MAX_CHARGE)
+
+class BatteryBank:
+    """
+    The charge of every bike, indexed by bike id, stored as the charge at the
+    last time the bike was touched and the rate it has changed at since.
+    Classic bikes are registered too, and simply never change.
+    """
+
+    def __init__(self, num_bikes = 0):
+        """
+        Parameters
+        ----------
+        num_bikes: [int >= 0] (optional) How many bikes to make room for up
+                   front. More room is made as needed.
+        """
+        self.electric = np.zeros(num_bikes, dtype = bool)
+        self.charge = np.zeros(num_bikes, dtype = np.float64)
+        self.since = np.zeros(num_bikes, dtype = np.int64)
+        self.rate = np.zeros(num_bikes, dtype = np.int8)
+
+    def __len__(self):
+        return len(self.electric)
+
+    def add(self, bike_id, electric, time = 0, charge = ELECTRIC_MAX_CHARGE):
+        """
+        Registers a docked bike with the given charge.
+        """
+        if bike_id >= len(self):
+            capacity = max(bike_id + 1, 2 * len(self))
+            for name in ('electric', 'charge', 'since', 'rate'):
+                setattr(self, name, np.resize(getattr(self, name), capacity))
+
+        self.electric[bike_id] = electric
+        self.charge[bike_id] = charge if electric else 0
+        self.since[bike_id] = time
+        self.rate[bike_id] = CHARGING if electric else IDLE
+
+    def charge_at(self, bike_id, time):
+        """
+        Returns
+        -------
+        The charge of a bike at the given time.
+        """
+        minutes = time - int(self.since[bike_id])
+        charge = float(self.charge[bike_id]) \
+            + int(self.rate[bike_id]) * minutes
+        return min(max(charge, 0), ELECTRIC_MAX_CHARGE)
+
+    def charges(self, time):
+        """
+        Returns
+        -------
+        An array with the charge of every bike at the given time, computed
+        for all bikes at once.
+        """
+        return charge_after(self.charge, self.rate, time - self.since)
+
+    def set_rate(self, bike_id, time, rate):
+        """
+        Settles a bike's charge up to the given time and changes the rate it
+        changes at from then on. Does nothing to classic bikes.
+
+        Returns
+        -------
+        The charge of the bike at the given time.
+        """
+        if not self.electric[bike_id]:
+            return 0
+        charge = self.charge_at(bike_id, time)
+        self.charge[bike_id] = charge
+        self.since[bike_id] = time
+        self.rate[bike_id] = rate
+        return charge
+
+    def ready_at(self, bike_id):
+        """
+        Returns
+        -------
+        The first minute at which a charging bike can be checked out. Classic
+        bikes are always ready.
+        """
+        if not self.electric[bike_id]:
+            return int(self.since[bike_id])
+
+        missing = ELECTRIC_MIN_CHARGE - float(self.charge[bike_id])
+        wait = max(0, math.ceil(missing / CHARGING))
+        return int(self.since[bike_id]) + wait
+
+class ReadyDocks:
+    """
+    Per bike type and station, the docks holding a bike that can be checked
+    out, and per bike type, the stations that have at least one. Methods
+    taking a bike_type of None look at bikes of both types.
+
+    Bikes docked with too little charge wait in a heap keyed by the minute
+    they will be ready and are moved over by refresh(). Entries of bikes
+    that left their dock before then are recognised by their docking number
+    and skipped.
+    """
+
+    def __init__(self, num_stations, bank):
+        """
+        Parameters
+        ----------
+        num_stations: [int] The number of stations.
+
+        bank: [BatteryBank] The batteries of the bikes.
+        """
+        self.bank = bank
+
+        # Indexed [bike_type][station_id], CLASSIC first
+        self.ready = [
+            [IndexedSet() for _ in range(num_stations)]
+            for _ in (CLASSIC, ELECTRIC)
+        ]
+        self.with_ready = [IndexedSet() for _ in (CLASSIC, ELECTRIC)]
+
+        # Stations with a ready bike of any type
+        self.with_any = IndexedSet()
+
+        # (ready_at, sequence, station, dock, bike, docking) of bikes still
+        # charging. A bike's docking number goes up whenever it docks.
+        self.charging = []
+        self.dockings = np.zeros(len(bank), dtype = np.int64)
+        self._seq = 0
+
+    def count(self, station_id, bike_type = None):
+        """
+        Returns
+        -------
+        The number of bikes of the given type ready to check out at the
+        station.
+        """
+        if bike_type is None:
+            return len(self.ready[CLASSIC][station_id]) \
+                + len(self.ready[ELECTRIC][station_id])
+        return len(self.ready[bike_type][station_id])
+
+    def docked(self, station_id, dock_id, bike_id, time):
+        """
+        Starts charging a bike placed in a dock, filing it as ready or as
+        charging until it is.
+        """
+        self.bank.set_rate(bike_id, time, CHARGING)
+        if bike_id >= len(self.dockings):
+            self.dockings = np.resize(self.dockings, len(self.bank))
+        self.dockings[bike_id] += 1
+
+        ready_at = self.bank.ready_at(bike_id)
+        if ready_at <= time:
+            self._add(station_id, dock_id, bike_id)
+        else:
+            heapq.heappush(self.charging, (
+                ready_at, self._seq, station_id, dock_id, bike_id,
+                int(self.dockings[bike_id])
+            ))
+            self._seq += 1
+
+    def undocked(self, station_id, dock_id, bike_id, time, riding = True):
+        """
+        Takes a bike out of a dock, after which its battery drains while it
+        is ridden, or holds when it is not.
+        """
+        self.bank.set_rate(bike_id, time, RIDING if riding else IDLE)
+        self.dockings[bike_id] += 1
+
+        bike_type = int(self.bank.electric[bike_id])
+        ready = self.ready[bike_type][station_id]
+        ready.discard(dock_id)
+        if not ready:
+            self.with_ready[bike_type].discard(station_id)
+            if not self.count(station_id):
+                self.with_any.discard(station_id)
+
+    def refresh(self, time):
+        """
+        Files every bike charged by the given time as ready.
+        """
+        charging = self.charging
+        while charging and charging[0][0] <= time:
+            _, _, station_id, dock_id, bike_id, docking = \
+                heapq.heappop(charging)
+            if self.dockings[bike_id] == docking:
+                self._add(station_id, dock_id, bike_id)
+
+    def sample_station(self, rng, bike_type = None):
+        """
+        Returns
+        -------
+        A uniformly random station with a bike of the given type ready to
+        check out, or None.
+        """
+        if bike_type is None:
+            return self.with_any.sample(rng)
+        return self.with_ready[bike_type].sample(rng)
+
+    def sample_dock(self, station_id, rng, bike_type = None):
+        """
+        Returns
+        -------
+        A uniformly random dock of the station holding a bike of the given
+        type ready to check out, or None.
+        """
+        if bike_type is not None:
+            return self.ready[bike_type][station_id].sample(rng)
+
+        # One draw over both types, as if they were a single set
+        classic = self.ready[CLASSIC][station_id]
+        electric = self.ready[ELECTRIC][station_id]
+        total = len(classic) + len(electric)
+        if not total:
+            return None
+        position = rng.integers(total)
+        if position < len(classic):
+            return classic[position]
+        return electric[position - len(classic)]
+
+    def _add(self, station_id, dock_id, bike_id):
+        bike_type = int(self.bank.electric[bike_id])
+        self.ready[bike_type][station_id].add(dock_id)
+        self.with_ready[bike_type].add(station_id)
+        self.with_any.add(station_id)
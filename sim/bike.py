@@ -9,18 +9,19 @@ class Bike:
     (e.g. price()) will only work for subclasses of Bike.
     """
 
-    def __init__(self, id):
+    def __init__(self, id, trip_id = 0):
         """
         Parameters
         ----------
         id: [int >= 0] the id no. for the bike.
 
-        rate: [float >= 0] the cost per 30-minute ride.
+        trip_id: [int >= 0] (optional) The number of trips already ridden, 
+                 e.g. when restoring a bike from a snapshot.
         """
         assert_id(id)
 
         self._id = id
-        self._trip_id = 0
+        self._trip_id = trip_id
 
         # Overridden by subclasses
         self._base_rate = None
@@ -34,6 +35,14 @@ class Bike:
     def trip_id(self):
         return self._trip_id
 
+    @property
+    def base_rate(self):
+        return self._base_rate
+
+    @property
+    def add_rate(self):
+        return self._add_rate
+
     def ride(self):
         """
         Triggers a bike ride. Every ride is logged and the condition of the 
@@ -69,41 +78,20 @@ class ClassicBike(Bike):
     """
     Subclass for the classic bike option.
     """
-    def __init__(self, id):
-        super().__init__(id)
+    def __init__(self, id, trip_id = 0):
+        super().__init__(id, trip_id)
         self._base_rate = CLASSIC_BASE_RATE
         self._add_rate = CLASSIC_ADD_RATE
 
-    @property
-    def base_rate(self):
-        return self._base_rate
-
-    @property
-    def add_rate(self):
-        return self._add_rate
-
 class ElectricBike(Bike):
     """
-    Subclass for the electric bike option which introduces battery 
-    consideration.
+    Subclass for the electric bike option, which costs more to ride. The
+    battery of every electric bike in a simulation is kept in a BatteryBank,
+    see sim/battery.py: bank.charge_at(bike.id, time) is its charge and
+    bank.ready_at(bike.id) the first minute it can be checked out.
     """
 
-    def __init__(self, id):
-        super().__init__(id)
+    def __init__(self, id, trip_id = 0):
+        super().__init__(id, trip_id)
         self._base_rate = ELECTRIC_BASE_RATE
         self._add_rate = ELECTRIC_ADD_RATE
-        self.charge = ELECTRIC_MAX_CHARGE
-    
-    def update_charge(self):
-        """
-        Figure out how to deal with this. One possibility:
-
-        - Start at 100
-        - Each minute drains 2 charge
-        - Each minute in a station recharges 5 charge
-        - Motor stops working if charge reaches 0
-        - Can only check one out if charge is above 60 (enough for 30-min ride)
-        """
-        pass
-
-
@@ -10,6 +10,9 @@ CLASSIC_ADD_RATE = 0.10
 ELECTRIC_BASE_RATE = 5.25
 ELECTRIC_ADD_RATE =  0.20
 ELECTRIC_MAX_CHARGE = 100
+ELECTRIC_MIN_CHARGE = 60   # Needed to check out, enough for a 30-min ride
+ELECTRIC_CHARGE_RATE = 5   # Charge gained per minute docked
+ELECTRIC_DRAIN_RATE = 2    # Charge lost per minute ridden
 
 ### SIMULATION CONSTANTS ###
 
@@ -21,6 +24,6 @@ LARGE_STATION = 20 # No. of docks
 
 NUM_BIKES = 80    # Total no. of bikes in system
 
-LAMBDA = 4 # 1 ride / 10 mins or 0.1 ride / min
+LAMBDA = 0.1 # Mean checkouts per minute across the system (1 ride / 10 mins)
 LENGTH = 60  # Length of simulation in minutes
 SPEED = 0.5  # Distance units per minute
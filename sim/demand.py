@@ -0,0 +1,140 @@
+"""
+Time-varying, per-station checkout demand.
+"""
+import numpy as np
+
+MINUTES_PER_HOUR = 60
+HOURS_PER_DAY = 24
+DAYS_PER_WEEK = 7
+
+class DemandProfile:
+    """
+    Mean checkouts per minute for every station, for every hour of the day or
+    every hour of the week. Minute 0 of a simulation is midnight (on Monday
+    for weekly profiles), and the profile repeats once it runs out.
+
+    Rates are constant within each hour, so demand is sampled as a 
+    piecewise-constant non-homogeneous Poisson process: one vectorized draw
+    per hour covering all of its minutes and stations.
+    """
+
+    def __init__(self, rates):
+        """
+        Parameters
+        ----------
+        rates: [array-like] Non-negative mean checkouts per minute, shaped
+               (24, N) for a daily profile or (7, 24, N) for a weekly one, 
+               where N is the number of stations. A weekly profile may also
+               be given one row per hour of the week, (168, N), the shape 
+               it is stored and saved in.
+        """
+        rates = np.array(rates, dtype = np.float32)
+
+        week = (DAYS_PER_WEEK, HOURS_PER_DAY)
+        if rates.ndim == 3 and rates.shape[:2] == week:
+            rates = rates.reshape(DAYS_PER_WEEK * HOURS_PER_DAY, -1)
+        elif rates.ndim != 2 or rates.shape[0] not in (
+                HOURS_PER_DAY, DAYS_PER_WEEK * HOURS_PER_DAY):
+            raise ValueError(
+                'rates must be shaped (24, N), (7, 24, N) or (168, N)'
+            )
+
+        if np.any(rates < 0):
+            raise ValueError('rates must be greater than or equal to zero')
+
+        # One row per hour of the period covered by the profile
+        self.rates = rates
+
+    @property
+    def num_stations(self):
+        return self.rates.shape[1]
+
+    @property
+    def period(self):
+        """
+        Returns
+        -------
+        The number of hours after which the profile repeats.
+        """
+        return self.rates.shape[0]
+
+    @classmethod
+    def from_curve(cls, curve, station_weights, rate):
+        """
+        Returns
+        -------
+        A DemandProfile where every station follows the same shape over the
+        day (or week), scaled by how busy the station is.
+
+        Parameters
+        ----------
+        curve: [array-like] Relative demand for each hour, 24 or 7 * 24 long.
+
+        station_weights: [array-like] Relative demand at each station.
+
+        rate: [float] The mean checkouts per minute across the system, 
+              averaged over the whole period.
+        """
+        curve = np.asarray(curve, dtype = float)
+        station_weights = np.asarray(station_weights, dtype = float)
+
+        curve = curve / curve.mean()
+        station_weights = station_weights / station_weights.sum()
+        rates = rate * np.outer(curve, station_weights)
+
+        if len(curve) == DAYS_PER_WEEK * HOURS_PER_DAY:
+            rates = rates.reshape(DAYS_PER_WEEK, HOURS_PER_DAY, -1)
+        return cls(rates)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns
+        -------
+        The DemandProfile saved at path, either a .npy file holding the rates
+        array or a .npz file holding it under the key 'rates'.
+        """
+        data = np.load(path)
+        if hasattr(data, 'files'):
+            with data:
+                return cls(data['rates'])
+        return cls(data)
+
+    def save(self, path):
+        """
+        Saves the rates to a .npy file at path.
+        """
+        np.save(path, self.rates)
+
+    def sample(self, length, generator, start = 0):
+        """
+        Returns
+        -------
+        A (length, N) integer numpy array with the number of customers trying 
+        to check out a bike each minute at each station, in the smallest
+        unsigned dtype that holds the largest count.
+
+        Parameters
+        ----------
+        length: [int] The number of minutes to sample.
+
+        generator: [numpy.random.Generator] Where to draw from.
+
+        start: [int] (optional) The minute of the simulation to start from.
+        """
+        checkouts = np.zeros((length, self.num_stations), dtype = np.uint32)
+
+        # Walk through the hours overlapping [start, start + length)
+        minute = start
+        while minute < start + length:
+            hour = minute // MINUTES_PER_HOUR
+            end = min((hour + 1) * MINUTES_PER_HOUR, start + length)
+            rates = self.rates[hour % self.period]
+
+            checkouts[minute - start:end - start] = generator.poisson(
+                rates, (end - minute, self.num_stations)
+            )
+            minute = end
+
+        largest = int(checkouts.max()) if checkouts.size else 0
+        return checkouts.astype(np.min_scalar_type(largest))
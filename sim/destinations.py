@@ -0,0 +1,98 @@
+"""
+Samplers that pick where a customer rides to from a given station.
+
+Both samplers draw a destination without allocating any arrays per trip, and
+neither ever returns the station the customer started from.
+"""
+import numpy as np
+
+class UniformDestinations:
+    """
+    Every other station is equally likely.
+    """
+
+    def __init__(self, num_stations):
+        """
+        Parameters
+        ----------
+        num_stations: [int >= 2] The number of stations in the system.
+        """
+        if num_stations < 2:
+            raise ValueError('there must be at least 2 stations to ride between')
+
+        self.num_stations = num_stations
+
+    def sample(self, origin, rng):
+        """
+        Returns
+        -------
+        The id of a random destination station other than the origin.
+
+        Parameters
+        ----------
+        origin: [int] The id of the station the trip starts from.
+
+        rng: [BlockRNG] The random number source of the simulation.
+        """
+        # Draw from the other N - 1 stations by skipping over the origin
+        destination = rng.integers(self.num_stations - 1)
+        if destination >= origin:
+            destination += 1
+        return destination
+
+class WeightedDestinations:
+    """
+    Destinations follow an origin-destination demand matrix, which lets some 
+    routes be much busier than others. Each row of the matrix is turned into 
+    cumulative weights once, so a trip is one uniform draw and a binary 
+    search over the row.
+    """
+
+    def __init__(self, weights):
+        """
+        Parameters
+        ----------
+        weights: [array-like] N x N non-negative demand where [i, j] is how 
+                 often trips from station i go to station j. Only relative 
+                 sizes within a row matter, and the diagonal is ignored.
+        """
+        weights = np.array(weights, dtype = float)
+        num_stations = len(weights)
+
+        if weights.shape != (num_stations, num_stations):
+            raise ValueError('weights must be an N x N array')
+        if np.any(weights < 0):
+            raise ValueError('weights must be greater than or equal to zero')
+
+        # No joy rides back to the same station
+        np.fill_diagonal(weights, 0)
+
+        totals = weights.sum(axis = 1, keepdims = True)
+        if np.any(totals == 0):
+            raise ValueError('every station needs at least one destination')
+
+        self.num_stations = num_stations
+        self.cumulative = np.cumsum(weights / totals, axis = 1)
+
+        # Rounding can leave a row short of 1, so from the last station with
+        # any demand onwards, set it to 1 exactly. Draws then never land past
+        # it, on the origin or on a station nobody rides to.
+        last = num_stations - 1 - np.argmax(weights[:, ::-1] > 0, axis = 1)
+        self.cumulative[np.arange(num_stations) >= last[:, np.newaxis]] = 1.0
+
+    def sample(self, origin, rng):
+        """
+        Returns
+        -------
+        The id of a random destination station drawn from the origin's row
+        of the demand matrix.
+
+        Parameters
+        ----------
+        origin: [int] The id of the station the trip starts from.
+
+        rng: [BlockRNG] The random number source of the simulation.
+        """
+        return int(
+            self.cumulative[origin].searchsorted(rng.random(), 'right')
+        )
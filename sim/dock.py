@@ -8,19 +8,27 @@ class Dock:
     """
     conditions = CONDITIONS
 
-    def __init__(self, id, bike = None):
+    def __init__(self, id, bike = None, keep_log = True):
         """
         Parameters
         ----------
         id: [int >= 0] the id no. for the station.
 
         bike: [Bike | None] The Bike or None value to occupy this dock.
+
+        keep_log: [bool] (optional) Whether to keep a record of every check-in
+                  and check-out at this dock in self.log.
         """
         assert_id(id)
 
         self._id = id
         self._bike = bike
         self._log = []
+        self._keep_log = keep_log
+
+        # Set by Station when this dock is placed into one of its spaces
+        self._station = None
+        self._index = None
     
     @property
     def id(self):
@@ -33,15 +41,34 @@ class Dock:
     @bike.setter
     def bike(self, bike):
         if (bike == None) or (isinstance(bike, Bike)):
+            was_empty = self._bike is None
             self._bike = bike
+
+            # Keep the station's occupancy counters up to date
+            if self._station is not None and was_empty != (bike is None):
+                self._station.dock_changed(self._index, bike is not None)
         else:
             raise TypeError('bike must be a Bike object or None')
     
     @property
     def log(self):
         return self._log
+
+    def attach(self, station, index):
+        """
+        Registers the station that holds this dock so that it can be told 
+        whenever a bike arrives or leaves.
+
+        Parameters
+        ----------
+        station: [Station] The station this dock belongs to.
+
+        index: [int] The position of this dock in station.docks.
+        """
+        self._station = station
+        self._index = index
     
-    def check_in(self, bike, time, duration):
+    def check_in(self, bike, time, duration, price = None):
         """
         Check a bike into this dock.
 
@@ -52,17 +79,27 @@ class Dock:
         time: [int] The time at which the bike is checked in.
 
         duration: [int] The number of minutes this trip lasted
+
+        price: [float] (optional) The price of the trip from a pricing plan,
+               see sim/pricing.py. By default the bike prices the trip.
+
+        Returns
+        -------
+        The price of the trip.
         """
         self.bike = bike
-        price = self.bike.price(duration)
+        if price is None:
+            price = self.bike.price(duration)
 
-        self._log.append({
-            'bike_id': self.bike.id,
-            'trip_id': self.bike.trip_id,
-            'end_time': time,
-            'price': price,
-            'duration': duration
-        })
+        if self._keep_log:
+            self._record({
+                'bike_id': self.bike.id,
+                'trip_id': self.bike.trip_id,
+                'end_time': time,
+                'price': price,
+                'duration': duration
+            }, 'end_station_id')
+        return price
 
     def check_out(self, time):
         """
@@ -74,15 +111,27 @@ class Dock:
         """
         self.bike.ride()
 
-        self._log.append({
-            'bike_id': self.bike.id,
-            'trip_id': self.bike.trip_id,
-            'start_time': time
-        })
+        if self._keep_log:
+            self._record({
+                'bike_id': self.bike.id,
+                'trip_id': self.bike.trip_id,
+                'start_time': time
+            }, 'start_station_id')
         
         # Store bike to return before clearing self.bike
         bike = self.bike
         self.bike = None
         return bike
 
+    def _record(self, trip, station_key):
+        """
+        Appends a trip to the log. If this dock belongs to a station, the
+        station id is stamped into the trip under station_key and the 
+        station's cached log is invalidated.
+        """
+        if self._station is not None:
+            trip[station_key] = self._station.id
+            self._station.log_changed()
+        self._log.append(trip)
+
 
@@ -0,0 +1,83 @@
+"""
+The event queue that drives the discrete-event engine of the simulation.
+"""
+import heapq
+
+# Event kinds. Within the same minute, check-outs are handled before check-ins
+# and both before rebalancing trucks, to match the order of the 
+# minute-by-minute engine.
+CHECK_OUT = 0
+CHECK_IN = 1
+REBALANCE = 2
+PICK_UP = 3
+DROP_OFF = 4
+
+class EventQueue:
+    """
+    A priority queue of simulation events keyed by (time, kind, sequence).
+
+    The sequence number breaks ties so that events scheduled for the same
+    minute and of the same kind are handled in the order they were scheduled.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        """
+        Iterates over (time, kind, payload) in no particular order.
+        """
+        return ((time, kind, payload) for time, kind, _, payload in self._heap)
+
+    def in_order(self):
+        """
+        Returns
+        -------
+        A list of the (time, kind, payload) of every event in the order they
+        will be popped. The queue is left untouched.
+        """
+        return [
+            (time, kind, payload) 
+            for time, kind, _, payload in sorted(
+                self._heap, key = lambda event: event[:3]
+            )
+        ]
+
+    def push(self, time, kind, payload):
+        """
+        Schedules a new event.
+
+        Parameters
+        ----------
+        time: [int >= 0] The minute at which the event happens.
+
+        kind: [int] One of the event kinds above.
+
+        payload: [object] Whatever the handler for this kind of event needs.
+        """
+        heapq.heappush(self._heap, (time, kind, self._seq, payload))
+        self._seq += 1
+
+    def pop(self):
+        """
+        Returns
+        -------
+        The (time, kind, payload) of the earliest event, removing it from the
+        queue.
+        """
+        time, kind, _, payload = heapq.heappop(self._heap)
+        return time, kind, payload
+
+    def peek_time(self):
+        """
+        Returns
+        -------
+        The time of the earliest event, or None if the queue is empty.
+        """
+        if self._heap:
+            return self._heap[0][0]
+        return None
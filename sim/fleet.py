@@ -0,0 +1,453 @@
+"""
+A compact, array-backed alternative to the Station, Dock and Bike objects.
+
+Fleet keeps the state of every station, dock and bike in a handful of NumPy
+arrays instead of one Python object per dock and bike. StationView, DockView
+and BikeView are thin facades over those arrays with the same interface as
+Station, Dock and Bike, so the simulation (and its tests) can use either
+backend.
+
+Docks are numbered per station as usual, and stored one station after
+another in flat arrays: the dock at list index d of station s lives at flat
+index offsets[s] + d.
+"""
+import numpy as np
+from .bike import ElectricBike
+from .assert_helpers import assert_greater_than_zero
+from .consts import (
+    CLASSIC_BASE_RATE, CLASSIC_ADD_RATE, ELECTRIC_BASE_RATE, ELECTRIC_ADD_RATE
+)
+
+# Bike types, used as indexes into the rate tables below
+CLASSIC = 0
+ELECTRIC = 1
+
+BASE_RATES = (CLASSIC_BASE_RATE, ELECTRIC_BASE_RATE)
+ADD_RATES = (CLASSIC_ADD_RATE, ELECTRIC_ADD_RATE)
+
+# Docks with no bike hold this bike id
+EMPTY = -1
+
+class Fleet:
+    """
+    Struct-of-arrays state of the whole bike share system.
+
+    Each station keeps two swap-remove lists of its dock indexes, one of
+    occupied docks and one of free docks, stored in flat arrays of the same
+    layout as the docks. They behave exactly like Station.occupied_docks and
+    Station.free_docks, so both backends pick the same docks for the same
+    random draws.
+    """
+
+    def __init__(self, locations, sizes, num_bikes = 0, keep_logs = True):
+        """
+        Parameters
+        ----------
+        locations: [array-like] N coordinate pairs, one per station.
+
+        sizes: [array-like] The number of docks at each of the N stations.
+
+        num_bikes: [int >= 0] (optional) How many bikes to make room for up
+                   front. More room is made as needed.
+
+        keep_logs: [bool] (optional) Whether every dock keeps a record of its
+                   check-ins and check-outs, like Dock.log.
+        """
+        self.locations = np.asarray(locations)
+        self.sizes = np.asarray(sizes, dtype = np.int32)
+        num_stations = len(self.sizes)
+
+        if self.locations.shape != (num_stations, 2):
+            raise ValueError('there must be one coordinate pair per station')
+        if np.any(self.sizes < 1):
+            raise ValueError('every station needs at least one dock')
+
+        self.offsets = np.zeros(num_stations + 1, dtype = np.int64)
+        np.cumsum(self.sizes, out = self.offsets[1:])
+        num_docks = int(self.offsets[-1])
+
+        # Dock state
+        self.dock_bike = np.full(num_docks, EMPTY, dtype = np.int32)
+        local_ids = np.arange(num_docks) - np.repeat(
+            self.offsets[:-1], self.sizes
+        )
+
+        # Swap-remove lists of occupied and free dock indexes per station.
+        # *_pos is the position of each dock in its list, or -1.
+        self.occupied = np.zeros(num_docks, dtype = np.int32)
+        self.occupied_pos = np.full(num_docks, -1, dtype = np.int32)
+        self.bike_count = np.zeros(num_stations, dtype = np.int32)
+
+        self.free = local_ids.astype(np.int32)
+        self.free_pos = local_ids.astype(np.int32)
+        self.free_count = self.sizes.copy()
+
+        # Bike state
+        self.bike_trip = np.zeros(num_bikes, dtype = np.int32)
+        self.bike_type = np.zeros(num_bikes, dtype = np.int8)
+
+        # Half-records of trips per flat dock index, created on first use,
+        # and a counter per station bumped whenever one of its docks logs
+        self.logs = {}
+        self.keep_logs = keep_logs
+        self.log_version = np.zeros(num_stations, dtype = np.int64)
+
+        self.stations = [StationView(self, i) for i in range(num_stations)]
+
+    @property
+    def num_bikes(self):
+        return len(self.bike_trip)
+
+    def add_bike(self, bike_id, bike_type = CLASSIC, trip_id = 0):
+        """
+        Registers a bike, making room for its id if needed.
+
+        Parameters
+        ----------
+        bike_id: [int >= 0] The id of the bike.
+
+        bike_type: [int] (optional) CLASSIC or ELECTRIC.
+
+        trip_id: [int >= 0] (optional) The number of trips already ridden.
+        """
+        if bike_id >= self.num_bikes:
+            capacity = max(bike_id + 1, 2 * self.num_bikes)
+            self.bike_trip = np.resize(self.bike_trip, capacity)
+            self.bike_type = np.resize(self.bike_type, capacity)
+
+        self.bike_trip[bike_id] = trip_id
+        self.bike_type[bike_id] = bike_type
+
+    def place(self, station_id, dock_id, bike_id):
+        """
+        Puts a bike into an empty dock without logging a trip.
+        """
+        flat = self.offsets[station_id] + dock_id
+        if self.dock_bike[flat] != EMPTY:
+            raise ValueError('dock already holds a bike')
+
+        self.dock_bike[flat] = bike_id
+        self._discard(self.free, self.free_pos, self.free_count,
+                      station_id, dock_id)
+        self._add(self.occupied, self.occupied_pos, self.bike_count,
+                  station_id, dock_id)
+        self._notify(station_id)
+
+    def remove(self, station_id, dock_id):
+        """
+        Returns
+        -------
+        The id of the bike taken out of the given dock, without logging a
+        trip.
+        """
+        flat = self.offsets[station_id] + dock_id
+        bike_id = int(self.dock_bike[flat])
+        if bike_id == EMPTY:
+            raise ValueError('dock does not hold a bike')
+
+        self.dock_bike[flat] = EMPTY
+        self._discard(self.occupied, self.occupied_pos, self.bike_count,
+                      station_id, dock_id)
+        self._add(self.free, self.free_pos, self.free_count,
+                  station_id, dock_id)
+        self._notify(station_id)
+        return bike_id
+
+    def check_in(self, station_id, dock_id, bike_id, time, duration,
+                 price = None):
+        """
+        Checks a bike into a dock and logs the end of its trip. Mirrors
+        Dock.check_in, returning the price of the trip.
+        """
+        self.place(station_id, dock_id, bike_id)
+        if price is None:
+            price = self.price(bike_id, duration)
+
+        if self.keep_logs:
+            self.dock_log(station_id, dock_id).append({
+                'bike_id': bike_id,
+                'trip_id': int(self.bike_trip[bike_id]),
+                'end_time': time,
+                'price': price,
+                'duration': duration,
+                'end_station_id': station_id
+            })
+            self.log_version[station_id] += 1
+        return price
+
+    def check_out(self, station_id, dock_id, time):
+        """
+        Returns
+        -------
+        The id of the bike checked out of a dock, logging the start of its
+        trip. Mirrors Dock.check_out.
+        """
+        bike_id = self.remove(station_id, dock_id)
+        self.bike_trip[bike_id] += 1
+
+        if self.keep_logs:
+            self.dock_log(station_id, dock_id).append({
+                'bike_id': bike_id,
+                'trip_id': int(self.bike_trip[bike_id]),
+                'start_time': time,
+                'start_station_id': station_id
+            })
+            self.log_version[station_id] += 1
+        return bike_id
+
+    def price(self, bike_id, duration):
+        """
+        Returns
+        -------
+        The total a rider owes for a ride of the given duration. Mirrors
+        Bike.price.
+        """
+        assert_greater_than_zero(duration, 'duration')
+
+        bike_type = self.bike_type[bike_id]
+        price = BASE_RATES[bike_type]
+        if duration > 30:
+            price = price + (duration - 30) * ADD_RATES[bike_type]
+        return price
+
+    def dock_log(self, station_id, dock_id):
+        flat = int(self.offsets[station_id] + dock_id)
+        if flat not in self.logs:
+            self.logs[flat] = []
+        return self.logs[flat]
+
+    def _add(self, items, positions, counts, station_id, dock_id):
+        offset = self.offsets[station_id]
+        count = counts[station_id]
+        items[offset + count] = dock_id
+        positions[offset + dock_id] = count
+        counts[station_id] = count + 1
+
+    def _discard(self, items, positions, counts, station_id, dock_id):
+        offset = self.offsets[station_id]
+        position = positions[offset + dock_id]
+        count = counts[station_id] - 1
+
+        # Swap the last item into the hole
+        last = items[offset + count]
+        if position < count:
+            items[offset + position] = last
+            positions[offset + last] = position
+        positions[offset + dock_id] = -1
+        counts[station_id] = count
+
+    def _notify(self, station_id):
+        station = self.stations[station_id]
+        if station.availability is not None:
+            station.availability.update(station)
+
+class DockList:
+    """
+    A station's docks as seen through the Fleet: a sequence of DockViews
+    created on access.
+    """
+
+    def __init__(self, fleet, station_id):
+        self._fleet = fleet
+        self._station_id = station_id
+
+    def __len__(self):
+        return int(self._fleet.sizes[self._station_id])
+
+    def __getitem__(self, key):
+        if not 0 <= key < len(self):
+            raise IndexError('There do not exist this many docks')
+        return DockView(self._fleet, self._station_id, key)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+class DockSet:
+    """
+    One of a station's swap-remove lists of dock indexes, with the interface
+    of IndexedSet.
+    """
+
+    def __init__(self, items, counts, offset, station_id):
+        self._items = items
+        self._counts = counts
+        self._offset = int(offset)
+        self._station_id = station_id
+
+    def __len__(self):
+        return int(self._counts[self._station_id])
+
+    def __contains__(self, item):
+        return item in iter(self)
+
+    def __iter__(self):
+        end = self._offset + len(self)
+        return iter(self._items[self._offset:end].tolist())
+
+    def sample(self, rng):
+        """
+        Returns
+        -------
+        A uniformly random dock index from this list, or None if it is empty.
+        """
+        count = len(self)
+        if not count:
+            return None
+        return int(self._items[self._offset + rng.integers(count)])
+
+class StationView:
+    """
+    A Station backed by a Fleet.
+    """
+
+    def __init__(self, fleet, id):
+        self._fleet = fleet
+        self._id = id
+        self.docks = DockList(fleet, id)
+
+        offset = fleet.offsets[id]
+        self.occupied_docks = DockSet(
+            fleet.occupied, fleet.bike_count, offset, id
+        )
+        self.free_docks = DockSet(fleet.free, fleet.free_count, offset, id)
+
+        # Set by AvailabilityIndex to be told about changes in occupancy
+        self.availability = None
+
+        self._log = []
+        self._log_version = 0
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def location(self):
+        return tuple(self._fleet.locations[self._id])
+
+    @property
+    def size(self):
+        return int(self._fleet.sizes[self._id])
+
+    @property
+    def available_bikes(self):
+        return int(self._fleet.bike_count[self._id])
+
+    @property
+    def available_docks(self):
+        return int(self._fleet.free_count[self._id])
+
+    @property
+    def log(self):
+        """
+        Returns
+        --------
+        Full log of activities from all docks in this station, cached until
+        one of them logs something new. Mirrors Station.log.
+        """
+        if self._log_version != self.version:
+            result = []
+            for dock in self.docks:
+                result.extend(dock.log)
+
+            self._log = result
+            self._log_version = self.version
+
+        return self._log
+
+    @property
+    def version(self):
+        return int(self._fleet.log_version[self._id])
+
+    def __getitem__(self, key):
+        return self.docks[key]
+
+    def __iter__(self):
+        return iter(self.docks)
+
+class DockView:
+    """
+    A Dock backed by a Fleet.
+    """
+
+    def __init__(self, fleet, station_id, id):
+        self._fleet = fleet
+        self._station_id = station_id
+        self._id = id
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def bike(self):
+        flat = self._fleet.offsets[self._station_id] + self._id
+        bike_id = int(self._fleet.dock_bike[flat])
+        if bike_id == EMPTY:
+            return None
+        return BikeView(self._fleet, bike_id)
+
+    @bike.setter
+    def bike(self, bike):
+        """
+        Accepts None, a BikeView of the same Fleet, or a Bike object whose id,
+        type and trip count are copied into the Fleet.
+        """
+        if self.bike is not None:
+            self._fleet.remove(self._station_id, self._id)
+
+        if bike is None:
+            return
+        if not isinstance(bike, BikeView):
+            bike_type = ELECTRIC if isinstance(bike, ElectricBike) else CLASSIC
+            self._fleet.add_bike(bike.id, bike_type, bike.trip_id)
+        self._fleet.place(self._station_id, self._id, bike.id)
+
+    @property
+    def log(self):
+        flat = int(self._fleet.offsets[self._station_id] + self._id)
+        return self._fleet.logs.get(flat, [])
+
+    def check_in(self, bike, time, duration, price = None):
+        return self._fleet.check_in(
+            self._station_id, self._id, bike.id, time, duration, price
+        )
+
+    def check_out(self, time):
+        bike_id = self._fleet.check_out(self._station_id, self._id, time)
+        return BikeView(self._fleet, bike_id)
+
+class BikeView:
+    """
+    A Bike backed by a Fleet.
+    """
+
+    def __init__(self, fleet, id):
+        self._fleet = fleet
+        self._id = id
+
+    @property
+    def id(self):
+        return self._id
+
+    @property
+    def trip_id(self):
+        return int(self._fleet.bike_trip[self._id])
+
+    @property
+    def bike_type(self):
+        return int(self._fleet.bike_type[self._id])
+
+    @property
+    def base_rate(self):
+        return BASE_RATES[self.bike_type]
+
+    @property
+    def add_rate(self):
+        return ADD_RATES[self.bike_type]
+
+    def ride(self):
+        self._fleet.bike_trip[self._id] += 1
+
+    def price(self, duration):
+        return self._fleet.price(self._id, duration)
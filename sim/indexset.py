@@ -0,0 +1,69 @@
+"""
+A set that supports O(1) insertion, removal and uniform random sampling.
+"""
+
+class IndexedSet:
+    """
+    Items are kept in a dense list with a dict of their positions. Removing an
+    item swaps the last item into its place, so the list never has holes and
+    a uniformly random item is just a random position in the list.
+    """
+
+    def __init__(self, items = ()):
+        """
+        Parameters
+        ----------
+        items: [iterable] (optional) Hashable items to start with.
+        """
+        self._items = []
+        self._positions = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, position):
+        return self._items[position]
+
+    def add(self, item):
+        """
+        Adds an item. Does nothing if the item is already in the set.
+        """
+        if item in self._positions:
+            return
+        self._positions[item] = len(self._items)
+        self._items.append(item)
+
+    def discard(self, item):
+        """
+        Removes an item. Does nothing if the item is not in the set.
+        """
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._positions[last] = position
+
+    def sample(self, rng):
+        """
+        Returns
+        -------
+        A uniformly random item of the set, or None if the set is empty.
+
+        Parameters
+        ----------
+        rng: [BlockRNG] The random number source of the simulation.
+        """
+        if not self._items:
+            return None
+        return self._items[rng.integers(len(self._items))]
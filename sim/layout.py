@@ -0,0 +1,150 @@
+"""
+Where the stations of a bike share system are.
+
+Every generator returns an N x 2 array of int64 coordinates, one row per
+station, built in a handful of vectorized calls so that laying out tens of
+thousands of stations takes milliseconds. Coordinates are whole distance
+units, which is what Station expects; real coordinates are scaled and
+rounded on load.
+"""
+import numpy as np
+
+LAYOUTS = ['grid', 'random', 'clustered']
+
+def grid(num_stations, spacing = 1):
+    """
+    Returns
+    -------
+    The coordinates of num_stations stations filling the smallest square
+    grid that holds them, row by row, centred on the origin.
+
+    Parameters
+    ----------
+    num_stations: [int >= 0] The number of stations.
+
+    spacing: [int >= 1] (optional) The distance between neighbouring
+             stations.
+    """
+    side = int(np.ceil(np.sqrt(num_stations)))
+    axes = (np.arange(side, dtype = np.int64) - (side - 1) // 2) * spacing
+
+    # x and y values for a meshgrid, stacked into coordinate pairs
+    xs, ys = np.meshgrid(axes, axes)
+    coords = np.stack([xs, ys], axis = -1).reshape(-1, 2)
+    return coords[:num_stations]
+
+def random(num_stations, extent, generator):
+    """
+    Returns
+    -------
+    The coordinates of num_stations stations placed uniformly at random in
+    the square [-extent, extent] x [-extent, extent].
+
+    Parameters
+    ----------
+    num_stations: [int >= 0] The number of stations.
+
+    extent: [int >= 0] Half the width of the square.
+
+    generator: [numpy.random.Generator] The source of randomness.
+    """
+    return generator.integers(
+        -extent, extent, size = (num_stations, 2), endpoint = True,
+        dtype = np.int64
+    )
+
+def clustered(num_stations, extent, generator, num_clusters = 5,
+              spread = None):
+    """
+    Returns
+    -------
+    The coordinates of num_stations stations gathered around num_clusters
+    centres, like the neighbourhoods of a city. Centres are placed uniformly
+    in the square [-extent, extent] x [-extent, extent] and stations are
+    normally distributed around a random centre each.
+
+    Parameters
+    ----------
+    num_stations: [int >= 0] The number of stations.
+
+    extent: [int >= 0] Half the width of the square the centres are in.
+
+    generator: [numpy.random.Generator] The source of randomness.
+
+    num_clusters: [int >= 1] (optional) The number of centres.
+
+    spread: [float >= 0] (optional) The standard deviation of the distance
+            of stations from their centre. Defaults to a tenth of the
+            extent.
+    """
+    if num_clusters < 1:
+        raise ValueError('num_clusters must be at least 1')
+    if spread is None:
+        spread = extent / 10
+
+    centres = random(num_clusters, extent, generator)
+    members = generator.integers(num_clusters, size = num_stations)
+    offsets = generator.normal(0, spread, size = (num_stations, 2))
+    return centres[members] + np.rint(offsets).astype(np.int64)
+
+def load(path, scale = 1):
+    """
+    Returns
+    -------
+    The coordinates of stations read from a file, multiplied by scale and
+    rounded to whole distance units.
+
+    Parameters
+    ----------
+    path: [str | PathLike] A .npy file holding an N x 2 array, or a CSV file
+          with one x,y pair per line and an optional header line.
+
+    scale: [float > 0] (optional) Distance units per unit of the file, e.g.
+           1000 to turn kilometres into metres.
+    """
+    if scale <= 0:
+        raise ValueError('scale must be greater than zero')
+
+    path = str(path)
+    if path.endswith('.npy'):
+        coords = np.load(path)
+    else:
+        with open(path) as file:
+            first = file.readline()
+
+        # Skip a header line if the first field is not a number
+        try:
+            float(first.split(',')[0])
+            skip = 0
+        except ValueError:
+            skip = 1
+        coords = np.loadtxt(
+            path, delimiter = ',', skiprows = skip, usecols = (0, 1),
+            ndmin = 2
+        )
+
+    coords = np.asarray(coords)
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        raise ValueError('locations must be an N x 2 array')
+    return np.rint(coords * scale).astype(np.int64)
+
+def as_tuples(coords):
+    """
+    Returns
+    -------
+    A list of (x, y) tuples of np.int64, as Station expects, from an N x 2
+    array of whole distance units. Raises ValueError for fractional 
+    coordinates rather than truncating them, which could put stations on 
+    top of each other; scale them first, as load() does.
+    """
+    coords = np.asarray(coords)
+    if not np.issubdtype(coords.dtype, np.integer):
+        if not np.issubdtype(coords.dtype, np.number) \
+                or not np.all(np.isfinite(coords)) \
+                or np.any(coords != np.rint(coords)):
+            raise ValueError(
+                'locations must be whole distance units, e.g. scaled with '
+                'np.rint(coords * scale)'
+            )
+    coords = coords.astype(np.int64)
+    return list(zip(coords[:, 0], coords[:, 1]))
@@ -0,0 +1,195 @@
+"""
+Event sinks that receive everything the simulation reports while it runs.
+
+The simulation never prints directly. Instead it hands each event to a sink:
+
+- NullSink (the default) drops everything, so batch runs pay nothing for
+  output.
+- TextSink renders the classic human-readable log, buffered.
+- JSONLinesSink writes one JSON object per event, buffered.
+- MemorySink keeps every event in a list for inspection.
+"""
+import sys
+import json
+import numpy as np
+
+class Sink:
+    """
+    Base class for event sinks. Subclasses override emit().
+    """
+    # The simulation skips building events altogether for disabled sinks
+    enabled = True
+
+    def emit(self, kind, **fields):
+        """
+        Receives one event from the simulation.
+
+        Parameters
+        ----------
+        kind: [str] The type of event, e.g. 'check_out' or 'start'.
+
+        fields: The data attached to the event.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+class NullSink(Sink):
+    """
+    Discards every event.
+    """
+    enabled = False
+
+    def emit(self, kind, **fields):
+        pass
+
+class MemorySink(Sink):
+    """
+    Collects every event as a dict with an 'event' key holding its kind.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, kind, **fields):
+        fields['event'] = kind
+        self.events.append(fields)
+
+class BufferedSink(Sink):
+    """
+    Base class for sinks that write lines of text to a stream. Lines are kept
+    in a buffer and written in one go every `buffer_size` lines.
+    """
+
+    def __init__(self, stream = None, buffer_size = 1000):
+        """
+        Parameters
+        ----------
+        stream: [file-like] (optional) Where to write. Defaults to stdout.
+
+        buffer_size: [int >= 1] (optional) How many lines to hold before
+                     writing them out.
+        """
+        if buffer_size < 1:
+            raise ValueError('buffer_size must be at least 1')
+
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._buffer = []
+
+    def write(self, line):
+        self._buffer.append(line)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        # Look up stdout late so that redirection after construction works
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write('\n'.join(self._buffer) + '\n')
+        stream.flush()
+        self._buffer = []
+
+class JSONLinesSink(BufferedSink):
+    """
+    Writes every event as a single line of JSON.
+    """
+
+    def emit(self, kind, **fields):
+        fields['event'] = kind
+        self.write(json.dumps(fields, default = to_builtin))
+
+class TextSink(BufferedSink):
+    """
+    Renders events as the human-readable log of the simulation.
+    """
+
+    def emit(self, kind, **fields):
+        render = getattr(self, f'render_{kind}', None)
+        if render is None:
+            return
+
+        for line in render(**fields):
+            self.write(line)
+
+        # The start and end banners are worth seeing right away
+        if kind in ('start', 'end'):
+            self.flush()
+
+    def render_minute(self, time):
+        yield f'Minute: {time}'
+
+    def render_check_out_attempt(self, time):
+        yield '---- Customer tried to check out a bike'
+
+    def render_check_out(self, time, station, dock):
+        yield f'---- Bike checked out of Station: {station} Dock: {dock}'
+        yield '-' * 9
+
+    def render_no_bikes(self, time):
+        yield '---- No available stations for checkout at this time'
+        yield '-' * 9
+
+    def render_check_in_attempt(self, time, station):
+        yield '---- Customer tried to check in a bike'
+
+    def render_check_in(self, time, station, dock):
+        yield f'---- Bike checked into Station: {station} Dock: {dock}'
+        yield '-' * 9
+
+    def render_station_full(self, time, station):
+        yield '---- Station was full. Customer could not check bike in'
+        yield '---- Finding another station with empty slots'
+        yield '-' * 9
+
+    def render_pick_up(self, time, station, truck, bikes):
+        yield f'---- Truck {truck} loaded {bikes} bikes at Station: {station}'
+
+    def render_drop_off(self, time, station, truck, bikes):
+        yield f'---- Truck {truck} left {bikes} bikes at Station: {station}'
+
+    def render_start(self, length, stations):
+        message = f'This bike share system has {len(stations)} stations:'
+        thick_divider = '=' * len(message)
+        thin_divider = '-' * len(message)
+
+        yield '\n'
+        yield thick_divider
+        yield 'INITIALIZING BIKE SHARE SIMULATION'
+        yield thin_divider
+        yield message
+        for station in stations:
+            yield (
+                f"Station: {station['id']} "
+                f"Location: {tuple(map(int, station['location']))} "
+                f"Docks: {station['docks']} "
+                f"Bikes: {station['bikes']}"
+            )
+        yield '\n'
+        yield f'The simulation will cover {length} minutes'
+        yield thin_divider
+
+    def render_end(self, length, rides, revenue, avg_price, avg_duration):
+        yield '-' * 50
+        yield f'SIMULATION IS OVER AFTER {length} MINUTES'
+        yield f'There were {rides} rides'
+        yield f'Total revenue was ${revenue}'
+        yield f'The average price per ride was ${avg_price}'
+        yield f'The average ride length was {avg_duration} minutes'
+        yield '=' * 50
+
+def to_builtin(value):
+    """
+    json.dumps hook that converts NumPy scalars and arrays to plain Python.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
@@ -0,0 +1,216 @@
+"""
+Pricing plans: what a rider pays for a trip.
+
+A plan prices one trip at check-in with price(), and a whole trip log at once
+with price_trips(), which takes the trip log columns as arrays and agrees
+with price() trip for trip. Everything a plan looks at is in the trip log
+(duration, bike type, membership and the fill level of the station the trip
+started from), so a finished run can be repriced under any other plan with
+reprice() in a few vectorized passes instead of being simulated again.
+
+Plans compose: Membership picks between a plan for members and one for
+everyone else, and Surge scales the price of another plan.
+"""
+import numpy as np
+from .assert_helpers import assert_greater_than_zero
+from .consts import (
+    CLASSIC_BASE_RATE, CLASSIC_ADD_RATE, ELECTRIC_BASE_RATE, ELECTRIC_ADD_RATE
+)
+
+class PerMinute:
+    """
+    A base rate per trip that covers the first minutes, then a rate per
+    minute after that, both by bike type. The default matches Bike.price.
+    """
+    member_share = 0
+
+    def __init__(self, base_rates = (CLASSIC_BASE_RATE, ELECTRIC_BASE_RATE),
+                 add_rates = (CLASSIC_ADD_RATE, ELECTRIC_ADD_RATE),
+                 included = 30):
+        """
+        Parameters
+        ----------
+        base_rates: [pair of float >= 0] (optional) The price of a trip up to
+                    included minutes, for classic then electric bikes.
+
+        add_rates: [pair of float >= 0] (optional) The price of every minute
+                   after that, for classic then electric bikes.
+
+        included: [int >= 0] (optional) Minutes covered by the base rate.
+        """
+        if min(base_rates) < 0 or min(add_rates) < 0:
+            raise ValueError('rates must be at least 0')
+        if included < 0:
+            raise ValueError('included must be at least 0')
+
+        self.base_rates = tuple(base_rates)
+        self.add_rates = tuple(add_rates)
+        self.included = included
+
+    def price(self, duration, bike_type, member = False, fill = 1.0):
+        """
+        Returns
+        -------
+        The price of one trip.
+
+        Parameters
+        ----------
+        duration: [int >= 0] How many minutes the trip lasted.
+
+        bike_type: [int] CLASSIC or ELECTRIC.
+
+        member: [bool] (optional) Whether the rider is a member.
+
+        fill: [float] (optional) The share of docks holding a bike at the
+              start station when the trip began.
+        """
+        assert_greater_than_zero(duration, 'duration')
+        if duration > self.included:
+            return self.base_rates[bike_type] \
+                + (duration - self.included) * self.add_rates[bike_type]
+        return self.base_rates[bike_type]
+
+    def price_trips(self, duration, bike_type, member, fill):
+        """
+        Returns
+        -------
+        A float array with the price of every trip. Takes arrays with one
+        value per trip, named as the arguments of price().
+        """
+        duration = np.asarray(duration)
+        if np.any(duration < 0):
+            raise ValueError('duration must be greater than or equal to zero')
+
+        base_rates = np.array(self.base_rates, dtype = np.float64)
+        add_rates = np.array(self.add_rates, dtype = np.float64)
+        extra = np.maximum(duration - self.included, 0)
+        return base_rates[bike_type] + extra * add_rates[bike_type]
+
+class Membership:
+    """
+    Members pay under one plan and everyone else under another. The
+    Simulation draws whether each rider is a member, a share member_share of
+    them, when they check in.
+    """
+
+    def __init__(self, member_plan = None, guest_plan = None,
+                 member_share = 0.3):
+        """
+        Parameters
+        ----------
+        member_plan: [plan] (optional) What members pay. Defaults to 45
+                     minutes included and only add-on rates after that.
+
+        guest_plan: [plan] (optional) What everyone else pays. Defaults to
+                    PerMinute().
+
+        member_share: [0 <= float <= 1] (optional) The share of riders who
+                      are members.
+        """
+        if not 0 <= member_share <= 1:
+            raise ValueError('member_share must be between 0 and 1')
+
+        if member_plan is None:
+            member_plan = PerMinute(
+                base_rates = (0.0, ELECTRIC_BASE_RATE - CLASSIC_BASE_RATE),
+                included = 45
+            )
+        self.member_plan = member_plan
+        self.guest_plan = guest_plan if guest_plan is not None \
+            else PerMinute()
+        self.member_share = member_share
+
+    def price(self, duration, bike_type, member = False, fill = 1.0):
+        """
+        Returns
+        -------
+        The price of one trip, see PerMinute.price().
+        """
+        plan = self.member_plan if member else self.guest_plan
+        return plan.price(duration, bike_type, member, fill)
+
+    def price_trips(self, duration, bike_type, member, fill):
+        """
+        Returns
+        -------
+        A float array with the price of every trip, see
+        PerMinute.price_trips().
+        """
+        return np.where(
+            member,
+            self.member_plan.price_trips(duration, bike_type, member, fill),
+            self.guest_plan.price_trips(duration, bike_type, member, fill)
+        )
+
+class Surge:
+    """
+    Multiplies the price of another plan for trips from stations that were
+    running out of bikes, where a bike is worth more.
+    """
+
+    def __init__(self, plan = None, low = 0.2, multiplier = 1.5):
+        """
+        Parameters
+        ----------
+        plan: [plan] (optional) The plan to scale. Defaults to PerMinute().
+
+        low: [0 <= float <= 1] (optional) Trips from stations filled below
+             this share of their docks are surged.
+
+        multiplier: [float >= 0] (optional) The factor surged trips pay.
+        """
+        if not 0 <= low <= 1:
+            raise ValueError('low must be between 0 and 1')
+        if multiplier < 0:
+            raise ValueError('multiplier must be at least 0')
+
+        self.plan = plan if plan is not None else PerMinute()
+        self.low = low
+        self.multiplier = multiplier
+
+    @property
+    def member_share(self):
+        return self.plan.member_share
+
+    def price(self, duration, bike_type, member = False, fill = 1.0):
+        """
+        Returns
+        -------
+        The price of one trip, see PerMinute.price().
+        """
+        price = self.plan.price(duration, bike_type, member, fill)
+        if fill < self.low:
+            return price * self.multiplier
+        return price
+
+    def price_trips(self, duration, bike_type, member, fill):
+        """
+        Returns
+        -------
+        A float array with the price of every trip, see
+        PerMinute.price_trips().
+        """
+        prices = self.plan.price_trips(duration, bike_type, member, fill)
+        return np.where(
+            np.asarray(fill) < self.low, prices * self.multiplier, prices
+        )
+
+def reprice(trips, plan):
+    """
+    Returns
+    -------
+    A float array with what every trip would have cost under another plan.
+    Membership is taken from the trips as simulated, so a plan with members
+    only changes what members pay.
+
+    Parameters
+    ----------
+    trips: [TripLog | dict] The completed trips, e.g. simulation.trip_log or
+           the columns of a trip file read back in.
+
+    plan: [plan] The pricing plan to apply.
+    """
+    return plan.price_trips(
+        trips['duration'], trips['bike_type'], trips['member'],
+        trips['start_fill']
+    )
@@ -0,0 +1,184 @@
+"""
+Rebalancing trucks that carry bikes from crowded stations to empty ones.
+
+Every few minutes the Rebalancer reads the fill level of every station from
+the AvailabilityIndex as arrays and plans one job per idle truck: drive to a
+station with too many bikes, pick some up, drive to a station with too few
+and drop them off. Planning is greedy and vectorized over the stations, so
+it costs O(trucks x stations) array operations per round.
+
+The Simulation carries out the jobs as events, moving bikes with dock.bike
+rather than check-outs and check-ins, so rebalancing never shows up as trips.
+"""
+import numpy as np
+
+class Trucks:
+    """
+    The state of every truck: where it is, the job it is on and the bikes it
+    carries. Jobs are kept here so that the events of a job only need to
+    name the truck.
+    """
+
+    def __init__(self, positions, capacity):
+        """
+        Parameters
+        ----------
+        positions: [array-like] The station every truck starts at.
+
+        capacity: [int >= 1] The number of bikes a truck can carry.
+        """
+        self.capacity = capacity
+        self.position = np.array(positions, dtype = np.int32)
+
+        num_trucks = len(self.position)
+        self.source = np.full(num_trucks, -1, dtype = np.int32)
+        self.destination = np.full(num_trucks, -1, dtype = np.int32)
+        self.count = np.zeros(num_trucks, dtype = np.int32)
+        self.busy = np.zeros(num_trucks, dtype = bool)
+        self.loads = [[] for _ in range(num_trucks)]
+
+    def __len__(self):
+        return len(self.position)
+
+    def idle(self):
+        """
+        Returns
+        -------
+        A list of the trucks without a job.
+        """
+        return np.flatnonzero(~self.busy).tolist()
+
+    def assign(self, truck, source, destination, count):
+        """
+        Starts a job: pick up to count bikes from source, take them to
+        destination.
+        """
+        self.source[truck] = source
+        self.destination[truck] = destination
+        self.count[truck] = count
+        self.busy[truck] = True
+
+    def finish(self, truck):
+        """
+        Ends the truck's job where it dropped off its bikes.
+        """
+        self.position[truck] = self.destination[truck]
+        self.busy[truck] = False
+
+class Rebalancer:
+    """
+    Plans truck jobs that bring stations back towards a target fill level
+    halfway between low and high.
+    """
+
+    def __init__(self, num_trucks = 2, capacity = 20, interval = 15,
+                 low = 0.2, high = 0.8):
+        """
+        Parameters
+        ----------
+        num_trucks: [int >= 1] (optional) The size of the fleet of trucks.
+
+        capacity: [int >= 1] (optional) Bikes per truck.
+
+        interval: [int >= 1] (optional) Minutes between planning rounds.
+
+        low: [0 <= float < high] (optional) Stations filled below this share
+             of their docks need bikes.
+
+        high: [low < float <= 1] (optional) Stations filled above this share
+              of their docks give bikes away.
+        """
+        if num_trucks < 1:
+            raise ValueError('num_trucks must be at least 1')
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        if interval < 1:
+            raise ValueError('interval must be at least 1')
+        if not 0 <= low < high <= 1:
+            raise ValueError('fill levels must satisfy 0 <= low < high <= 1')
+
+        self.num_trucks = num_trucks
+        self.capacity = capacity
+        self.interval = interval
+        self.low = low
+        self.high = high
+
+    def trucks(self, num_stations):
+        """
+        Returns
+        -------
+        Idle, empty Trucks spread evenly over the stations.
+        """
+        positions = np.linspace(0, num_stations - 1, self.num_trucks)
+        return Trucks(positions.astype(np.int32), self.capacity)
+
+    def plan(self, bikes, docks, travel_times, trucks, fill = None):
+        """
+        Returns
+        -------
+        A list of (truck, source, destination, count) jobs, at most one per
+        idle truck.
+
+        Each idle truck in turn picks the crowded station with the most bikes
+        to take per minute of driving, then the empty station with the most
+        bikes to leave per minute of driving from there. A truck already
+        carrying bikes may skip the pick-up, in which case source is where it
+        is and count is 0.
+
+        Parameters
+        ----------
+        bikes: [array] The number of bikes at every station.
+
+        docks: [array] The number of empty docks at every station.
+
+        travel_times: [array | TravelTimes] Minutes between stations,
+                      indexed [i] for the times from station i.
+
+        trucks: [Trucks] The state of the trucks.
+
+        fill: [array] (optional) The share of docks holding a bike at every
+              station, e.g. AvailabilityIndex.fill_levels(). Worked out from
+              bikes and docks when not given.
+        """
+        bikes = np.asarray(bikes, dtype = np.int64)
+        sizes = bikes + np.asarray(docks, dtype = np.int64)
+        target = np.rint((self.low + self.high) / 2 * sizes).astype(np.int64)
+        if fill is None:
+            fill = bikes / np.maximum(sizes, 1)
+
+        surplus = np.where(fill > self.high, bikes - target, 0)
+        need = np.where(fill < self.low, target - bikes, 0)
+
+        jobs = []
+        for truck in trucks.idle():
+            sinks = np.flatnonzero(need > 0)
+            if not len(sinks):
+                break
+
+            position = int(trucks.position[truck])
+            load = len(trucks.loads[truck])
+            room = trucks.capacity - load
+            sources = np.flatnonzero(surplus > 0)
+
+            source = position
+            count = 0
+            if room and len(sources):
+                amounts = np.minimum(surplus[sources], room)
+                best = np.argmax(
+                    amounts / (1 + travel_times[position][sources])
+                )
+                source = int(sources[best])
+                count = int(amounts[best])
+
+            if not load + count:
+                continue
+
+            amounts = np.minimum(need[sinks], load + count)
+            best = np.argmax(amounts / (1 + travel_times[source][sinks]))
+            destination = int(sinks[best])
+
+            surplus[source] -= count
+            need[destination] -= amounts[best]
+            jobs.append((truck, source, destination, count))
+
+        return jobs
@@ -0,0 +1,122 @@
+"""
+Monte Carlo replications of the simulation across a pool of processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy import stats
+from .sim import Simulation
+
+# The summary every replication sends back, one float per metric
+METRICS = (
+    'rides', 'revenue', 'unmet_demand', 'reroutes', 'avg_price', 
+    'avg_duration'
+)
+
+def run_replication(length, seed, options):
+    """
+    Returns
+    -------
+    A float array with one value per entry of METRICS for a single, silent
+    simulation run.
+
+    Parameters
+    ----------
+    length: [int] Length of simulation in minutes.
+
+    seed: [SeedSequence | int] Seeds this replication.
+
+    options: [dict] Keyword arguments passed on to Simulation.
+    """
+    simulation = Simulation(length, seed = seed, **options)
+    summary = simulation.stats.as_dict()
+    return np.array([summary[metric] for metric in METRICS], dtype = float)
+
+def replicate(n, length, seed = None, workers = None, confidence = 0.95,
+              **options):
+    """
+    Returns
+    -------
+    A dict with:
+
+    - 'samples': an (n, len(METRICS)) array with one row per replication.
+    - one entry per metric in METRICS, each a dict with the 'mean', 
+      standard deviation 'std', and the 'low' and 'high' ends of the 
+      Student-t confidence interval of the mean.
+
+    Runs n independent simulations in parallel. Every replication gets its
+    own child of a numpy SeedSequence, so results only depend on the seed,
+    never on how work was spread across processes.
+
+    Parameters
+    ----------
+    n: [int >= 1] The number of replications.
+
+    length: [int] Length of each simulation in minutes.
+
+    seed: [None | int | SeedSequence] (optional) The root seed.
+
+    workers: [int] (optional) The number of processes. Defaults to one per 
+             CPU. With 1, replications run in this process.
+
+    confidence: [0 < float < 1] (optional) The confidence level of the 
+                intervals.
+
+    options: Keyword arguments passed on to every Simulation. Dock logs are 
+             off unless asked for, since only the summary is kept.
+    """
+    if n < 1:
+        raise ValueError('n must be at least 1')
+    if not 0 < confidence < 1:
+        raise ValueError('confidence must be between 0 and 1')
+
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(n)
+    options.setdefault('dock_logs', False)
+
+    if workers == 1:
+        samples = [run_replication(length, s, options) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers = workers) as executor:
+            samples = list(executor.map(
+                run_replication, [length] * n, seeds, [options] * n
+            ))
+
+    samples = np.vstack(samples)
+    result = summarize(samples, confidence)
+    result['samples'] = samples
+    return result
+
+def summarize(samples, confidence = 0.95):
+    """
+    Returns
+    -------
+    A dict of metric name to the mean, standard deviation and confidence 
+    interval of that column of samples.
+
+    Parameters
+    ----------
+    samples: [array] One row per replication, one column per metric.
+
+    confidence: [0 < float < 1] (optional) The confidence level.
+    """
+    n = len(samples)
+    means = samples.mean(axis = 0)
+    stds = samples.std(axis = 0, ddof = 1) if n > 1 else np.zeros_like(means)
+
+    # Half-width of the t interval, zero when a single sample gives no spread
+    if n > 1:
+        t = stats.t.ppf((1 + confidence) / 2, n - 1)
+        half_widths = t * stds / np.sqrt(n)
+    else:
+        half_widths = np.zeros_like(means)
+
+    return {
+        metric: {
+            'mean': means[i],
+            'std': stds[i],
+            'low': means[i] - half_widths[i],
+            'high': means[i] + half_widths[i],
+        }
+        for i, metric in enumerate(METRICS)
+    }
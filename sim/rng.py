@@ -0,0 +1,77 @@
+"""
+The random number source shared by everything in a simulation run.
+"""
+import numpy as np
+
+class BlockRNG:
+    """
+    Wraps a seeded numpy.random.Generator and hands out single random values
+    from blocks drawn in bulk. The hot path of the simulation only ever needs
+    one value at a time, and taking it from a prefetched block is much 
+    cheaper than a call into the Generator per value.
+
+    Bulk draws (e.g. all checkouts of a run) should use self.generator 
+    directly.
+    """
+
+    def __init__(self, seed = None, block_size = 4096):
+        """
+        Parameters
+        ----------
+        seed: [None | int | SeedSequence | Generator] (optional) Anything
+              numpy.random.default_rng accepts. Runs with the same seed are
+              identical.
+
+        block_size: [int >= 1] (optional) How many values to draw at once.
+        """
+        if block_size < 1:
+            raise ValueError('block_size must be at least 1')
+
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+        self._block = []
+        self._position = 0
+
+    def random(self):
+        """
+        Returns
+        -------
+        A float drawn uniformly from [0, 1).
+        """
+        if self._position == len(self._block):
+            # Plain Python floats are the cheapest thing to index one by one
+            self._block = self.generator.random(self.block_size).tolist()
+            self._position = 0
+
+        value = self._block[self._position]
+        self._position += 1
+        return value
+
+    @property
+    def state(self):
+        """
+        Everything needed to carry on drawing the same values: the state of 
+        the Generator and the values left in the current block.
+        """
+        return {
+            'generator': self.generator.bit_generator.state,
+            'block': self._block[self._position:],
+        }
+
+    @state.setter
+    def state(self, state):
+        self.generator.bit_generator.state = state['generator']
+        self._block = list(state['block'])
+        self._position = 0
+
+    def integers(self, high):
+        """
+        Returns
+        -------
+        An int drawn uniformly from [0, high).
+
+        Parameters
+        ----------
+        high: [int >= 1] One more than the largest value that can be drawn.
+        """
+        return int(self.random() * high)
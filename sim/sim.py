@@ -1,9 +1,24 @@
 import numpy as np
-from scipy.spatial.distance import cityblock
 from pprint import pprint as pp
 from .station import Station
 from .dock import Dock
-from .bike import ClassicBike
+from .bike import ClassicBike, ElectricBike
+from .battery import BatteryBank, ReadyDocks
+from .availability import AvailabilityIndex
+from .destinations import UniformDestinations, WeightedDestinations
+from .spatial import NearestStations
+from .fleet import Fleet, CLASSIC, ELECTRIC
+from .events import (
+    EventQueue, CHECK_OUT, CHECK_IN, REBALANCE, PICK_UP, DROP_OFF
+)
+from .output import NullSink
+from .triplog import TripLog
+from .stats import RunningStats, report
+from .rng import BlockRNG
+from .travel import travel_times
+from .pricing import PerMinute
+from . import snapshot
+from . import layout as layouts
 from .consts import NUM_STATIONS, NUM_BIKES, MEDIUM_STATION, LAMBDA, SPEED
 
 class Simulation:
@@ -20,63 +35,378 @@ class Simulation:
     - When a bike is checked out, we decide which open station it'll go to. That
       will determine how long it'll take. We then put that bike on hold until
       the minute where it should land.
-    - When the simulation is over, compile all logs and print them out to a 
-      JSON file.
+    - Every completed trip is recorded in self.trip_log, which can be 
+      streamed to a CSV, JSON-lines or Parquet file as the simulation runs 
+      (see sim/writers.py).
     """
 
-    def __init__(self, length, size = None):
+    engines = ['event', 'minute']
+    backends = ['objects', 'arrays']
+    reroute_policies = ['nearest', 'random']
+
+    # Minutes of demand generated at a time
+    demand_chunk = 1440
+
+    def __init__(
+        self, length = None, size = None, engine = 'event', sink = None, 
+        metric = 'cityblock', destinations = None, seed = None,
+        checkout_rate = None, per_station = False, demand = None,
+        backend = 'objects', dock_logs = None, trip_writer = None,
+        batch_size = 10000, num_stations = None, 
+        station_size = MEDIUM_STATION, num_bikes = NUM_BIKES, speed = SPEED,
+        layout = 'grid', reroute = 'nearest', reroute_k = 1, 
+        rebalancer = None, electric_bikes = 0, prefer_electric = None,
+        fallback = True, pricing = None
+    ):
         """
         Sets up the stations and initializes the simulation.
 
         Parameters
         ----------
-        length: [int] the duration in minutes that the sim will last.
+        length: [int] (optional) the duration in minutes that the sim will 
+                last. If given, the whole simulation runs right away, 
+                reporting its start and end to the sink. Otherwise it waits 
+                at minute 0 to be advanced with step() or run_until().
 
         size: [str] (optional) will determine the size of the simulation. To 
               be defined later.
+
+        engine: [str] (optional) Either 'event' (default), which jumps straight
+                from one check-out or arrival to the next, or 'minute', which
+                walks every minute of the simulation. Both give the same
+                results and 'minute' is kept for cross-checking.
+
+        sink: [Sink] (optional) Receives every event of the run, see 
+              sim/output.py. Defaults to a NullSink, which keeps the 
+              simulation silent.
+
+        metric: [str | array-like] (optional) How travel times between 
+                stations are measured: 'cityblock' (default) or 'euclidean'
+                distance at the given speed, or an N x N array of travel times in 
+                minutes such as those of a road network.
+
+        destinations: [array-like] (optional) N x N origin-destination demand
+                      weights, see WeightedDestinations. By default every 
+                      other station is an equally likely destination.
+
+        seed: [None | int | SeedSequence] (optional) Seeds the random number
+              generators owned by this simulation. Runs with the same seed 
+              are identical.
+
+        checkout_rate: [float | array-like] (optional) Mean checkouts per 
+                       minute, see generate_checkouts. Defaults to LAMBDA.
+
+        per_station: [bool] (optional) Whether customers arrive at specific
+                     stations rather than at any station with a bike. A 
+                     customer arriving at an empty station goes without.
+
+        demand: [DemandProfile] (optional) Hourly checkout rates for every
+                station, see sim/demand.py. Replaces checkout_rate and implies
+                per_station.
+
+        backend: [str] (optional) How the state of stations, docks and bikes
+                 is stored: 'objects' (default) uses Station, Dock and Bike
+                 objects, while 'arrays' keeps everything in the NumPy arrays
+                 of a Fleet, which is far more compact for large systems. 
+                 Both give the same results.
+
+        dock_logs: [bool] (optional) Whether docks also keep their own 
+                   half-records of check-ins and check-outs, which make up
+                   Station.log and self.full_log. Completed trips are always
+                   recorded one row each in self.trip_log. Defaults to True
+                   unless a trip_writer is given.
+
+        trip_writer: [TripWriter] (optional) Where to stream completed trips,
+                     see sim/writers.py. Trips are handed over in batches and
+                     dropped from self.trip_log, so memory stays flat however
+                     long the simulation runs.
+
+        batch_size: [int >= 1] (optional) How many trips to collect before
+                    handing them to the trip_writer.
+
+        num_stations: [int >= 2] (optional) The number of stations. Defaults 
+                      to the length of a layout array, or NUM_STATIONS.
+
+        station_size: [1 <= int <= 20] (optional) The number of docks at 
+                      every station. Defaults to MEDIUM_STATION.
+
+        num_bikes: [int >= 0] (optional) The number of bikes in the system.
+                   Bikes that do not fit in the docks are left out. Defaults 
+                   to NUM_BIKES.
+
+        speed: [float > 0] (optional) Distance units ridden per minute. 
+               Defaults to SPEED.
+
+        layout: [str | array-like] (optional) Where the stations are: 
+                'grid' (default), 'random' or 'clustered', see 
+                sim/layout.py, or an N x 2 array of integer coordinates such
+                as one returned by layout.load().
+
+        reroute: [str] (optional) Where riders go when their destination is
+                 full: 'nearest' (default) picks among the reroute_k nearest
+                 stations with free docks, 'random' rides on to a random 
+                 destination like a new trip.
+
+        reroute_k: [int >= 1] (optional) How many of the nearest stations
+                   with free docks a rerouted rider picks from at random.
+
+        rebalancer: [Rebalancer] (optional) Plans trucks that move bikes 
+                    from crowded stations to empty ones, see 
+                    sim/rebalance.py. By default nothing moves bikes but 
+                    riders.
+
+        electric_bikes: [int >= 0 | float] (optional) How many of the 
+                        num_bikes bikes are electric, or as a float between 
+                        0 and 1, what share of them. Electric bikes are 
+                        spread evenly through the fleet, charge while docked
+                        and can only be checked out with enough charge, see 
+                        sim/battery.py.
+
+        prefer_electric: [0 <= float <= 1] (optional) The share of riders 
+                         who want an electric bike, the rest wanting a 
+                         classic one. By default riders take any bike.
+
+        fallback: [bool] (optional) Whether riders settle for the other type
+                  of bike when the one they want is not available. If not, 
+                  they count as unmet demand.
+
+        pricing: [plan] (optional) What riders pay, e.g. a Membership or 
+                 Surge plan from sim/pricing.py. Defaults to PerMinute(), 
+                 the rates in consts.py.
         """
+        if engine not in self.engines:
+            raise ValueError(f'engine must be one of {self.engines}')
+        if backend not in self.backends:
+            raise ValueError(f'backend must be one of {self.backends}')
+
+        if isinstance(layout, str) and layout not in layouts.LAYOUTS:
+            raise ValueError(
+                f'layout must be one of {layouts.LAYOUTS} or an array'
+            )
+        if num_stations is None:
+            num_stations = (
+                NUM_STATIONS if isinstance(layout, str) else len(layout)
+            )
+        if num_stations < 2:
+            raise ValueError('num_stations must be at least 2')
+        if reroute not in self.reroute_policies:
+            raise ValueError(
+                f'reroute must be one of {self.reroute_policies}'
+            )
+        if reroute_k < 1:
+            raise ValueError('reroute_k must be at least 1')
+        if num_bikes < 0:
+            raise ValueError('num_bikes must be at least 0')
+        if isinstance(electric_bikes, float):
+            if not 0 <= electric_bikes <= 1:
+                raise ValueError('electric_bikes share must be in [0, 1]')
+            electric_bikes = int(round(electric_bikes * num_bikes))
+        if not 0 <= electric_bikes <= num_bikes:
+            raise ValueError('electric_bikes must be between 0 and num_bikes')
+        if prefer_electric is not None and not 0 <= prefer_electric <= 1:
+            raise ValueError('prefer_electric must be between 0 and 1')
+        if not isinstance(station_size, int):
+            raise TypeError('station_size must be an int')
+        if not 1 <= station_size <= 20:
+            raise ValueError('station_size must be in [1, 20]')
+        if speed <= 0:
+            raise ValueError('speed must be positive')
+
+        self.engine = engine
+        self.backend = backend
+        self.num_stations = num_stations
+        self.station_size = station_size
+        self.num_bikes = num_bikes
+        self.speed = speed
+        self.layout = layout
+        self.reroute = reroute
+        self.reroute_k = reroute_k
+        self.rebalancer = rebalancer
+        self.electric_bikes = electric_bikes
+        self.prefer_electric = prefer_electric
+        self.fallback = fallback
+        self.pricing = pricing if pricing is not None else PerMinute()
+
+        # The type of every bike. Each run of num_bikes / electric_bikes ids
+        # holds one electric bike, so every station gets its share.
+        self.bike_types = np.diff(
+            np.arange(num_bikes + 1) * electric_bikes // max(num_bikes, 1)
+        ).astype(np.int8)
+        if dock_logs is None:
+            dock_logs = trip_writer is None
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+
+        self.dock_logs = dock_logs
+        self.trip_writer = trip_writer
+        self.batch_size = batch_size
+        self.sink = sink if sink is not None else NullSink()
+
+        # Checked before building each event so silent runs skip the work
+        self.verbose = self.sink.enabled
+        self.metric = metric
+        self.destination_weights = destinations
+        self.checkout_rate = checkout_rate
+        self.per_station = per_station or demand is not None
+        self.demand = demand
+
+        # Separate streams for customer behaviour, for demand, so demand 
+        # does not depend on when it is generated, and for random layouts.
+        # Kept so reset() can replay the exact same run. They are derived 
+        # rather than spawned so that a SeedSequence passed in is left 
+        # untouched and seeds every simulation it is given to the same way.
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed = seed
+        self._seeds = [
+            np.random.SeedSequence(
+                seed.entropy, spawn_key = seed.spawn_key + (i,),
+                pool_size = seed.pool_size
+            )
+            for i in range(3)
+        ]
+
+        # Everything that stays the same across resets
+        self.locations = self.generate_locations(scalar = 5)
+        self.network_init()
+        self.reset()
+
+        if length is not None:
+            self.print_start(length)
+            self.run(length)
+            self.print_end(length)
+            self.sink.flush()
+
+    def reset(self):
+        """
+        Puts the simulation back at minute 0 with freshly distributed bikes
+        and the random number streams rewound to the start, so running it 
+        again gives the same results.
+        """
+        self.rng = BlockRNG(self._seeds[0])
+        self.demand_generator = np.random.default_rng(self._seeds[1])
+        self.time = 0
+
+        # Demand is generated in chunks of demand_chunk minutes as the clock
+        # reaches them. self._demand_until is the end of the last chunk.
+        self._demand_start = 0
+        self._demand_until = 0
+        self._demand_chunk = None
+
         self.station_init()
         self.bikes_in_transit = []
         self.bikes_to_dock = []
-        self.print_start(length)
-        self.run(length)
-        self.print_end(length)
+        self.events = EventQueue()
+        self.trip_log = TripLog()
+        self.stats = RunningStats()
+
+        # Truck jobs run as events in both engines
+        if self.rebalancer is not None:
+            self.trucks = self.rebalancer.trucks(self.num_stations)
+            self.events.push(self.rebalancer.interval, REBALANCE, None)
+
+        # Cache of self.full_log and the sum of station log versions it was
+        # built at
+        self._full_log = []
+        self._full_log_version = 0
 
     def station_init(self):
         """
         Sets up the stations for this simulation. Number of stations, size of
-        stations, and number of bikes can be set from consts.py
+        stations, and number of bikes are set at construction and default to
+        the values in consts.py
         """
-        locations = self.generate_locations(scalar = 5)
-
-        # Instantiate empty stations
-        self.stations = [
-            Station(
-                id = i, location = locations[i], size = MEDIUM_STATION
+        if self.backend == 'arrays':
+            # Stations are views of arrays that already hold empty docks
+            self.fleet = Fleet(
+                self.locations, [self.station_size] * self.num_stations, 
+                self.num_bikes, self.dock_logs
             )
-            for i in range(NUM_STATIONS)
-        ]
+            self.stations = self.fleet.stations
 
-        # Fill stations' dock spaces with actual docks
-        self.distribute_docks()
+        else:
+            # Instantiate empty stations
+            self.stations = [
+                Station(
+                    id = i, location = self.locations[i], 
+                    size = self.station_size
+                )
+                for i in range(self.num_stations)
+            ]
+
+            # Fill stations' dock spaces with actual docks
+            self.distribute_docks()
 
         # Populate docks with bikes
         self.distribute_bikes()
 
+        # Keep track of which stations can be rented from or returned to
+        self.availability = AvailabilityIndex(self.stations)
+
+        # With electric bikes, not every docked bike can be rented, and 
+        # riders with a preference look bikes up by type
+        self.batteries = None
+        self.ready_docks = None
+        if self.electric_bikes or self.prefer_electric is not None:
+            self.batteries = BatteryBank(self.num_bikes)
+            for bike_id in range(self.num_bikes):
+                self.batteries.add(
+                    bike_id, self.bike_types[bike_id] == ELECTRIC
+                )
+
+            self.ready_docks = ReadyDocks(self.num_stations, self.batteries)
+            for station in self.stations:
+                for dock_id in station.occupied_docks:
+                    self.ready_docks.docked(
+                        station.id, dock_id, station.docks[dock_id].bike.id, 
+                        self.time
+                    )
+
+    def network_init(self):
+        """
+        Sets up what only depends on where the stations are: travel times and
+        destination sampling. Done once, not on every reset.
+        """
+        num_stations = len(self.locations)
+
+        # Every trip duration is looked up here. Large systems compute them
+        # on demand rather than holding an N x N matrix.
+        self.travel_times = travel_times(
+            self.locations, self.speed, self.metric
+        )
+
+        if (self.demand is not None 
+                and self.demand.num_stations != num_stations):
+            raise ValueError('demand must have one column per station')
+
+        # Finds where to go when a destination is full
+        self.nearest_stations = NearestStations(self.locations, self.metric)
+
+        if self.destination_weights is None:
+            self.destinations = UniformDestinations(num_stations)
+        else:
+            self.destinations = WeightedDestinations(self.destination_weights)
+
     def distribute_docks(self):
         """
         Helper to generate all the docks that will be put into stations.
         """
-        for station_id in range(NUM_STATIONS):
-            for dock_id in range(MEDIUM_STATION):
-                self.stations[station_id].docks[dock_id] = Dock(dock_id)
+        for station_id in range(self.num_stations):
+            for dock_id in range(self.station_size):
+                self.stations[station_id][dock_id] = Dock(
+                    dock_id, keep_log = self.dock_logs
+                )
     
     def generate_bikes(self):
         """
-        Helper to generate all the bikes that will be put into stations.
+        Helper to generate all the bikes that will be put into stations, of 
+        the types in self.bike_types.
         """
-        for i in range(NUM_BIKES):
-            yield ClassicBike(i)
+        for i in range(self.num_bikes):
+            if self.bike_types[i] == ELECTRIC:
+                yield ElectricBike(i)
+            else:
+                yield ClassicBike(i)
     
     def distribute_bikes(self):
         """
@@ -89,89 +419,301 @@ class Simulation:
 
             # add one bike to each station if there are available docks.
             # once we go through the whole list, start again
-            station_index = i % NUM_STATIONS
+            station_index = i % self.num_stations
             if self.stations[station_index].available_docks:
                 dock_index = self.get_available_dock(
                     self.stations[station_index], 'check in'
                 )
-                if dock_index != None:
+                if dock_index == None:
+                    continue
+
+                # Straight into the arrays, skipping the views
+                if self.backend == 'arrays':
+                    bike_type = (
+                        ELECTRIC if isinstance(bike, ElectricBike) 
+                        else CLASSIC
+                    )
+                    self.fleet.add_bike(bike.id, bike_type, bike.trip_id)
+                    self.fleet.place(station_index, dock_index, bike.id)
+                else:
                     self.stations[station_index].docks[dock_index].bike = bike
 
     def run(self, length):
         """
-        Runs the simulation.
+        Runs the simulation for another `length` minutes with the engine 
+        chosen at construction.
         """
-        potential_checkouts = self.generate_checkouts(
-            length, self.poisson_thresh
-        )
+        self.run_until(self.time + length)
 
-        # Each loop represents one minute in the simulation    
-        for time, potential_checkout in enumerate(potential_checkouts):
-            print('Minute:', time)
+    def step(self, n = 1):
+        """
+        Advances the simulation by n minutes.
+        """
+        self.run_until(self.time + n)
+
+    def run_until(self, time):
+        """
+        Advances the simulation until the given minute: everything that 
+        happens before it is simulated, and self.time becomes time.
+
+        Parameters
+        ----------
+        time: [int >= self.time] The minute to stop at.
+        """
+        if time < self.time:
+            raise ValueError('cannot run the simulation backwards')
+
+        if self.engine == 'event':
+            self.run_events(time)
+        else:
+            self.run_minutes(time)
+
+        self.time = time
+        self.flush_trips()
+
+    def results(self):
+        """
+        Returns
+        -------
+        The report of the simulation so far (see report()) along with the 
+        minute it has reached under 'time'.
+        """
+        result = self.report()
+        result['time'] = self.time
+        return result
+
+    def save(self, path):
+        """
+        Saves the current state of the simulation to a snapshot directory,
+        see sim/snapshot.py.
+        """
+        snapshot.save(self, path)
+
+    def restore(self, path):
+        """
+        Puts the simulation in the state saved in a snapshot directory, so it
+        can carry on from there. The snapshot must come from a simulation 
+        with the same stations and engine, see sim/snapshot.py.
+        """
+        snapshot.restore(self, path)
 
-            if potential_checkout:
+    def flush_trips(self):
+        """
+        Hands every trip in self.trip_log to the trip_writer and clears the
+        log. Does nothing without a trip_writer.
+        """
+        if self.trip_writer is not None:
+            self.trip_writer.write(self.trip_log.as_arrays())
+            self.trip_log.clear()
 
-                # Could be more than one checkout this minute, make sure we 
-                # get all of them
+    def next_demand_chunk(self):
+        """
+        Returns
+        -------
+        The start minute and the potential checkouts of the next chunk of 
+        demand, which covers demand_chunk minutes.
+        """
+        start = self._demand_until
+        if self.demand is not None:
+            checkouts = self.demand.sample(
+                self.demand_chunk, self.demand_generator, start
+            )
+        else:
+            checkouts = self.generate_checkouts(
+                self.demand_chunk, self.checkout_rate, self.per_station
+            )
+
+        self._demand_until += self.demand_chunk
+        return start, checkouts
+
+    def run_events(self, until):
+        """
+        Runs the simulation as a sequence of discrete events. Bikes in transit
+        are kept in self.events keyed by their arrival time, so the cost of
+        the run grows with the number of check-outs and arrivals rather than
+        with the number of minutes. The sink is told about every minute 
+        something happens in, so logs are marked with the time like those of
+        the minute engine, without its empty minutes.
+
+        Parameters
+        ----------
+        until: [int] The minute to stop at.
+        """
+        while self._demand_until < until:
+            self.schedule_checkouts(*self.next_demand_chunk())
+
+        # Events before `until` are all handled in this call, so no minute
+        # is marked twice
+        marked = None
+        while self.events and self.events.peek_time() < until:
+            time, kind, payload = self.events.pop()
+
+            if self.verbose and time != marked:
+                self.sink.emit('minute', time = time)
+                marked = time
+
+            if kind == CHECK_OUT:
+                station_id, count = payload
+                for _ in range(count):
+                    self.check_out_sequence(time, station_id)
+            
+            elif kind == CHECK_IN:
+                self.check_in_bike(payload, time)
+
+            else:
+                self.truck_event(time, kind, payload)
+
+    def schedule_checkouts(self, start, potential_checkouts):
+        """
+        Adds a check-out event to self.events for every minute (and station)
+        with customers.
+
+        Parameters
+        ----------
+        start: [int] The minute of the first row of potential_checkouts.
+
+        potential_checkouts: [array-like] The number of customers trying to
+                             check out a bike each minute (and station), as
+                             returned by generate_checkouts.
+        """
+        if potential_checkouts.ndim == 1:
+            for time in np.flatnonzero(potential_checkouts):
+                self.events.push(
+                    start + int(time), CHECK_OUT, 
+                    (None, int(potential_checkouts[time]))
+                )
+        else:
+            for time, station_id in zip(*np.nonzero(potential_checkouts)):
+                count = int(potential_checkouts[time, station_id])
+                self.events.push(
+                    start + int(time), CHECK_OUT, (int(station_id), count)
+                )
+
+    def run_minutes(self, until):
+        """
+        Runs the simulation one minute at a time.
+
+        Parameters
+        ----------
+        until: [int] The minute to stop at.
+        """
+        # Each loop represents one minute in the simulation    
+        for time in range(self.time, until):
+            if time == self._demand_until:
+                self._demand_start, self._demand_chunk = \
+                    self.next_demand_chunk()
+            potential_checkout = self._demand_chunk[time - self._demand_start]
+
+            if self.verbose:
+                self.sink.emit('minute', time = time)
+
+            # Could be more than one checkout this minute, make sure we 
+            # get all of them
+            if potential_checkout.ndim == 0:
                 for _ in range(potential_checkout):
                     self.check_out_sequence(time)
-                    print('-' * 9)
+            else:
+                for station_id in np.flatnonzero(potential_checkout):
+                    for _ in range(potential_checkout[station_id]):
+                        self.check_out_sequence(time, int(station_id))
             
             if self.bikes_to_dock:
                 self.check_in_sequence(time)
+
+            # Only truck jobs are queued here, and they come last in the
+            # minute as in the event engine
+            while self.events and self.events.peek_time() <= time:
+                self.truck_event(*self.events.pop())
                 
             self.update_bikes_in_transit()
     
-    def check_out_sequence(self, time):
+    def check_out_sequence(self, time, station_id = None):
         """
         Performs a check-out sequence. 
         
         Checks for stations with bikes that can be checked out at the moment. 
         If one exists, this finds the available dock, checks out the bike, and 
-        adds it to self.bikes_in_transit.
+        sends it on its way.
         
-        If all bikes are currently checked out, prints that no bikes were 
-        available at this time.
+        If all bikes are currently checked out, reports that no bikes were 
+        available at this time. A customer who wants a type of bike takes 
+        the other type if they must and self.fallback allows it.
 
         Parameters
         -----------
         time: [int] the minute that the current simulation is at.
+
+        station_id: [int] (optional) The station the customer arrived at. By
+                    default the customer takes a bike from any station.
         """
-        start_station_id = self.get_available_station('check out')
-        print('---- Customer tried to check out a bike')
+        ready_docks = self.ready_docks
+        bike_type = None
+        if ready_docks is not None:
+            ready_docks.refresh(time)
+            bike_type = self.determine_bike_type()
+
+        if bike_type is not None:
+            start_station_id, bike_type = self.find_bike(station_id, bike_type)
+        elif station_id is None:
+            start_station_id = self.get_available_station('check out')
+        elif self.bikes_ready(station_id):
+            start_station_id = station_id
+        else:
+            start_station_id = None
+
+        if self.verbose:
+            self.sink.emit('check_out_attempt', time = time)
         
         # Only proceed if there exists an open dock
         if start_station_id != None:
 
             # Find index of an open dock at this station and check out
-            dock_id = self.get_available_dock(
-                self.stations[start_station_id], 'check out'
-            )
+            if ready_docks is None:
+                dock_id = self.get_available_dock(
+                    self.stations[start_station_id], 'check out'
+                )
+            else:
+                dock_id = ready_docks.sample_dock(
+                    start_station_id, self.rng, bike_type
+                )
+
+            # Fill level the trip will be priced on, before the bike leaves
+            bikes = int(self.availability.bikes[start_station_id])
+            docks = int(self.availability.docks[start_station_id])
+            start_fill = bikes / max(bikes + docks, 1)
 
             bike = self.stations[start_station_id]\
                 .docks[dock_id]\
                 .check_out(time)
+            if ready_docks is not None:
+                ready_docks.undocked(start_station_id, dock_id, bike.id, time)
 
             end_station_id = self.determine_destination(start_station_id)
             duration = self.determine_trip_duration(
                 start_station_id, end_station_id
             )
 
-            # Add that bike to the in_transit list
-            self.bikes_in_transit.append({
+            # Send that bike on its way
+            self.dispatch({
                 'bike': bike, 
+                'origin': start_station_id,
+                'start_time': time,
+                'start_fill': start_fill,
                 'destination': end_station_id,
                 'time_left': duration,
                 'duration': duration,
-            })
+            }, time)
 
-            print(
-                f'---- Bike checked out of Station: {start_station_id}',
-                f'Dock: {dock_id}'
-            )
+            if self.verbose:
+                self.sink.emit(
+                    'check_out', time = time, station = start_station_id,
+                    dock = dock_id
+                )
         
         else:
-            print('---- No available stations for checkout at this time')
+            self.stats.unmet_demand += 1
+            if self.verbose:
+                self.sink.emit('no_bikes', time = time)
     
     def check_in_sequence(self, time):
         """
@@ -183,52 +725,211 @@ class Simulation:
         2) it isn't, so we have to set out to find another station that does
         have available docks.
 
-        Both are covered here and the outcome is printed in the simulation.
+        Both are covered here and the outcome is reported to the sink.
         """
         for bike in self.bikes_to_dock:
+            self.check_in_bike(bike, time)
+
+        self.bikes_to_dock = []
 
-            print('---- Customer tried to check in a bike')
+    def check_in_bike(self, bike, time):
+        """
+        Tries to check a single arriving bike into its destination. If the
+        destination is full, the customer rides on to another station.
 
-            destination_id = bike['destination']
-            dock_id = self.get_available_dock(
-                self.stations[destination_id], 'check in'
+        Parameters
+        ----------
+        bike: [dict] The in-transit entry of the arriving bike.
+
+        time: [int] the minute that the current simulation is at.
+        """
+        destination_id = bike['destination']
+        if self.verbose:
+            self.sink.emit(
+                'check_in_attempt', time = time, station = destination_id
             )
-            # Station is open
-            if dock_id != None:
-                self.stations[destination_id].docks[dock_id].check_in(
-                    bike['bike'], time, bike['duration']
+
+        dock_id = self.get_available_dock(
+            self.stations[destination_id], 'check in'
+        )
+        # Station is open
+        if dock_id != None:
+            bike_type = self.bike_types[bike['bike'].id]
+            member = False
+            if self.pricing.member_share:
+                member = self.rng.random() < self.pricing.member_share
+            price = self.pricing.price(
+                bike['duration'], bike_type, member, bike['start_fill']
+            )
+
+            self.stations[destination_id].docks[dock_id].check_in(
+                bike['bike'], time, bike['duration'], price
+            )
+            if self.ready_docks is not None:
+                self.ready_docks.docked(
+                    destination_id, dock_id, bike['bike'].id, time
                 )
-                print(
-                    '---- Bike checked into Station:', destination_id,
-                    'Dock:', dock_id
+            self.trip_log.append(
+                bike['bike'].id, bike['bike'].trip_id, bike['origin'], 
+                destination_id, bike['start_time'], time, bike['duration'],
+                price, bike_type, member, bike['start_fill']
+            )
+            self.stats.record_trip(bike['duration'], price)
+
+            if (self.trip_writer is not None 
+                    and len(self.trip_log) >= self.batch_size):
+                self.flush_trips()
+            if self.verbose:
+                self.sink.emit(
+                    'check_in', time = time, station = destination_id,
+                    dock = dock_id
                 )
-            
-            # Station isn't open. Pick another station and go there. The origin 
-            # for this new trip is now the old destination (destination_id)
-            else:
-                print('---- Station was full. Customer could not check bike in')
-                print('---- Finding another station with empty slots')
-                end_station_id = self.determine_destination(destination_id)
-                duration = self.determine_trip_duration(
-                    destination_id, end_station_id
+        
+        # Station isn't open. Pick another station and go there. The origin 
+        # for this new trip is now the old destination (destination_id)
+        else:
+            self.stats.reroutes += 1
+            if self.verbose:
+                self.sink.emit(
+                    'station_full', time = time, station = destination_id
                 )
 
-                # Need to make sure this person gets charged once for the full
-                # duration of their trip
-                total_duration = duration + bike['duration']
+            end_station_id = self.determine_reroute(destination_id)
+            duration = self.determine_trip_duration(
+                destination_id, end_station_id
+            )
 
-                # Add that bike to the in_transit list
-                self.bikes_in_transit.append({
-                    'bike': bike['bike'],
-                    'destination': end_station_id,
-                    'time_left': duration,
-                    'duration': total_duration
-                })
+            # Need to make sure this person gets charged once for the full
+            # duration of their trip
+            total_duration = duration + bike['duration']
 
-            print('-' * 9)
+            # Send that bike on its way again
+            self.dispatch({
+                'bike': bike['bike'],
+                'origin': bike['origin'],
+                'start_time': bike['start_time'],
+                'start_fill': bike['start_fill'],
+                'destination': end_station_id,
+                'time_left': duration,
+                'duration': total_duration
+            }, time)
 
-        self.bikes_to_dock = []
+    def dispatch(self, bike, time):
+        """
+        Puts a bike in transit. The minute engine counts 'time_left' down in
+        self.bikes_in_transit while the event engine schedules the arrival
+        directly in self.events.
+
+        Parameters
+        ----------
+        bike: [dict] The in-transit entry of the departing bike.
+
+        time: [int] the minute that the current simulation is at.
+        """
+        if self.engine == 'event':
+            self.events.push(time + bike['time_left'], CHECK_IN, bike)
+        else:
+            self.bikes_in_transit.append(bike)
     
+    def truck_event(self, time, kind, truck):
+        """
+        Carries out one step of rebalancing.
+
+        Parameters
+        ----------
+        time: [int] the minute that the current simulation is at.
+
+        kind: [int] REBALANCE to plan new jobs, PICK_UP or DROP_OFF when a
+              truck reaches the station of its job.
+
+        truck: [int] The truck, or None for REBALANCE.
+        """
+        if kind == REBALANCE:
+            self.rebalance(time)
+        elif kind == PICK_UP:
+            self.pick_up(time, truck)
+        elif kind == DROP_OFF:
+            self.drop_off(time, truck)
+
+    def rebalance(self, time):
+        """
+        Plans a job for every idle truck from the current fill levels, sends
+        them on their way, and schedules the next round of planning.
+        """
+        trucks = self.trucks
+        availability = self.availability
+        jobs = self.rebalancer.plan(
+            availability.bikes, availability.docks, self.travel_times, trucks,
+            fill = availability.fill_levels()
+        )
+        for truck, source, destination, count in jobs:
+            trucks.assign(truck, source, destination, count)
+            drive = self.determine_trip_duration(
+                int(trucks.position[truck]), source
+            )
+            self.events.push(time + drive, PICK_UP, truck)
+
+        self.events.push(time + self.rebalancer.interval, REBALANCE, None)
+
+    def pick_up(self, time, truck):
+        """
+        Loads a truck with the bikes of its job, as many as the station still
+        has, and sends it on to the drop-off. Not logged as trips.
+        """
+        trucks = self.trucks
+        source = int(trucks.source[truck])
+        destination = int(trucks.destination[truck])
+        station = self.stations[source]
+
+        for _ in range(int(trucks.count[truck])):
+            dock_id = self.get_available_dock(station, 'check out')
+            if dock_id is None:
+                break
+            dock = station.docks[dock_id]
+            trucks.loads[truck].append(dock.bike)
+            if self.ready_docks is not None:
+                self.ready_docks.undocked(
+                    source, dock_id, dock.bike.id, time, riding = False
+                )
+            dock.bike = None
+
+        if self.verbose:
+            self.sink.emit(
+                'pick_up', time = time, station = source, truck = truck,
+                bikes = len(trucks.loads[truck])
+            )
+
+        drive = self.determine_trip_duration(source, destination)
+        self.events.push(time + drive, DROP_OFF, truck)
+
+    def drop_off(self, time, truck):
+        """
+        Unloads a truck into the free docks of its destination and ends its
+        job. Bikes that do not fit stay on the truck for its next job.
+        """
+        trucks = self.trucks
+        destination = int(trucks.destination[truck])
+        station = self.stations[destination]
+        load = trucks.loads[truck]
+
+        moved = 0
+        while load and station.available_docks:
+            dock_id = self.get_available_dock(station, 'check in')
+            bike = load.pop()
+            station.docks[dock_id].bike = bike
+            if self.ready_docks is not None:
+                self.ready_docks.docked(destination, dock_id, bike.id, time)
+            moved += 1
+
+        self.stats.rebalanced += moved
+        trucks.finish(truck)
+
+        if self.verbose:
+            self.sink.emit(
+                'drop_off', time = time, station = destination, 
+                truck = truck, bikes = moved
+            )
+
     def update_bikes_in_transit(self):
         """
         Updates self.bikes_in_transit by lowering the 'time_left' key by 1 
@@ -250,40 +951,35 @@ class Simulation:
 
     def print_start(self, length):
         """
-        This prints out the block of text that displays at the top of the
-        output of the simulation.
-        """
-        message = f'This bike share system has {len(self.stations)} stations:'
-        thick_divider = '=' * len(message)
-        thin_divider = '-' * len(message)
-
-        print('\n')
-        print(thick_divider)
-        print('INITIALIZING BIKE SHARE SIMULATION')
-        print(thin_divider)
-        print(f'This bike share system has {len(self.stations)} stations:')
-        for station in self.stations:
-            print('Station:', station.id,
-                  'Location:', station.location,
-                  'Docks:', len(station.docks),
-                  'Bikes:', station.available_bikes)
-        print('\n')
-        print(f'The simulation will cover {length} minutes')
-        print(thin_divider)        
+        Reports the block of text that displays at the top of the output of
+        the simulation.
+        """
+        if not self.verbose:
+            return
+
+        self.sink.emit('start', length = length, stations = [
+            {
+                'id': station.id,
+                'location': station.location,
+                'docks': len(station.docks),
+                'bikes': station.available_bikes
+            }
+            for station in self.stations
+        ])
     
     def print_end(self, length):
         """
-        This prints out the block of text that displays at the end of the
-        output of the simulation.
+        Reports the block of text that displays at the end of the output of 
+        the simulation.
         """
+        if not self.verbose:
+            return
+
         rides, revenue, avg_price, avg_duration = self.generate_statistics()
-        print('-'*50)
-        print('SIMULATION IS OVER AFTER', length, 'MINUTES')
-        print('There were', rides, 'rides')
-        print(f'Total revenue was ${revenue}')
-        print(f'The average price per ride was ${avg_price}')
-        print(f'The average ride length was {avg_duration} minutes')
-        print('='*50)
+        self.sink.emit(
+            'end', length = length, rides = rides, revenue = revenue,
+            avg_price = avg_price, avg_duration = avg_duration
+        )
 
     def generate_statistics(self):
         """
@@ -291,64 +987,95 @@ class Simulation:
         --------
         The total number of rides, the total revenue, the average price, and 
         the average trip duration for all of the rides conducted in the current 
-        simulation.
+        simulation. Read off the running totals in self.stats, and all zero if
+        no rides were completed.
         """
-        rides = 0
-        revenue = 0
-        greatest_price = 0
-        total_duration = 0
-        for ride in self.full_log:
-            if ride.get('end_time'):
-                rides += 1
-                revenue += ride['price']
-                total_duration += ride['duration']
-                greatest_price = max(greatest_price, ride['price'])
-
+        stats = self.stats
+        return stats.rides, stats.revenue, stats.avg_price, stats.avg_duration
 
-        avg_price = round(revenue / rides, 2)
-        avg_duration = int(total_duration / rides)
+    def report(self, percentiles = (50, 90, 99)):
+        """
+        Returns
+        -------
+        A dict with the running totals of self.stats, which cover the whole
+        run, along with percentiles of trip duration and price and 
+        per-station breakdowns of the trips in self.trip_log, see 
+        sim/stats.py. With a trip_writer, those only cover the trips not yet
+        written out.
 
-        return rides, revenue, avg_price, avg_duration
+        Parameters
+        ----------
+        percentiles: [sequence of float] (optional) Which percentiles of 
+                     duration and price to report.
+        """
+        result = self.stats.as_dict()
+        result.update(report(self.trip_log, len(self.stations), percentiles))
+        return result
 
     @property
     def full_log(self):
         """
         Returns
         -------
-        The compiled log of all stations in this system.
+        The compiled log of all stations in this system. Cached until any
+        station logs something new, so it should not be modified.
         """
-        full_log = []
-        for station in self.stations:
-            full_log.extend(station.log)
-        return full_log
+        version = sum(station.version for station in self.stations)
+        if version != self._full_log_version:
+            full_log = []
+            for station in self.stations:
+                full_log.extend(station.log)
+
+            self._full_log = full_log
+            self._full_log_version = version
+
+        return self._full_log
 
     def determine_destination(self, start_station_id):
         """
         Returns
         -------
-        List index of random destination station.
+        List index of random destination station, drawn by self.destinations.
 
         Parameters
         ----------
         start_station_id: [int] The list index of the station where the bike
         is checked out from.
         """
-        # Full list of ids
-        station_ids = np.arange((len(self.stations)))
+        return self.destinations.sample(start_station_id, self.rng)
+    
+    def determine_reroute(self, full_station_id):
+        """
+        Returns
+        -------
+        List index of the station a rider goes to after finding their 
+        destination full: one of the self.reroute_k nearest stations with 
+        free docks, or a random destination with reroute = 'random' or when
+        no station has a free dock.
 
-        # Take out starting id
-        station_ids = np.delete(station_ids, start_station_id)
+        Parameters
+        ----------
+        full_station_id: [int] The list index of the full station.
+        """
+        if self.reroute == 'random':
+            return self.determine_destination(full_station_id)
 
-        end_station_id = np.random.choice(station_ids)
+        candidates = self.nearest_stations.nearest(
+            full_station_id, self.availability.with_docks, self.reroute_k
+        )
+        if not candidates:
+            return self.determine_destination(full_station_id)
+        if len(candidates) == 1:
+            return candidates[0]
+        return candidates[self.rng.integers(len(candidates))]
 
-        return end_station_id
-    
     def determine_trip_duration(self, start_station_id, end_station_id):
         """
         Returns
         ---------
-        The time the customer will take to ride the bike from the start location to the end location. Based on the manhattan distance between
-        two locations.
+        The time the customer will take to ride the bike from the start location to the end location. Looked up in the travel time matrix built
+        by station_init, which by default is based on the manhattan distance
+        between two locations.
 
         Parameters
         ----------
@@ -358,104 +1085,123 @@ class Simulation:
         end_station_id: [int] The list index of the station where the bike will
         check in.
         """
-        loc_1 = self.stations[start_station_id].location
-        loc_2 = self.stations[end_station_id].location
-        distance = cityblock(loc_1, loc_2)
-        time = distance / SPEED
-        return int(time)
+        return int(self.travel_times[start_station_id, end_station_id])
 
-    def poisson_thresh(self, k):
+    def generate_checkouts(self, length, rate = None, per_station = False):
         """
         Returns
         -------
-        The threshold below which a random number between 1-100 must be to trigger a 
-        bike ride. This is 100 * the probability of a Poisson process occuring with 
-        given k and lambda values.
-        
+        An integer numpy array with the number of customers trying to check
+        out a bike each minute. Shaped (length,) for system-wide demand or
+        (length, N) for demand at each of the N stations, and stored in the
+        smallest unsigned dtype that holds the largest count.
+
+        Arrivals of customers are a Poisson process, so the count for every 
+        minute (and station) is drawn directly from a Poisson distribution in
+        a single vectorized call.
+
         Parameters
-        -----------
-        k: [int] Number of bikes being checked out within given checkout rate.
+        ----------
+        length: [int] Length of simulation in minutes.
+
+        rate: [float | array-like] (optional) Mean checkouts per minute across
+              the system. Defaults to LAMBDA. With per_station, either split 
+              evenly across stations or given as one rate per station.
 
-        lam: [int | float] Rate at which bikes are checked out (bikes/minute).
+        per_station: [bool] (optional) Whether to draw a separate count for 
+                     every station.
         """
-        num = (LAMBDA ** k) * (np.math.exp(-LAMBDA))
-        den = np.math.factorial(k)
-        return (num / den) * 100
+        if rate is None:
+            rate = LAMBDA
+
+        if per_station:
+            num_stations = len(self.stations)
+            rate = np.asarray(rate, dtype = float)
+            if rate.ndim == 0:
+                rate = np.full(num_stations, rate / num_stations)
+            size = (length, num_stations)
+        else:
+            size = length
 
-    def generate_checkouts(self, length, func):
+        checkouts = self.demand_generator.poisson(rate, size)
+        largest = int(checkouts.max()) if checkouts.size else 0
+        return checkouts.astype(np.min_scalar_type(largest))
+    
+    def get_available_station(self, availability):
         """
         Returns
         -------
-        A numpy array of LENGTH elements, each element representing a bike 
-        share event. Each element is True or False signifying whether or not a 
-        bike will be checked out.
-
-        This generates a bunch of k values using a normal distribution with mu = 0
-        and sigma = 1. The distribution is modified by taking its absolute value
-        and then shifting right by 1. All numbers are cast to int to be passed
-        into factorial function later.
-
-        Each k value is converted to a poisson probability and then multiplied by 
-        100 (all by the vectorized poisson threshold function passed in as the 
-        `func` parameter).
-
-        Lastly, we generate LENGTH random integers from 1-100. For each element in 
-        the checkout_thresholds, if the corresponding random integer is smaller than that threshold, we say that a bike is withdrawn.
+        Randomly selected list index of a station with at least one available 
+        bike or one available dock. Random so as to not always pick same 
+        stations from the list. Drawn from self.availability, so the cost does 
+        not grow with the number of stations.
 
         Parameters
         ----------
-		length: [int] Length of simulation in minutes.
-
-        func: [python function] The poisson threshold function. Must be passed 
-		in as an argument to vectorize.
+        availability: [str] Either 'check in' or 'check out'
         """
-        # The k values for which a poisson probability of occurrence is calculated.
-        ks = np.random.normal(0, 1, length)
-        ks = abs(ks) + 1
-        ks = ks.astype(int)
+        # None in the event that no stations are available
+        if availability == 'check out' and self.ready_docks is not None:
+            return self.ready_docks.sample_station(self.rng)
+        return self.availability.sample(availability, self.rng)
 
-        # Vectorize poisson threshold function and apply on ks
-        poisson_thresh = np.vectorize(func, otypes = ['int'])
-        checkout_thresholds = poisson_thresh(ks)
-
-        # Values to check each probability against
-        test_values = np.random.randint(1, 101, length)
-
-        # The test values are lower than the threshold, then True and a bike is 
-        # checked out
-        checkouts = checkout_thresholds >= test_values
+    def determine_bike_type(self):
+        """
+        Returns
+        -------
+        The type of bike a customer wants: ELECTRIC for a share 
+        self.prefer_electric of customers, CLASSIC for the rest, or None if
+        customers take any bike.
+        """
+        if self.prefer_electric is None:
+            return None
+        return ELECTRIC if self.rng.random() < self.prefer_electric \
+            else CLASSIC
 
-        # Need to arr of booleans into the number of bikes that
-        # will be attempted to check out this minute.
-        stacked = np.stack([ks, checkouts], axis=-1)
-        checkouts = [pair[0] if pair[1] else 0 for pair in stacked]
-        
-        return checkouts
-    
-    def get_available_station(self, availability):
+    def find_bike(self, station_id, bike_type):
         """
         Returns
         -------
-        Randomly selected list index of a station with at least one available 
-        bike or one available dock. Random so as to not always pick same 
-        stations from the list.
+        (station_id, bike_type) of a bike ready to check out, of the wanted 
+        type if there is one, otherwise of the other type if self.fallback 
+        allows it, otherwise (None, None). Looked up in the per-type index, 
+        so nothing is scanned.
 
         Parameters
         ----------
-        availability: [str] Either 'check in' or 'check out'
+        station_id: [int | None] The station the customer is at, or None if
+                    any station will do.
+
+        bike_type: [int] CLASSIC or ELECTRIC.
         """
-        num_stations = len(self.stations)
-        random_indexes = np.arange(0, num_stations)
-        np.random.shuffle(random_indexes)
+        types = [bike_type]
+        if self.fallback:
+            types.append(ELECTRIC if bike_type == CLASSIC else CLASSIC)
+
+        for candidate in types:
+            if station_id is None:
+                found = self.ready_docks.sample_station(self.rng, candidate)
+            elif self.ready_docks.count(station_id, candidate):
+                found = station_id
+            else:
+                found = None
 
-        for i in random_indexes:
-            if (availability == 'check out') and (self.stations[i].available_bikes):
-                return i
-            elif (availability == 'check in') and (self.stations[i].available_docks):
-                return i
-            
-        # In the event that no stations are available
-        return None
+            if found is not None:
+                if candidate != bike_type:
+                    self.stats.fallbacks += 1
+                return found, candidate
+        return None, None
+
+    def bikes_ready(self, station_id):
+        """
+        Returns
+        -------
+        The number of bikes that can be checked out of the given station:
+        every docked bike, except electric bikes without enough charge.
+        """
+        if self.ready_docks is not None:
+            return self.ready_docks.count(station_id)
+        return self.stations[station_id].available_bikes
     
     def get_available_dock(self, station, availability):
         """
@@ -463,7 +1209,8 @@ class Simulation:
         -------
         Randomly selected list index of a dock at the given station with one 
         available bike or one available dock. Random so as to not always pick 
-        same docks from the list.
+        same docks from the list. Drawn from the station's occupancy sets, so
+        no docks are scanned.
 
         Parameters
         ----------
@@ -471,44 +1218,51 @@ class Simulation:
 
         availability: [str] Either 'check in' or 'check out'
         """
-        num_docks = len(station.docks)
-        random_indexes = np.arange(0, num_docks)
-        np.random.shuffle(random_indexes)
+        if availability == 'check out':
+            docks = station.occupied_docks
+        elif availability == 'check in':
+            docks = station.free_docks
+        else:
+            raise ValueError("availability must be 'check in' or 'check out'")
 
-        for i in random_indexes:
-            if (availability == 'check out') and (station.docks[i].bike != None):
-                return i
-            elif (availability == 'check in') and (station.docks[i].bike == None):
-                return i
-            
-        # In the event that no docks are available
-        return None
+        # None in the event that no docks are available
+        return docks.sample(self.rng)
     
     def generate_locations(self, scalar = None):
         """
         Returns
         -------
-        2D numpy array of coordinates in a 9x9 grid.
+        List of self.num_stations coordinate tuples laid out as chosen at
+        construction, see sim/layout.py.
 
         Parameters
         -----------
-        scalar: [int] The scalar by which to multiply all points in the 
-        coordinate system
+        scalar: [int] The distance between neighbouring stations of a grid.
+                Random layouts cover the same area as a grid would.
         """
-        # Range of both x and y values in a square cartesian coord system
-        axes = [-1, 0, 1]
+        spacing = scalar or 1
 
-        # x and y values for a meshgrid
-        xs, ys = np.meshgrid(axes, axes)
+        if not isinstance(self.layout, str):
+            coords = np.asarray(self.layout)
+            if coords.shape != (self.num_stations, 2):
+                raise ValueError(
+                    'layout must hold one coordinate pair per station'
+                )
 
-        # Stack and reshape to get coordinate pairs
-        coords = np.stack([xs, ys], axis = -1)
-        coords = coords.reshape(9, 2)
+        elif self.layout == 'grid':
+            coords = layouts.grid(self.num_stations, spacing)
 
-        if scalar:
-            coords = coords * scalar
+        else:
+            generator = np.random.default_rng(self._seeds[2])
+            side = int(np.ceil(np.sqrt(self.num_stations)))
+            extent = spacing * side // 2
 
-        # Convert to list of tuples to comply with Station preconditions
-        coords = list(map(tuple, coords))
+            if self.layout == 'random':
+                coords = layouts.random(self.num_stations, extent, generator)
+            else:
+                coords = layouts.clustered(
+                    self.num_stations, extent, generator
+                )
 
-        return coords
\ No newline at end of file
+        # Convert to list of tuples to comply with Station preconditions
+        return layouts.as_tuples(coords)
\ No newline at end of file
@@ -0,0 +1,505 @@
+"""
+Snapshots of a running simulation, saved mid-run and restored later.
+
+A snapshot is a directory holding one .npy file per table of state and a
+meta.json with the clock, the random number streams and the running totals:
+
+- sizes.npy: the number of docks of every station.
+- docks.npy: the id of the bike in every dock, or -1, station after station.
+- bikes.npy: the id, trip count and type of every bike in the system.
+- occupied.npy, free.npy: every station's list of occupied and free docks,
+  in the order the simulation samples them from.
+- with_bikes.npy, with_docks.npy: the stations that have bikes or empty docks,
+  in the order the simulation samples them from.
+- arrivals.npy, checkouts.npy: the queued events of the event engine.
+- in_transit.npy, to_dock.npy: the bikes on the road of the minute engine.
+- trucks.npy, truck_loads.npy, truck_events.npy: the rebalancing trucks, the
+  bikes they carry and their queued events.
+- batteries.npy, ready.npy, with_ready.npy, charging.npy: the battery of
+  every bike, the docks holding bikes ready to check out per bike type and
+  station, and the stations with any, classic and electric ones, all in
+  sampling order, and the bikes still charging. ready_counts.npy and
+  with_ready_counts.npy hold the size of every set.
+- demand.npy: the demand of the current chunk of the minute engine.
+- trips.npy: the completed trips in the trip log.
+
+Every table is a plain or structured NumPy array, so it can be memory-mapped
+and read without loading the whole snapshot. Restoring one puts the
+simulation exactly where it was saved: continuing from it gives the same
+results as never having stopped. The per-dock logs are history rather than
+state and are not saved; completed trips are kept in trips.npy.
+
+A snapshot can be restored into any simulation with the same stations and
+engine, e.g. one with different demand, to fork what-if scenarios from a
+common warmed-up state.
+"""
+import os
+import json
+import numpy as np
+from .bike import ClassicBike, ElectricBike
+from .events import EventQueue, CHECK_OUT, CHECK_IN, REBALANCE
+from .fleet import BikeView, CLASSIC, ELECTRIC, EMPTY
+from .indexset import IndexedSet
+from .output import to_builtin
+from .triplog import TripLog
+
+FORMAT_VERSION = 2
+
+BIKE_DTYPE = np.dtype([
+    ('id', np.int32), ('trip_id', np.int32), ('type', np.int8)
+])
+TRIP_DTYPE = np.dtype([
+    ('bike', np.int32), ('origin', np.int32), ('start_time', np.int64),
+    ('destination', np.int32), ('time_left', np.int32),
+    ('duration', np.int32), ('start_fill', np.float64)
+])
+ARRIVAL_DTYPE = np.dtype([('time', np.int64)] + TRIP_DTYPE.descr)
+CHECKOUT_DTYPE = np.dtype([
+    ('time', np.int64), ('station', np.int32), ('count', np.int32)
+])
+TRUCK_DTYPE = np.dtype([
+    ('position', np.int32), ('source', np.int32), ('destination', np.int32),
+    ('count', np.int32), ('busy', bool)
+])
+TRUCK_EVENT_DTYPE = np.dtype([
+    ('time', np.int64), ('kind', np.int8), ('truck', np.int32)
+])
+BATTERY_DTYPE = np.dtype([
+    ('electric', bool), ('charge', np.float64), ('since', np.int64),
+    ('rate', np.int8), ('dockings', np.int64)
+])
+CHARGING_DTYPE = np.dtype([
+    ('ready_at', np.int64), ('station', np.int32), ('dock', np.int32),
+    ('bike', np.int32), ('docking', np.int64)
+])
+
+def save(simulation, path):
+    """
+    Writes the current state of a simulation to a snapshot directory.
+
+    Parameters
+    ----------
+    simulation: [Simulation] The simulation to save. It is not modified.
+
+    path: [str | PathLike] The directory to write to. Created if missing, and
+          any snapshot already in it is overwritten.
+    """
+    os.makedirs(path, exist_ok = True)
+
+    def write(name, array):
+        np.save(os.path.join(path, f'{name}.npy'), array)
+
+    stations = simulation.stations
+    write('sizes', np.array([station.size for station in stations]))
+    write('docks', dock_bikes(simulation))
+
+    # Every bike is either docked or on the road
+    bikes = {}
+    for station in stations:
+        for dock_id in station.occupied_docks:
+            bike = station.docks[dock_id].bike
+            bikes[bike.id] = bike
+
+    arrivals = []
+    checkouts = []
+    truck_events = []
+    for time, kind, payload in simulation.events.in_order():
+        if kind == CHECK_IN:
+            arrivals.append((time,) + trip_row(payload))
+            bikes[payload['bike'].id] = payload['bike']
+        elif kind == CHECK_OUT:
+            station_id, count = payload
+            checkouts.append(
+                (time, -1 if station_id is None else station_id, count)
+            )
+        else:
+            truck_events.append(
+                (time, kind, -1 if payload is None else payload)
+            )
+
+    # ... or on a truck
+    truck_rows = []
+    truck_loads = []
+    if simulation.rebalancer is not None:
+        trucks = simulation.trucks
+        for truck in range(len(trucks)):
+            truck_rows.append((
+                trucks.position[truck], trucks.source[truck], 
+                trucks.destination[truck], trucks.count[truck],
+                trucks.busy[truck]
+            ))
+            for bike in trucks.loads[truck]:
+                truck_loads.append((truck, bike.id))
+                bikes[bike.id] = bike
+
+    for trip in simulation.bikes_in_transit + simulation.bikes_to_dock:
+        bikes[trip['bike'].id] = trip['bike']
+
+    write('bikes', np.array(
+        [
+            (bike_id, bike.trip_id, bike_type(bike))
+            for bike_id, bike in sorted(bikes.items())
+        ],
+        dtype = BIKE_DTYPE
+    ))
+
+    write('occupied', np.array([
+        dock_id for station in stations for dock_id in station.occupied_docks
+    ], dtype = np.int32))
+    write('free', np.array([
+        dock_id for station in stations for dock_id in station.free_docks
+    ], dtype = np.int32))
+
+    availability = simulation.availability
+    write('with_bikes', np.array(list(availability.with_bikes), np.int32))
+    write('with_docks', np.array(list(availability.with_docks), np.int32))
+
+    write('arrivals', np.array(arrivals, dtype = ARRIVAL_DTYPE))
+    write('checkouts', np.array(checkouts, dtype = CHECKOUT_DTYPE))
+    write('in_transit', trip_table(simulation.bikes_in_transit))
+    write('to_dock', trip_table(simulation.bikes_to_dock))
+    write('trucks', np.array(truck_rows, dtype = TRUCK_DTYPE))
+    write('truck_loads', 
+          np.array(truck_loads, dtype = np.int32).reshape(-1, 2))
+    write('truck_events', np.array(truck_events, dtype = TRUCK_EVENT_DTYPE))
+
+    save_batteries(simulation, write)
+
+    demand_path = os.path.join(path, 'demand.npy')
+    if simulation._demand_chunk is not None:
+        write('demand', simulation._demand_chunk)
+    elif os.path.exists(demand_path):
+        os.remove(demand_path)
+
+    trips = np.empty(
+        len(simulation.trip_log), dtype = list(TripLog.columns)
+    )
+    for name, column in simulation.trip_log.as_arrays().items():
+        trips[name] = column
+    write('trips', trips)
+
+    rng_state = simulation.rng.state
+    write('rng_block', np.array(rng_state.pop('block'), dtype = np.float64))
+
+    meta = {
+        'version': FORMAT_VERSION,
+        'engine': simulation.engine,
+        'time': simulation.time,
+        'demand_start': simulation._demand_start,
+        'demand_until': simulation._demand_until,
+        'rng': rng_state,
+        'demand_rng': simulation.demand_generator.bit_generator.state,
+        'stats': vars(simulation.stats),
+    }
+    with open(os.path.join(path, 'meta.json'), 'w') as file:
+        json.dump(meta, file, default = to_builtin)
+
+def restore(simulation, path):
+    """
+    Puts a simulation in the state saved in a snapshot directory. Anything
+    it has simulated so far is discarded.
+
+    Parameters
+    ----------
+    simulation: [Simulation] The simulation to restore into. It must have
+                the same stations, with the same number of docks, and the
+                same engine as the one that was saved. If it rebalances, 
+                it must have as many trucks or the saved one none, in which
+                case its trucks start out fresh.
+
+    path: [str | PathLike] The directory written by save().
+    """
+    with open(os.path.join(path, 'meta.json')) as file:
+        meta = json.load(file)
+
+    def read(name):
+        return np.load(os.path.join(path, f'{name}.npy'), mmap_mode = 'r')
+
+    if meta['version'] != FORMAT_VERSION:
+        raise ValueError(f"unsupported snapshot version {meta['version']}")
+    if meta['engine'] != simulation.engine:
+        raise ValueError(
+            f"snapshot was taken with the {meta['engine']} engine"
+        )
+
+    sizes = np.array([station.size for station in simulation.stations])
+    if not np.array_equal(read('sizes'), sizes):
+        raise ValueError('snapshot has different stations')
+
+    if len(read('batteries')) != (
+            0 if simulation.batteries is None else len(simulation.batteries)):
+        raise ValueError('snapshot has different electric bikes')
+
+    truck_rows = read('trucks')
+    num_trucks = (
+        0 if simulation.rebalancer is None 
+        else simulation.rebalancer.num_trucks
+    )
+    if len(truck_rows) not in (0, num_trucks):
+        raise ValueError('snapshot has a different number of trucks')
+
+    # Start from a fresh system and empty every dock
+    simulation.reset()
+    for station in simulation.stations:
+        for dock_id in list(station.occupied_docks):
+            station.docks[dock_id].bike = None
+
+    bikes = make_bikes(simulation, read('bikes'))
+
+    docks = read('docks')
+    offsets = np.zeros(len(sizes) + 1, dtype = np.int64)
+    np.cumsum(sizes, out = offsets[1:])
+    for flat in np.flatnonzero(docks != EMPTY).tolist():
+        station_id = int(np.searchsorted(offsets, flat, side = 'right')) - 1
+        dock_id = flat - int(offsets[station_id])
+        simulation.stations[station_id].docks[dock_id].bike = \
+            bikes[int(docks[flat])]
+
+    # Placing the bikes above shuffled the sampling order of docks and
+    # stations, so put back the saved one
+    counts = np.add.reduceat(docks != EMPTY, offsets[:-1])
+    restore_docks(
+        simulation, read('occupied'), read('free'), counts, sizes - counts
+    )
+
+    availability = simulation.availability
+    availability.with_bikes = IndexedSet(read('with_bikes').tolist())
+    availability.with_docks = IndexedSet(read('with_docks').tolist())
+    if simulation.batteries is not None:
+        restore_batteries(simulation, read)
+
+    # Drop the first round of planning scheduled by reset()
+    simulation.events = EventQueue()
+
+    for row in read('checkouts').tolist():
+        time, station_id, count = row
+        simulation.events.push(
+            time, CHECK_OUT, (None if station_id < 0 else station_id, count)
+        )
+    for row in read('arrivals').tolist():
+        simulation.events.push(row[0], CHECK_IN, trip_dict(row[1:], bikes))
+
+    if len(truck_rows):
+        trucks = simulation.trucks
+        for name in TRUCK_DTYPE.names:
+            getattr(trucks, name)[:] = truck_rows[name]
+        for truck, bike_id in read('truck_loads').tolist():
+            trucks.loads[truck].append(bikes[bike_id])
+        for time, kind, truck in read('truck_events').tolist():
+            simulation.events.push(time, kind, None if truck < 0 else truck)
+
+    elif num_trucks:
+        simulation.events.push(
+            meta['time'] + simulation.rebalancer.interval, REBALANCE, None
+        )
+
+    simulation.bikes_in_transit = [
+        trip_dict(row, bikes) for row in read('in_transit').tolist()
+    ]
+    simulation.bikes_to_dock = [
+        trip_dict(row, bikes) for row in read('to_dock').tolist()
+    ]
+
+    simulation.time = meta['time']
+    simulation._demand_start = meta['demand_start']
+    simulation._demand_until = meta['demand_until']
+    if os.path.exists(os.path.join(path, 'demand.npy')):
+        simulation._demand_chunk = np.array(read('demand'))
+
+    trips = read('trips')
+    simulation.trip_log.extend(
+        {name: trips[name] for name in trips.dtype.names}
+    )
+    vars(simulation.stats).update(meta['stats'])
+
+    rng_state = meta['rng']
+    rng_state['block'] = read('rng_block').tolist()
+    simulation.rng.state = rng_state
+    simulation.demand_generator.bit_generator.state = meta['demand_rng']
+
+def save_batteries(simulation, write):
+    """
+    Writes the batteries and the index of ready docks, or empty tables for
+    a simulation without electric bikes.
+    """
+    bank = simulation.batteries
+    ready_docks = simulation.ready_docks
+    batteries = np.zeros(0 if bank is None else len(bank), BATTERY_DTYPE)
+    ready = []
+    with_ready = []
+    charging = []
+
+    if bank is not None:
+        for name in ('electric', 'charge', 'since', 'rate'):
+            batteries[name] = getattr(bank, name)
+        dockings = ready_docks.dockings[:len(bank)]
+        batteries['dockings'][:len(dockings)] = dockings
+
+        ready = ready_docks.ready[CLASSIC] + ready_docks.ready[ELECTRIC]
+        with_ready = [ready_docks.with_any] + ready_docks.with_ready
+        charging = [entry[:1] + entry[2:] for entry in sorted(
+            ready_docks.charging
+        )]
+
+    write('batteries', batteries)
+    write_sets(write, 'ready', ready)
+    write_sets(write, 'with_ready', with_ready)
+    write('charging', np.array(charging, dtype = CHARGING_DTYPE))
+
+def restore_batteries(simulation, read):
+    """
+    Puts back the batteries and the index of ready docks.
+    """
+    bank = simulation.batteries
+    ready_docks = simulation.ready_docks
+    batteries = read('batteries')
+
+    for name in ('electric', 'charge', 'since', 'rate'):
+        getattr(bank, name)[:] = batteries[name]
+    ready_docks.dockings = np.array(batteries['dockings'])
+
+    ready = read_sets(read, 'ready')
+    num_stations = len(ready) // 2
+    ready_docks.ready = [ready[:num_stations], ready[num_stations:]]
+    ready_docks.with_any, *ready_docks.with_ready = read_sets(
+        read, 'with_ready'
+    )
+
+    ready_docks.charging = []
+    ready_docks._seq = 0
+    for ready_at, station_id, dock_id, bike_id, docking in \
+            read('charging').tolist():
+        ready_docks.charging.append(
+            (ready_at, ready_docks._seq, station_id, dock_id, bike_id, docking)
+        )
+        ready_docks._seq += 1
+
+def write_sets(write, name, sets):
+    """
+    Writes a list of IndexedSets as the items of all of them, in order, and
+    the size of each.
+    """
+    items = [item for indexed_set in sets for item in indexed_set]
+    write(name, np.array(items, dtype = np.int32))
+    write(f'{name}_counts', np.array(
+        [len(indexed_set) for indexed_set in sets], dtype = np.int32
+    ))
+
+def read_sets(read, name):
+    """
+    Returns
+    -------
+    The list of IndexedSets written by write_sets().
+    """
+    items = read(name).tolist()
+    sets = []
+    start = 0
+    for count in read(f'{name}_counts').tolist():
+        sets.append(IndexedSet(items[start:start + count]))
+        start += count
+    return sets
+
+def dock_bikes(simulation):
+    """
+    Returns
+    -------
+    The id of the bike in every dock of the simulation, or EMPTY, station
+    after station.
+    """
+    if simulation.backend == 'arrays':
+        return simulation.fleet.dock_bike.copy()
+
+    return np.array([
+        EMPTY if dock.bike is None else dock.bike.id
+        for station in simulation.stations for dock in station.docks
+    ], dtype = np.int32)
+
+def bike_type(bike):
+    if isinstance(bike, BikeView):
+        return bike.bike_type
+    return ELECTRIC if isinstance(bike, ElectricBike) else CLASSIC
+
+def make_bikes(simulation, table):
+    """
+    Returns
+    -------
+    A dict of bike id to a bike of the simulation's backend for every row of
+    a bikes table.
+    """
+    bikes = {}
+    for bike_id, trip_id, kind in table.tolist():
+        if simulation.backend == 'arrays':
+            simulation.fleet.add_bike(bike_id, kind, trip_id)
+            bikes[bike_id] = BikeView(simulation.fleet, bike_id)
+        elif kind == ELECTRIC:
+            bikes[bike_id] = ElectricBike(bike_id, trip_id)
+        else:
+            bikes[bike_id] = ClassicBike(bike_id, trip_id)
+    return bikes
+
+def restore_docks(simulation, occupied, free, occupied_counts, free_counts):
+    """
+    Sets every station's lists of occupied and free docks to the saved ones,
+    given as the lists of all stations one after another.
+    """
+    if simulation.backend == 'arrays':
+        fleet = simulation.fleet
+        restore_lists(
+            fleet, fleet.occupied, fleet.occupied_pos, fleet.bike_count,
+            occupied, occupied_counts
+        )
+        restore_lists(
+            fleet, fleet.free, fleet.free_pos, fleet.free_count,
+            free, free_counts
+        )
+        return
+
+    occupied_ends = np.cumsum(occupied_counts).tolist()
+    free_ends = np.cumsum(free_counts).tolist()
+    for station in simulation.stations:
+        i = station.id
+        station.occupied_docks = IndexedSet(
+            occupied[occupied_ends[i] - occupied_counts[i]:occupied_ends[i]]
+            .tolist()
+        )
+        station.free_docks = IndexedSet(
+            free[free_ends[i] - free_counts[i]:free_ends[i]].tolist()
+        )
+
+def restore_lists(fleet, items, positions, counts, order, order_counts):
+    """
+    Fills one kind of Fleet swap-remove list of every station with the
+    saved order.
+    """
+    stations = np.repeat(np.arange(len(order_counts)), order_counts)
+    starts = np.cumsum(order_counts) - order_counts
+    rank = np.arange(len(order)) - np.repeat(starts, order_counts)
+    offsets = fleet.offsets[stations]
+
+    positions[:] = -1
+    items[offsets + rank] = order
+    positions[offsets + order] = rank
+    counts[:] = order_counts
+
+def trip_row(trip):
+    return (
+        trip['bike'].id, trip['origin'], trip['start_time'],
+        trip['destination'], trip['time_left'], trip['duration'],
+        trip['start_fill']
+    )
+
+def trip_table(trips):
+    return np.array([trip_row(trip) for trip in trips], dtype = TRIP_DTYPE)
+
+def trip_dict(row, bikes):
+    (bike_id, origin, start_time, destination, time_left, duration,
+     start_fill) = row
+    return {
+        'bike': bikes[bike_id],
+        'origin': origin,
+        'start_time': start_time,
+        'destination': destination,
+        'time_left': time_left,
+        'duration': duration,
+        'start_fill': start_fill,
+    }
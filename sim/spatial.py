@@ -0,0 +1,147 @@
+"""
+A spatial index of stations, used to find the closest stations that can take
+a bike when a rider arrives at a full one.
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+
+class NearestStations:
+    """
+    Finds the stations nearest to a given station among a changing set of
+    candidates, e.g. the stations with free docks.
+
+    Stations are kept in a KD-tree built once, under the same distance as
+    the travel times: cityblock or euclidean. The tree is asked for the
+    nearest few stations, then twice as many until enough of them are
+    candidates, so a lookup only visits the neighbourhood of the station.
+    With few candidates left, their distances are computed directly.
+
+    With travel times given as an array, the ORDER_LENGTH nearest stations
+    of a station are sorted the first time it is looked up and kept. Only
+    when too few of them are candidates are all candidates ranked.
+    """
+    ORDER_LENGTH = 64
+
+    def __init__(self, locations, metric = 'cityblock'):
+        """
+        Parameters
+        ----------
+        locations: [array-like] N coordinate pairs, one per station.
+
+        metric: [str | array-like] (optional) 'cityblock' (default) or
+                'euclidean', or an N x N array of travel times, in which case
+                stations are ranked by their travel time instead.
+        """
+        self.locations = np.asarray(locations, dtype = float)
+
+        if isinstance(metric, str):
+            self.p = 1 if metric == 'cityblock' else 2
+            self.tree = cKDTree(self.locations)
+            self.times = None
+        else:
+            self.p = None
+            self.tree = None
+            self.times = np.asarray(metric)
+            self._orders = {}
+
+    def __len__(self):
+        return len(self.locations)
+
+    def nearest(self, station_id, candidates, k = 1):
+        """
+        Returns
+        -------
+        A list of the ids of up to k candidate stations nearest to the given
+        station, nearest first. The station itself is never included.
+
+        Parameters
+        ----------
+        station_id: [int] The station to search around.
+
+        candidates: [IndexedSet | set] The ids of the stations that may be
+                    returned.
+
+        k: [int >= 1] (optional) The number of stations wanted.
+        """
+        if k < 1:
+            raise ValueError('k must be at least 1')
+
+        if self.times is not None:
+            order = self._order(station_id)
+            found = self._first(order, station_id, candidates, k)
+            if len(found) == k or len(order) == len(self):
+                return found
+            return self._rank(
+                station_id, candidates, k, self.times[station_id]
+            )
+
+        query = min(2 * k + 1, len(self))
+
+        while len(candidates) > query:
+            # Equally distant stations may come back in a different order
+            # for a different k, so every round filters its whole result.
+            # The stations returned are still the nearest, so k candidates
+            # among them are the k nearest candidates.
+            _, ids = self.tree.query(
+                self.locations[station_id], k = query, p = self.p
+            )
+            found = self._first(ids.tolist(), station_id, candidates, k)
+            if len(found) == k or query == len(self):
+                return found
+
+            query = min(2 * query, len(self))
+
+        # Few candidates left, so rank all of them
+        return self._rank(station_id, candidates, k)
+
+    def _order(self, station_id):
+        """
+        Returns
+        -------
+        A list of the ORDER_LENGTH stations with the shortest travel times
+        from the given station, nearest first. Computed once per station.
+        """
+        order = self._orders.get(station_id)
+        if order is None:
+            row = self.times[station_id]
+            length = min(self.ORDER_LENGTH, len(row))
+            nearest = np.argpartition(row, length - 1)[:length]
+            order = nearest[np.argsort(row[nearest], kind = 'stable')]
+            order = self._orders[station_id] = order.tolist()
+        return order
+
+    def _rank(self, station_id, candidates, k, times = None):
+        """
+        Returns
+        -------
+        The k candidates nearest to the station, found by computing the
+        distance, or looking up the travel time, to every candidate.
+        """
+        others = np.array(
+            [other for other in candidates if other != station_id],
+            dtype = np.int64
+        )
+        if not len(others):
+            return []
+
+        if times is not None:
+            distances = times[others]
+        else:
+            diffs = np.abs(
+                self.locations[others] - self.locations[station_id]
+            )
+            if self.p == 1:
+                distances = diffs.sum(axis = 1)
+            else:
+                distances = np.sqrt((diffs ** 2).sum(axis = 1))
+        order = others[np.argsort(distances, kind = 'stable')]
+        return order[:k].tolist()
+
+    def _first(self, ids, station_id, candidates, k):
+        found = []
+        for other in ids:
+            if other != station_id and other in candidates:
+                found.append(other)
+                if len(found) == k:
+                    break
+        return found
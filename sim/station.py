@@ -1,12 +1,42 @@
 from .dock import Dock
 from .bike import ClassicBike
 from .assert_helpers import assert_greater_than_zero
+from .indexset import IndexedSet
 import numpy as np
 
+class StationDocks:
+    """
+    The dock spaces of a Station, used like a list. Placing a dock goes 
+    through Station.__setitem__, so the station tracks its occupancy however
+    the dock is placed.
+    """
+
+    def __init__(self, station):
+        self._station = station
+
+    def __len__(self):
+        return len(self._station._docks)
+
+    def __iter__(self):
+        return iter(self._station._docks)
+
+    def __getitem__(self, key):
+        return self._station._docks[key]
+
+    def __setitem__(self, key, dock):
+        if key < 0:
+            key += len(self)
+        self._station[key] = dock
+
 class Station:
     """
     Stations hold multiple docks and can retrieve a compiled log of bike 
     entries and exits.
+
+    Occupancy is tracked incrementally: every dock placed with station[i] = 
+    dock or station.docks[i] = dock reports its check-ins and check-outs back
+    here, so counting bikes or picking a free or occupied dock never scans 
+    the docks.
     """
 
     def __init__(self, id, location, size):
@@ -35,7 +65,21 @@ class Station:
         self._id = id            
         self._location = location
         self._size = size        
-        self.docks = self.init_docks()  
+        self._docks = self.init_docks()  
+        self.docks = StationDocks(self)
+
+        # List indexes of docks holding a bike and of empty docks
+        self.occupied_docks = IndexedSet()
+        self.free_docks = IndexedSet()
+
+        # Set by AvailabilityIndex to be told about changes in occupancy
+        self.availability = None
+
+        # Bumped by docks whenever they log a trip. self.log is only rebuilt
+        # when this has changed since the last time it was built.
+        self.version = 0
+        self._log = []
+        self._log_version = 0
     
     @property
     def id(self):
@@ -60,30 +104,30 @@ class Station:
         """
         Returns
         --------
-        Full log of activities from all docks in this station.
+        Full log of activities from all docks in this station. Docks stamp 
+        the station id into every trip when they log it, and the compiled log
+        is cached until a dock logs something new, so it should not be 
+        modified.
         """
-        result = []
-
-        # Go through each dock and access the log attribute. Append to full log
-        # and return
-        for dock in self.docks:
-            if not dock.log:
-                continue
+        if self._log_version != self.version:
+            result = []
 
-            for trip in dock.log:
+            # Go through each dock and access the log attribute. Append to 
+            # full log
+            for dock in self.docks:
+                if dock is not None:
+                    result.extend(dock.log)
 
-                # If this is start of a trip, add start station
-                if trip.get('start_time'):
-                    trip['start_station_id'] = self.id
+            self._log = result
+            self._log_version = self.version
 
-                # If it's an end of a trip, add end station
-                elif trip.get('end_time'):
-                    trip['end_station_id'] = self.id
+        return self._log
 
-                # Add all individual trips to the total log
-                result.append(trip)
-
-        return result
+    def log_changed(self):
+        """
+        Marks the cached log as out of date. Called by Dock.
+        """
+        self.version += 1
     
     @property
     def available_bikes(self):
@@ -92,17 +136,56 @@ class Station:
         -------
         The number of bikes currently docked at this station.
         """
-        bikes = [1 if dock.bike else 0 for dock in self.docks]
-        return sum(bikes)
+        return len(self.occupied_docks)
     
     @property
     def available_docks(self):
-        return self.size - self.available_bikes
+        """
+        Returns
+        -------
+        The number of empty docks at this station.
+        """
+        return len(self.free_docks)
+
+    def dock_changed(self, index, has_bike):
+        """
+        Updates the occupancy counters when the dock at the given index gains
+        or loses a bike. Called by Dock.
+
+        Parameters
+        ----------
+        index: [int] The list index of the dock that changed.
+
+        has_bike: [bool] Whether the dock now holds a bike.
+        """
+        if has_bike:
+            self.free_docks.discard(index)
+            self.occupied_docks.add(index)
+        else:
+            self.occupied_docks.discard(index)
+            self.free_docks.add(index)
+
+        if self.availability is not None:
+            self.availability.update(self)
     
     def __getitem__(self, key):
         self.assert_index(key)
         return self.docks[key]
 
+    def __setitem__(self, key, dock):
+        """
+        Places a dock into one of this station's spaces and starts tracking
+        its occupancy.
+        """
+        self.assert_index(key)
+        self.occupied_docks.discard(key)
+        self.free_docks.discard(key)
+
+        self._docks[key] = dock
+        if dock is not None:
+            dock.attach(self, key)
+            self.dock_changed(key, dock.bike is not None)
+
     def __iter__(self):
         return iter(self.docks)
 
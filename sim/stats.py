@@ -0,0 +1,121 @@
+"""
+Statistics of a simulation run: running totals kept while it runs, and a
+vectorized report over the trip log.
+"""
+import numpy as np
+
+class RunningStats:
+    """
+    Aggregates updated in O(1) at every check-in, failed check-out, 
+    reroute, truck drop-off and rider settling for the other bike type, so
+    end-of-run statistics never need to walk the logs.
+    """
+
+    def __init__(self):
+        self.rides = 0
+        self.revenue = 0.0
+        self.total_duration = 0
+        self.max_price = 0.0
+        self.unmet_demand = 0
+        self.reroutes = 0
+        self.rebalanced = 0
+        self.fallbacks = 0
+
+    def record_trip(self, duration, price):
+        """
+        Counts one completed trip.
+
+        Parameters
+        ----------
+        duration: [int] The number of minutes the trip lasted.
+
+        price: [float] What the rider paid.
+        """
+        self.rides += 1
+        self.revenue += price
+        self.total_duration += duration
+        if price > self.max_price:
+            self.max_price = price
+
+    @property
+    def avg_price(self):
+        if not self.rides:
+            return 0.0
+        return round(self.revenue / self.rides, 2)
+
+    @property
+    def avg_duration(self):
+        if not self.rides:
+            return 0
+        return int(self.total_duration / self.rides)
+
+    def as_dict(self):
+        return {
+            'rides': self.rides,
+            'revenue': self.revenue,
+            'avg_price': self.avg_price,
+            'avg_duration': self.avg_duration,
+            'max_price': self.max_price,
+            'unmet_demand': self.unmet_demand,
+            'reroutes': self.reroutes,
+            'rebalanced': self.rebalanced,
+            'fallbacks': self.fallbacks,
+        }
+
+def report(trip_log, num_stations, percentiles = (50, 90, 99)):
+    """
+    Returns
+    -------
+    A dict summarizing the trips in a TripLog, computed with whole-column 
+    NumPy operations:
+
+    - 'logged_rides' and 'logged_revenue': totals.
+    - 'duration' and 'price': dicts of the given percentiles.
+    - 'departures', 'arrivals', 'revenue_by_station' and 
+      'mean_duration_by_station': arrays with one value per station, keyed
+      by the station the trip started from (or ended at, for arrivals).
+
+    Only the trips still in the log are covered. A Simulation with a 
+    trip_writer clears its log whenever it writes it out, so RunningStats 
+    holds the totals of the whole run.
+
+    Parameters
+    ----------
+    trip_log: [TripLog] The completed trips.
+
+    num_stations: [int] The number of stations in the system.
+
+    percentiles: [sequence of float] (optional) Which percentiles of 
+                 duration and price to report.
+    """
+    durations = trip_log['duration']
+    prices = trip_log['price']
+    starts = trip_log['start_station']
+
+    def summarize(values):
+        if not len(values):
+            return {p: 0.0 for p in percentiles}
+        return dict(zip(percentiles, np.percentile(values, percentiles)))
+
+    departures = np.bincount(starts, minlength = num_stations)
+    duration_by_station = np.bincount(
+        starts, weights = durations, minlength = num_stations
+    )
+
+    return {
+        'logged_rides': len(trip_log),
+        'logged_revenue': float(prices.sum()),
+        'duration': summarize(durations),
+        'price': summarize(prices),
+        'departures': departures,
+        'arrivals': np.bincount(
+            trip_log['end_station'], minlength = num_stations
+        ),
+        'revenue_by_station': np.bincount(
+            starts, weights = prices, minlength = num_stations
+        ),
+        'mean_duration_by_station': np.divide(
+            duration_by_station, departures, 
+            out = np.zeros(num_stations), where = departures > 0
+        ),
+    }
@@ -0,0 +1,228 @@
+"""
+Parameter sweeps: many simulation configurations run across a pool of
+processes, collected in one tidy table.
+
+A configuration is a dict of keyword arguments for Simulation, e.g.
+{'num_bikes': 60, 'station_size': 10, 'checkout_rate': 0.2}, so nothing in
+consts.py is ever modified. grid() builds every combination of a set of
+parameter values, and sweep() runs each configuration a number of times and
+returns one row per run.
+"""
+import os
+import csv
+import json
+import pickle
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .output import to_builtin
+from .replicate import METRICS, run_replication
+
+def grid(**values):
+    """
+    Returns
+    -------
+    A list of configurations, one per combination of the given values, with
+    the last parameter changing fastest.
+
+    Parameters
+    ----------
+    values: Simulation keyword arguments, each mapped to a list of values to
+            try, e.g. num_bikes = [40, 60, 80].
+    """
+    names = list(values)
+    return [
+        dict(zip(names, combination))
+        for combination in itertools.product(*values.values())
+    ]
+
+def config_key(config, length, seed):
+    """
+    Returns
+    -------
+    A string that is the same for any two runs that are bound to give the
+    same results: same configuration, length and seed.
+    """
+    text = json.dumps(
+        {
+            'config': config, 'length': length,
+            'entropy': seed.entropy, 'spawn_key': seed.spawn_key
+        },
+        sort_keys = True, default = key_value
+    )
+    return hashlib.sha1(text.encode()).hexdigest()
+
+def key_value(value):
+    """
+    json.dumps hook for config_key(). NumPy values become plain Python, and
+    any other object, such as a Rebalancer or a pricing plan, becomes its
+    class and a hash of its pickled state, so equal settings share a key.
+    """
+    try:
+        return to_builtin(value)
+    except TypeError:
+        pass
+
+    try:
+        state = pickle.dumps(value)
+    except (pickle.PicklingError, TypeError, AttributeError) as error:
+        raise TypeError(
+            f'cannot sweep over {type(value).__name__} values, which '
+            'cannot be pickled'
+        ) from error
+    return {
+        'class': f'{type(value).__module__}.{type(value).__qualname__}',
+        'state': hashlib.sha1(state).hexdigest(),
+    }
+
+def sweep(configs, length, replications = 1, seed = None, workers = None,
+          cache = None, path = None, chunksize = 1, **options):
+    """
+    Returns
+    -------
+    A list of rows, one per configuration and replication, each a dict of
+    the configuration's parameters, the 'replication' number, and one value
+    per entry of METRICS. Parameters that are not plain values, such as a
+    Rebalancer, are given as a stable label, see setting_label().
+
+    Runs every configuration `replications` times in parallel. Replication r
+    of every configuration uses the same seed, so configurations are compared
+    on the same stream of customers. Configurations that are identical are
+    only simulated once.
+
+    Parameters
+    ----------
+    configs: [list of dict] Simulation keyword arguments for every point of
+             the sweep, e.g. from grid().
+
+    length: [int] Length of each simulation in minutes.
+
+    replications: [int >= 1] (optional) The number of runs per
+                  configuration.
+
+    seed: [None | int | SeedSequence] (optional) The root seed.
+
+    workers: [int] (optional) The number of processes. Defaults to one per
+             CPU. With 1, everything runs in this process.
+
+    cache: [str | PathLike] (optional) A directory where the result of every
+           run is kept, keyed by its configuration, length and seed. Runs
+           found there are not simulated again, so an interrupted sweep with
+           a fixed seed picks up where it left off.
+
+    path: [str | PathLike] (optional) A CSV file to write the rows to.
+
+    chunksize: [int >= 1] (optional) How many runs to send to a process at
+               a time. Larger chunks suit sweeps of many short runs.
+
+    options: Keyword arguments passed on to every Simulation, underneath the
+             configuration's own. Dock logs are off unless asked for.
+    """
+    if replications < 1:
+        raise ValueError('replications must be at least 1')
+
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(replications)
+    options.setdefault('dock_logs', False)
+
+    # Every distinct run, keyed so identical configurations share results
+    runs = {}
+    for config in configs:
+        merged = dict(options, **config)
+        for r in range(replications):
+            key = config_key(merged, length, seeds[r])
+            runs.setdefault(key, (merged, seeds[r]))
+
+    results = {}
+    if cache is not None:
+        os.makedirs(cache, exist_ok = True)
+        for key in runs:
+            cached = os.path.join(cache, f'{key}.npy')
+            if os.path.exists(cached):
+                results[key] = np.load(cached)
+
+    pending = [key for key in runs if key not in results]
+    tasks = (
+        [length] * len(pending),
+        [runs[key][1] for key in pending],
+        [runs[key][0] for key in pending]
+    )
+    if workers == 1:
+        collect(map(run_replication, *tasks), pending, results, cache)
+    else:
+        with ProcessPoolExecutor(max_workers = workers) as executor:
+            summaries = executor.map(
+                run_replication, *tasks, chunksize = chunksize
+            )
+            collect(summaries, pending, results, cache)
+
+    rows = []
+    for config in configs:
+        merged = dict(options, **config)
+        for r in range(replications):
+            summary = results[config_key(merged, length, seeds[r])]
+            row = {
+                name: setting_label(value) for name, value in config.items()
+            }
+            row['replication'] = r
+            row.update(zip(METRICS, summary.tolist()))
+            rows.append(row)
+
+    if path is not None:
+        write_rows(rows, path)
+    return rows
+
+def setting_label(value):
+    """
+    Returns
+    -------
+    The value of a setting as written in the rows of a sweep: plain values
+    as they are, anything else, such as a Rebalancer, a pricing plan or an
+    array, as its class name and a short hash of its contents, e.g. 
+    'Surge-3f2a9c01d4'. Equal settings get equal labels in every run.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+
+    text = json.dumps(value, sort_keys = True, default = key_value)
+    digest = hashlib.sha1(text.encode()).hexdigest()[:10]
+    return f'{type(value).__name__}-{digest}'
+
+def collect(summaries, keys, results, cache = None):
+    """
+    Stores the summary of every run in results under its key as it comes
+    in, and in the cache directory if there is one, so the runs finished
+    before an interruption are kept.
+    """
+    for key, summary in zip(keys, summaries):
+        results[key] = summary
+        if cache is not None:
+            np.save(os.path.join(cache, f'{key}.npy'), summary)
+
+def write_rows(rows, path):
+    """
+    Writes sweep rows to a CSV file with one column per parameter and metric.
+
+    Parameters
+    ----------
+    rows: [list of dict] As returned by sweep().
+
+    path: [str | PathLike] The file to write. It is overwritten.
+    """
+    # Parameters in order of first appearance, then the fixed columns
+    columns = []
+    for row in rows:
+        for name in row:
+            if name not in columns and name != 'replication' \
+                    and name not in METRICS:
+                columns.append(name)
+    columns += ['replication'] + list(METRICS)
+
+    with open(path, 'w', newline = '') as file:
+        writer = csv.DictWriter(file, columns)
+        writer.writeheader()
+        writer.writerows(rows)
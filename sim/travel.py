@@ -0,0 +1,219 @@
+"""
+Travel times between stations, computed once for the whole system or, for
+systems too large for an N x N matrix, on demand.
+"""
+import math
+import numpy as np
+
+METRICS = ['cityblock', 'euclidean']
+
+# Rows of the matrix computed per block, which bounds the size of the 
+# temporary coordinate differences for large systems.
+BLOCK_SIZE = 1024
+
+# Largest system that gets a full matrix from travel_times(). 4096 stations
+# take 32 MB as int16; beyond that memory and set-up time grow quadratically.
+MATRIX_LIMIT = 4096
+
+def travel_times(locations, speed, metric = 'cityblock', 
+                 matrix_limit = MATRIX_LIMIT):
+    """
+    Returns
+    -------
+    The travel times of the system, indexed [i, j]: a full matrix from
+    travel_time_matrix() for up to matrix_limit stations or user-given
+    times, and a TravelTimes computing them on demand otherwise.
+
+    Parameters
+    ----------
+    locations, speed, metric: See travel_time_matrix().
+
+    matrix_limit: [int] (optional) The largest number of stations to build 
+                  a full matrix for.
+    """
+    if not isinstance(metric, str) or len(locations) <= matrix_limit:
+        return travel_time_matrix(locations, speed, metric)
+    return TravelTimes(locations, speed, metric)
+
+def travel_time_matrix(locations, speed, metric = 'cityblock'):
+    """
+    Returns
+    -------
+    An N x N integer array where element [i, j] is the number of whole minutes
+    it takes to ride from station i to station j, at least 1 between
+    different stations. Stored as int16 when the longest trip fits, int32
+    otherwise.
+
+    Parameters
+    ----------
+    locations: [array-like] N coordinate pairs, one per station.
+
+    speed: [int | float > 0] Distance units per minute. Ignored when metric
+           is an array of travel times.
+
+    metric: [str | array-like] (optional) 'cityblock' (default) or 
+            'euclidean' distance between locations, or an N x N array of 
+            travel times in minutes, e.g. from a road network.
+    """
+    locations = np.asarray(locations)
+    num_stations = len(locations)
+
+    if not isinstance(metric, str):
+        times = np.asarray(metric)
+        if times.shape != (num_stations, num_stations):
+            raise ValueError('travel times must be an N x N array')
+        if np.any(times < 0):
+            raise ValueError('travel times must be greater than or equal to zero')
+        times = times.astype(compact_int_dtype(times.max()))
+        return at_least_one_minute(times, np.arange(num_stations))
+
+    check_metric(metric, speed)
+    times = np.empty(
+        (num_stations, num_stations), 
+        dtype = compact_int_dtype(longest_time(locations, speed))
+    )
+
+    for start in range(0, num_stations, BLOCK_SIZE):
+        times[start:start + BLOCK_SIZE] = block_times(
+            locations[start:start + BLOCK_SIZE], locations, speed, metric
+        )
+
+    return at_least_one_minute(times, np.arange(num_stations))
+
+class TravelTimes:
+    """
+    Travel times computed from the coordinates of the stations whenever they
+    are looked up, so they take O(N) memory rather than O(N^2). Indexing 
+    with [i, j] gives the same whole minutes as travel_time_matrix(), and 
+    indexing with [i] gives the times from station i to every station.
+    """
+
+    def __init__(self, locations, speed, metric = 'cityblock'):
+        """
+        Parameters
+        ----------
+        locations: [array-like] N coordinate pairs, one per station.
+
+        speed: [int | float > 0] Distance units per minute.
+
+        metric: [str] (optional) 'cityblock' (default) or 'euclidean'.
+        """
+        check_metric(metric, speed)
+        self.locations = np.asarray(locations)
+        self.speed = speed
+        self.metric = metric
+        self.dtype = np.dtype(
+            compact_int_dtype(longest_time(self.locations, speed))
+        )
+
+        # Plain ints are the cheapest to look up one pair at a time
+        self._xs = self.locations[:, 0].tolist()
+        self._ys = self.locations[:, 1].tolist()
+
+    @property
+    def shape(self):
+        return (len(self.locations), len(self.locations))
+
+    def __len__(self):
+        return len(self.locations)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            if isinstance(i, (int, np.integer)) \
+                    and isinstance(j, (int, np.integer)):
+                return self.pair(i, j)
+            return self[i][..., j]
+
+        rows = np.atleast_2d(self.locations[key])
+        times = block_times(rows, self.locations, self.speed, self.metric)
+        times = at_least_one_minute(
+            times.astype(self.dtype), np.arange(len(self))[key]
+        )
+        return times if np.ndim(self.locations[key]) == 2 else times[0]
+
+    def pair(self, i, j):
+        """
+        Returns
+        -------
+        The whole minutes it takes to ride from station i to station j, at
+        least 1 between different stations.
+        """
+        if i == j:
+            return 0
+
+        dx = abs(self._xs[i] - self._xs[j])
+        dy = abs(self._ys[i] - self._ys[j])
+        if self.metric == 'cityblock':
+            return max(int((dx + dy) / self.speed), 1)
+        return max(
+            int(math.sqrt(float(dx) ** 2 + float(dy) ** 2) / self.speed), 1
+        )
+
+def block_times(block, locations, speed, metric):
+    """
+    Returns
+    -------
+    A float array of the travel times, not yet truncated to whole minutes, 
+    from every location in block to every location in locations.
+    """
+    diffs = np.abs(block[:, np.newaxis, :] - locations[np.newaxis, :, :])
+
+    if metric == 'cityblock':
+        distances = diffs.sum(axis = -1)
+    else:
+        distances = np.sqrt((diffs.astype(float) ** 2).sum(axis = -1))
+
+    # Truncated to whole minutes when stored as integers
+    return distances / speed
+
+def at_least_one_minute(times, rows):
+    """
+    Returns
+    -------
+    The integer travel times with every time between different stations
+    raised to at least 1 minute, so no trip arrives the minute it leaves,
+    however close two stations are. The time from a station to itself is
+    left alone. Changes times in place.
+
+    Parameters
+    ----------
+    times: [array] Travel times from the stations in rows to every station,
+           one row per station.
+
+    rows: [int | array] The id of the station of every row.
+    """
+    rows = np.atleast_1d(rows)
+    own = times[np.arange(len(rows)), rows]
+    np.maximum(times, 1, out = times)
+    times[np.arange(len(rows)), rows] = own
+    return times
+
+def longest_time(locations, speed):
+    """
+    Returns
+    -------
+    An upper bound for the travel time between any two locations. 
+    Coordinates span a box, so its diagonal is an upper bound for any 
+    metric here.
+    """
+    if not len(locations):
+        return 0
+    extent = locations.max(axis = 0) - locations.min(axis = 0)
+    return extent.sum() / speed
+
+def check_metric(metric, speed):
+    if metric not in METRICS:
+        raise ValueError(f'metric must be one of {METRICS} or an array')
+    if speed <= 0:
+        raise ValueError('speed must be greater than zero')
+
+def compact_int_dtype(largest):
+    """
+    Returns
+    -------
+    np.int16 if the given value fits in it, np.int32 otherwise.
+    """
+    if largest <= np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
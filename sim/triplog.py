@@ -0,0 +1,131 @@
+"""
+A system-wide, columnar log of completed trips.
+"""
+import numpy as np
+
+class TripLog:
+    """
+    One row per completed trip, stored column by column in preallocated NumPy
+    arrays that double in size when full. Columns are handed out as views, so
+    reading the log never copies it.
+    """
+    columns = (
+        ('bike_id', np.int32),
+        ('trip_id', np.int32),
+        ('start_station', np.int32),
+        ('end_station', np.int32),
+        ('start_time', np.int32),
+        ('end_time', np.int32),
+        ('duration', np.int32),
+        ('price', np.float64),
+        ('bike_type', np.int8),
+        ('member', np.bool_),
+        ('start_fill', np.float64),
+    )
+
+    def __init__(self, capacity = 1024):
+        """
+        Parameters
+        ----------
+        capacity: [int >= 1] (optional) How many rows to make room for up
+                  front.
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+
+        self._data = {
+            name: np.empty(capacity, dtype = dtype)
+            for name, dtype in self.columns
+        }
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, name):
+        """
+        Returns
+        -------
+        A view of the named column holding one value per trip.
+        """
+        return self._data[name][:self._size]
+
+    @property
+    def capacity(self):
+        return len(self._data['bike_id'])
+
+    def append(self, bike_id, trip_id, start_station, end_station,
+               start_time, end_time, duration, price, bike_type = 0,
+               member = False, start_fill = 1.0):
+        """
+        Adds one completed trip to the log. bike_type, member and start_fill
+        are what the trip was priced on, see sim/pricing.py.
+        """
+        if self._size == self.capacity:
+            self._grow()
+
+        i = self._size
+        data = self._data
+        data['bike_id'][i] = bike_id
+        data['trip_id'][i] = trip_id
+        data['start_station'][i] = start_station
+        data['end_station'][i] = end_station
+        data['start_time'][i] = start_time
+        data['end_time'][i] = end_time
+        data['duration'][i] = duration
+        data['price'][i] = price
+        data['bike_type'][i] = bike_type
+        data['member'][i] = member
+        data['start_fill'][i] = start_fill
+        self._size = i + 1
+
+    def extend(self, columns):
+        """
+        Adds many completed trips to the log at once.
+
+        Parameters
+        ----------
+        columns: [dict] Column name to an array with one value per trip, as
+                 returned by as_arrays().
+        """
+        num_rows = len(columns['bike_id'])
+        while self._size + num_rows > self.capacity:
+            self._grow()
+
+        for name, _ in self.columns:
+            self._data[name][self._size:self._size + num_rows] = columns[name]
+        self._size += num_rows
+
+    def as_arrays(self):
+        """
+        Returns
+        -------
+        A dict of column name to a view of that column.
+        """
+        return {name: self[name] for name, _ in self.columns}
+
+    def to_frame(self):
+        """
+        Returns
+        -------
+        A pandas DataFrame of the log built on the column views. Requires
+        pandas.
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError('pandas is required for TripLog.to_frame()')
+
+        return pd.DataFrame(self.as_arrays(), copy = False)
+
+    def clear(self):
+        """
+        Empties the log, keeping the memory already allocated.
+        """
+        self._size = 0
+
+    def _grow(self):
+        for name, column in self._data.items():
+            grown = np.empty(2 * len(column), dtype = column.dtype)
+            grown[:len(column)] = column
+            self._data[name] = grown
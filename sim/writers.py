@@ -0,0 +1,142 @@
+"""
+Writers that stream batches of completed trips from a TripLog to disk.
+
+Each writer receives the log's columns as a dict of arrays and appends them to
+its file, so a simulation can hand over its trips every few thousand rows and
+clear its log, keeping memory flat however long it runs.
+"""
+import csv
+import json
+from .triplog import TripLog
+
+COLUMNS = [name for name, _ in TripLog.columns]
+
+class TripWriter:
+    """
+    Base class for trip writers. Subclasses override write_batch().
+    """
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path: [str | PathLike] The file to write to. It is overwritten.
+        """
+        self.path = path
+        self.rows = 0
+
+    def write(self, columns):
+        """
+        Appends a batch of trips.
+
+        Parameters
+        ----------
+        columns: [dict] Column name to an array with one value per trip, as
+                 returned by TripLog.as_arrays().
+        """
+        num_rows = len(columns[COLUMNS[0]])
+        if num_rows:
+            self.write_batch(columns)
+            self.rows += num_rows
+
+    def write_batch(self, columns):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class CSVTripWriter(TripWriter):
+    """
+    Writes trips as comma-separated values with a header row.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file = open(path, 'w', newline = '')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write_batch(self, columns):
+        self._writer.writerows(
+            zip(*(columns[name].tolist() for name in COLUMNS))
+        )
+
+    def close(self):
+        self._file.close()
+
+class JSONLinesTripWriter(TripWriter):
+    """
+    Writes every trip as a single line of JSON.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file = open(path, 'w')
+
+    def write_batch(self, columns):
+        rows = zip(*(columns[name].tolist() for name in COLUMNS))
+        self._file.writelines(
+            json.dumps(dict(zip(COLUMNS, row))) + '\n' for row in rows
+        )
+
+    def close(self):
+        self._file.close()
+
+class ParquetTripWriter(TripWriter):
+    """
+    Writes trips to a Parquet file, one row group per batch. Requires pyarrow.
+    """
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('pyarrow is required to write Parquet files')
+
+        super().__init__(path)
+        self._pa = pa
+        self._schema = pa.schema([
+            (name, pa.from_numpy_dtype(dtype))
+            for name, dtype in TripLog.columns
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_batch(self, columns):
+        table = self._pa.Table.from_arrays(
+            [columns[name] for name in COLUMNS], schema = self._schema
+        )
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+WRITERS = {
+    '.csv': CSVTripWriter,
+    '.jsonl': JSONLinesTripWriter,
+    '.parquet': ParquetTripWriter,
+}
+
+def open_writer(path):
+    """
+    Returns
+    -------
+    A TripWriter for the given path, chosen by its extension: .csv, .jsonl or
+    .parquet.
+
+    Parameters
+    ----------
+    path: [str | PathLike] The file to write to.
+    """
+    path = str(path)
+    for extension, writer in WRITERS.items():
+        if path.endswith(extension):
+            return writer(path)
+
+    raise ValueError(f'path must end with one of {list(WRITERS)}')
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from sim.availability import AvailabilityIndex
+from sim.station import Station
+from sim.dock import Dock
+from sim.bike import ClassicBike
+from sim.rng import BlockRNG
+
+@pytest.fixture
+def stations():
+    stations = [
+        Station(i, (np.int64(i), np.int64(0)), 2) for i in range(3)
+    ]
+    for station in stations:
+        station[0] = Dock(0)
+        station[1] = Dock(1)
+
+    # Station 0 is empty, 1 is half full and 2 is full
+    stations[1][0].bike = ClassicBike(0)
+    stations[2][0].bike = ClassicBike(1)
+    stations[2][1].bike = ClassicBike(2)
+    return stations
+
+class TestAvailabilityIndex:
+
+    def test_init(self, stations):
+        index = AvailabilityIndex(stations)
+        assert sorted(index.with_bikes) == [1, 2]
+        assert sorted(index.with_docks) == [0, 1]
+
+    def test_updates(self, stations):
+        index = AvailabilityIndex(stations)
+
+        bike = stations[1][0].check_out(5)
+        assert sorted(index.with_bikes) == [2]
+
+        stations[0][1].check_in(bike, 10, 5)
+        stations[0][0].bike = ClassicBike(3)
+        assert sorted(index.with_bikes) == [0, 2]
+        assert sorted(index.with_docks) == [1]
+
+    def test_sample(self, stations):
+        rng = BlockRNG(0)
+        index = AvailabilityIndex(stations)
+
+        draws = [index.sample('check out', rng) for _ in range(2000)]
+        counts = np.bincount(draws, minlength = 3)
+        assert counts[0] == 0, 'Picked a station without bikes'
+        assert abs(counts[1] - counts[2]) < 200, 'Samples are not uniform'
+
+        with pytest.raises(ValueError):
+            index.sample('check up', rng)
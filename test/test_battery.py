@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from sim.battery import (
+    BatteryBank, ReadyDocks, charge_after, CHARGING, RIDING, IDLE
+)
+from sim.consts import ELECTRIC_MAX_CHARGE, ELECTRIC_MIN_CHARGE
+from sim.fleet import CLASSIC, ELECTRIC
+from sim.rng import BlockRNG
+
+@pytest.fixture
+def bank():
+    # Bike 0 is classic, bikes 1 and 2 are electric
+    bank = BatteryBank()
+    bank.add(0, False)
+    bank.add(1, True)
+    bank.add(2, True, charge = 10)
+    return bank
+
+class TestBatteryBank:
+
+    def test_charge_after(self):
+        assert charge_after(50, CHARGING, 4) == 70
+        assert charge_after(50, CHARGING, 100) == ELECTRIC_MAX_CHARGE
+        assert charge_after(10, RIDING, 100) == 0
+        assert np.array_equal(
+            charge_after(np.array([50, 50]), np.array([RIDING, IDLE]), 5),
+            [40, 50]
+        )
+
+    def test_set_rate(self, bank):
+        assert bank.set_rate(1, 10, RIDING) == ELECTRIC_MAX_CHARGE
+        assert bank.charge_at(1, 30) == ELECTRIC_MAX_CHARGE - 40
+        assert bank.set_rate(1, 30, IDLE) == ELECTRIC_MAX_CHARGE - 40
+        assert bank.charge_at(1, 1000) == ELECTRIC_MAX_CHARGE - 40
+
+        assert bank.set_rate(0, 10, RIDING) == 0, 'Classic bikes never change'
+
+    def test_drain_and_recharge(self, bank):
+        # 25 minutes ridden, then 2 docked
+        bank.set_rate(1, 0, RIDING)
+        assert bank.set_rate(1, 25, CHARGING) == 50
+        assert bank.ready_at(1) == 27
+        assert bank.charge_at(1, 27) == ELECTRIC_MIN_CHARGE
+
+        bank.set_rate(1, 27, RIDING)
+        assert bank.charge_at(1, 1000) == 0, 'Charge stops at empty'
+
+    def test_charges(self, bank):
+        bank.set_rate(1, 0, RIDING)
+        charges = bank.charges(10)
+        assert np.array_equal(
+            charges, [bank.charge_at(i, 10) for i in range(len(bank))]
+        ), 'Vectorized charges should match the charge of every bike'
+
+    def test_ready_at(self, bank):
+        assert bank.ready_at(0) == 0
+        assert bank.ready_at(1) == 0
+        # 50 charge missing at 5 per minute
+        assert bank.ready_at(2) == (ELECTRIC_MIN_CHARGE - 10) // CHARGING
+
+class TestReadyDocks:
+
+    def test_docked(self, bank):
+        ready_docks = ReadyDocks(2, bank)
+        ready_docks.docked(0, 3, 0, 0)
+        ready_docks.docked(1, 5, 2, 0)
+
+        assert ready_docks.count(0) == 1
+        assert ready_docks.count(1) == 0
+        assert list(ready_docks.with_any) == [0]
+
+        ready_docks.refresh(bank.ready_at(2) - 1)
+        assert ready_docks.count(1) == 0
+        ready_docks.refresh(bank.ready_at(2))
+        assert list(ready_docks.ready[ELECTRIC][1]) == [5]\
+            , 'Bike should be ready once it has charged'
+
+    def test_stale_entries_skipped(self, bank):
+        ready_docks = ReadyDocks(2, bank)
+        ready_docks.docked(1, 5, 2, 0)
+        ready_docks.undocked(1, 5, 2, 1, riding = False)
+
+        ready_docks.refresh(100)
+        assert ready_docks.count(1) == 0\
+            , 'A bike that left its dock should not become ready there'
+        assert not ready_docks.charging
+
+    def test_undocked(self, bank):
+        ready_docks = ReadyDocks(1, bank)
+        ready_docks.docked(0, 0, 1, 0)
+        ready_docks.undocked(0, 0, 1, 10)
+
+        assert ready_docks.count(0) == 0
+        assert not ready_docks.with_any
+        assert not ready_docks.with_ready[ELECTRIC]
+        assert bank.charge_at(1, 20) == ELECTRIC_MAX_CHARGE + 10 * RIDING
+
+    def test_types(self, bank):
+        ready_docks = ReadyDocks(3, bank)
+        ready_docks.docked(0, 0, 0, 0)
+        ready_docks.docked(0, 1, 1, 0)
+        ready_docks.docked(2, 0, 2, 0)
+        rng = BlockRNG(0)
+
+        assert ready_docks.count(0, CLASSIC) == 1
+        assert ready_docks.count(0, ELECTRIC) == 1
+        assert ready_docks.count(0) == 2
+        assert ready_docks.count(2) == 0, 'Bike 2 is still charging'
+
+        assert ready_docks.sample_dock(0, rng, ELECTRIC) == 1
+        assert ready_docks.sample_dock(0, rng, CLASSIC) == 0
+        assert ready_docks.sample_dock(2, rng) is None
+        assert {ready_docks.sample_dock(0, rng) for _ in range(50)} == {0, 1}
+
+        ready_docks.undocked(0, 1, 1, 5)
+        assert ready_docks.sample_station(rng, ELECTRIC) is None
+        assert ready_docks.sample_station(rng) == 0\
+            , 'Station should still have its classic bike'
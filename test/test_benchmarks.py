@@ -0,0 +1,41 @@
+import json
+import pytest
+from benchmarks import run
+from benchmarks.cases import build, count_events, scale_cases
+
+class TestBenchmarks:
+
+    def test_scale_cases(self):
+        assert scale_cases('small')[0] == (9, 60)
+        assert set(scale_cases('small')) < set(scale_cases('medium'))
+        assert (10000, 30 * 1440) in scale_cases('full')
+
+        with pytest.raises(ValueError):
+            scale_cases('huge')
+
+    def test_count_events(self):
+        event_sim = build(9, 'event')
+        minute_sim = build(9, 'minute')
+        event_sim.run(600)
+        minute_sim.run(600)
+        assert count_events(event_sim) == count_events(minute_sim) > 0
+
+    def test_main(self, tmp_path, capsys):
+        path = tmp_path / 'results.json'
+        output = run.main([
+            '--repeats', '1', '--skip-micro', '--engines', 'event',
+            '--output', str(path)
+        ])
+        with open(path) as file:
+            written = json.load(file)
+
+        assert written['results'] == json.loads(json.dumps(output['results']))
+        assert all(
+            result['events_per_second'] > 0 for result in written['results']
+        )
+
+        run.main([
+            '--repeats', '1', '--skip-runs', '--micro-stations', '9',
+            '--compare', str(path)
+        ])
+        assert 'Speed-up' in capsys.readouterr().out
@@ -1,5 +1,5 @@
 import pytest
-from sim.bike import Bike, ClassicBike
+from sim.bike import Bike, ClassicBike, ElectricBike
 
 class TestBike:
 
@@ -51,4 +51,16 @@ class TestClassicBike:
         with pytest.raises(ValueError):
             classic_bike.price(-1)
             classic_bike.price(-30)
-            classic_bike.price(-45)
\ No newline at end of file
+            classic_bike.price(-45)
+
+@pytest.fixture
+def electric_bike():
+    return ElectricBike(0)
+
+class TestElectricBike:
+
+    def test_price(self, electric_bike):
+        message = 'ElectricBike pricing is not working correctly'
+
+        assert electric_bike.price(10) == 5.25, message
+        assert electric_bike.price(40) == pytest.approx(7.25), message
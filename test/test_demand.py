@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from sim.demand import DemandProfile
+from sim.sim import Simulation
+
+@pytest.fixture
+def rush_hour():
+    # Station 1 is twice as busy, and nobody rides outside of 8-9am
+    curve = np.zeros(24)
+    curve[8] = 1
+    return DemandProfile.from_curve(curve, [1, 2], 0.5)
+
+class TestDemandProfile:
+
+    def test_init_value_errors(self):
+        with pytest.raises(ValueError):
+            DemandProfile(np.ones((23, 2)))
+        with pytest.raises(ValueError):
+            DemandProfile(-np.ones((24, 2)))
+
+    def test_weekly(self):
+        profile = DemandProfile(np.ones((7, 24, 3)))
+        assert profile.period == 168
+        assert profile.num_stations == 3
+
+    def test_from_curve(self, rush_hour):
+        assert rush_hour.rates.shape == (24, 2)
+        assert rush_hour.rates.mean(axis = 0).sum() == pytest.approx(0.5)
+        assert rush_hour.rates[8, 1] == pytest.approx(2 * rush_hour.rates[8, 0])
+
+    def test_sample(self, rush_hour):
+        generator = np.random.default_rng(0)
+
+        # Three days starting at 7:30am on the first day
+        checkouts = rush_hour.sample(3 * 1440, generator, start = 450)
+        assert checkouts.shape == (3 * 1440, 2)
+        assert checkouts.dtype == np.uint8
+
+        hours = ((450 + np.arange(3 * 1440)) // 60) % 24
+        assert checkouts[hours != 8].sum() == 0, 'Checkouts outside rush hour'
+
+        per_station = checkouts.sum(axis = 0)
+        assert per_station[1] > per_station[0]
+        assert per_station.sum() == pytest.approx(0.5 * 24 * 60 * 3, rel = 0.1)
+
+    def test_save_load(self, rush_hour, tmp_path):
+        rush_hour.save(tmp_path / 'rates.npy')
+        loaded = DemandProfile.load(tmp_path / 'rates.npy')
+        assert np.array_equal(loaded.rates, rush_hour.rates)
+
+        np.savez(tmp_path / 'rates.npz', rates = rush_hour.rates)
+        loaded = DemandProfile.load(tmp_path / 'rates.npz')
+        assert np.array_equal(loaded.rates, rush_hour.rates)
+
+    def test_save_load_weekly(self, tmp_path):
+        # Busier on weekends
+        curve = np.ones(7 * 24)
+        curve[5 * 24:] = 3
+        weekly = DemandProfile.from_curve(curve, [1, 2, 3], 0.5)
+        assert weekly.period == 7 * 24
+
+        weekly.save(tmp_path / 'weekly.npy')
+        loaded = DemandProfile.load(tmp_path / 'weekly.npy')
+        assert loaded.period == 7 * 24
+        assert np.array_equal(loaded.rates, weekly.rates)
+
+        with pytest.raises(ValueError):
+            DemandProfile(np.ones((48, 3)))
+
+    def test_simulation(self):
+        profile = DemandProfile(np.full((24, 9), 0.05))
+        event_sim = Simulation(600, demand = profile, seed = 0)
+        minute_sim = Simulation(600, demand = profile, seed = 0, 
+                                engine = 'minute')
+        assert event_sim.full_log
+        assert event_sim.full_log == minute_sim.full_log
+
+        with pytest.raises(ValueError):
+            Simulation(10, demand = DemandProfile(np.ones((24, 2))))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from sim.destinations import UniformDestinations, WeightedDestinations
+from sim.rng import BlockRNG
+
+class HighRNG:
+    """
+    Always draws the largest float below 1.
+    """
+    def random(self):
+        return np.nextafter(1, 0)
+
+class TestUniformDestinations:
+
+    def test_init_value_errors(self):
+        with pytest.raises(ValueError):
+            UniformDestinations(1)
+
+    def test_sample(self):
+        rng = BlockRNG(0)
+        destinations = UniformDestinations(4)
+
+        draws = [destinations.sample(2, rng) for _ in range(3000)]
+        counts = np.bincount(draws, minlength = 4)
+
+        assert counts[2] == 0, 'Customer rode back to the origin'
+        assert np.all(np.abs(counts[[0, 1, 3]] - 1000) < 150)\
+            , 'Destinations are not uniform'
+
+class TestWeightedDestinations:
+
+    def test_init_value_errors(self):
+        with pytest.raises(ValueError):
+            WeightedDestinations(np.ones((2, 3)))
+        with pytest.raises(ValueError):
+            WeightedDestinations(-np.ones((3, 3)))
+        with pytest.raises(ValueError):
+            WeightedDestinations(np.eye(3))
+
+    def test_sample(self):
+        rng = BlockRNG(0)
+        weights = np.array([
+            [5, 3, 1, 0],
+            [1, 0, 1, 1],
+            [1, 1, 0, 1],
+            [1, 1, 1, 0],
+        ])
+        destinations = WeightedDestinations(weights)
+
+        draws = [destinations.sample(0, rng) for _ in range(4000)]
+        counts = np.bincount(draws, minlength = 4)
+
+        assert counts[0] == 0, 'Customer rode back to the origin'
+        assert counts[3] == 0, 'Picked a destination with no demand'
+        assert abs(counts[1] / counts[2] - 3) < 0.5\
+            , 'Destinations do not follow the demand weights'
+
+    def test_sample_highest_draw(self):
+        # Each row of thirds or sevenths adds up to just below 1
+        weights = np.ones((8, 8))
+        weights[0, 4:] = 0
+        destinations = WeightedDestinations(weights)
+
+        assert destinations.sample(0, HighRNG()) == 3\
+            , 'Picked a destination with no demand'
+        assert destinations.sample(7, HighRNG()) == 6\
+            , 'Customer rode back to the origin'
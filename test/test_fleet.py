@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+from sim.fleet import Fleet, StationView, DockView, BikeView, CLASSIC, ELECTRIC
+from sim.bike import ClassicBike, ElectricBike
+from sim.rng import BlockRNG
+from sim.sim import Simulation
+from sim.consts import CLASSIC_BASE_RATE, ELECTRIC_BASE_RATE
+
+@pytest.fixture
+def fleet():
+    locations = np.array([[0, 0], [5, 0]])
+    return Fleet(locations, [2, 3], num_bikes = 2)
+
+class TestFleet:
+
+    def test_init_value_errors(self):
+        with pytest.raises(ValueError):
+            Fleet(np.zeros((2, 2)), [2, 0])
+        with pytest.raises(ValueError):
+            Fleet(np.zeros((3, 2)), [2, 2])
+
+    def test_layout(self, fleet):
+        assert len(fleet.dock_bike) == 5
+        assert [station.size for station in fleet.stations] == [2, 3]
+        assert fleet.stations[1].location == (5, 0)
+        assert fleet.stations[1].available_docks == 3
+        assert fleet.stations[1].available_bikes == 0
+
+    def test_place_remove(self, fleet):
+        fleet.add_bike(0)
+        fleet.place(1, 2, 0)
+        assert fleet.dock_bike[4] == 0
+        assert list(fleet.stations[1].occupied_docks) == [2]
+        assert sorted(fleet.stations[1].free_docks) == [0, 1]
+
+        with pytest.raises(ValueError):
+            fleet.place(1, 2, 1)
+
+        assert fleet.remove(1, 2) == 0
+        assert fleet.stations[1].available_bikes == 0
+        with pytest.raises(ValueError):
+            fleet.remove(1, 2)
+
+    def test_add_bike_grows(self, fleet):
+        fleet.add_bike(10, ELECTRIC, trip_id = 4)
+        assert fleet.num_bikes >= 11
+        assert fleet.bike_type[10] == ELECTRIC
+        assert fleet.bike_trip[10] == 4
+
+    def test_trip(self, fleet):
+        fleet.add_bike(0)
+        fleet.place(0, 1, 0)
+
+        bike_id = fleet.check_out(0, 1, 10)
+        fleet.check_in(1, 0, bike_id, 55, 45)
+
+        assert fleet.stations[0][1].log == [{
+            'bike_id': 0, 'trip_id': 1, 'start_time': 10, 
+            'start_station_id': 0
+        }]
+        assert fleet.stations[1][0].log == [{
+            'bike_id': 0, 'trip_id': 1, 'end_time': 55, 
+            'price': ClassicBike(0).price(45), 'duration': 45,
+            'end_station_id': 1
+        }]
+        assert fleet.stations[1].log == fleet.stations[1][0].log
+
+class TestViews:
+
+    def test_dock_view(self, fleet):
+        dock = fleet.stations[0][1]
+        assert isinstance(dock, DockView)
+        assert dock.bike is None
+
+        dock.bike = ElectricBike(1)
+        assert isinstance(dock.bike, BikeView)
+        assert dock.bike.id == 1
+        assert dock.bike.price(10) == ELECTRIC_BASE_RATE
+
+        bike = dock.check_out(5)
+        assert bike.trip_id == 1
+        assert dock.bike is None
+
+        dock.check_in(bike, 20, 15)
+        assert dock.log[-1]['end_time'] == 20
+
+    def test_station_view(self, fleet):
+        station = fleet.stations[0]
+        assert isinstance(station, StationView)
+        assert len(station.docks) == 2
+        with pytest.raises(IndexError):
+            station[2]
+
+        station[0].bike = ClassicBike(0)
+        assert station.available_bikes == 1
+        assert station.free_docks.sample(BlockRNG(0)) == 1
+        assert station.occupied_docks.sample(BlockRNG(0)) == 0
+
+    def test_bike_view(self, fleet):
+        fleet.add_bike(0, CLASSIC)
+        bike = BikeView(fleet, 0)
+        bike.ride()
+        assert bike.trip_id == 1
+        assert bike.price(0) == CLASSIC_BASE_RATE
+        with pytest.raises(ValueError):
+            bike.price(-1)
+
+class TestArraysBackend:
+
+    def test_backend_error(self):
+        with pytest.raises(ValueError):
+            Simulation(10, backend = 'sparse')
+
+    @pytest.mark.parametrize('engine', ['event', 'minute'])
+    def test_matches_objects(self, engine):
+        objects_sim = Simulation(1440, seed = 3, engine = engine)
+        arrays_sim = Simulation(1440, seed = 3, engine = engine,
+                                backend = 'arrays')
+
+        assert arrays_sim.full_log == objects_sim.full_log\
+            , 'Array backend diverged from the object backend'
@@ -0,0 +1,32 @@
+import numpy as np
+from sim.indexset import IndexedSet
+from sim.rng import BlockRNG
+
+class TestIndexedSet:
+
+    def test_add_discard(self):
+        items = IndexedSet([3, 1, 2])
+        items.add(1)
+        assert len(items) == 3, 'Duplicate item was added'
+
+        items.discard(3)
+        items.discard(5)
+        assert sorted(items) == [1, 2]
+        assert 3 not in items and 1 in items
+
+        items.discard(2)
+        items.discard(1)
+        assert len(items) == 0
+        assert items.sample(BlockRNG(0)) is None
+
+    def test_sample_uniform(self):
+        rng = BlockRNG(0)
+        items = IndexedSet(range(4))
+        items.discard(0)
+
+        draws = [items.sample(rng) for _ in range(3000)]
+        counts = np.bincount(draws, minlength = 4)
+
+        assert counts[0] == 0, 'Sampled an item that was removed'
+        assert np.all(np.abs(counts[1:] - 1000) < 150)\
+            , 'Samples are not uniform'
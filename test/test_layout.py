@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sim import layout
+from sim.station import Station
+from sim.sim import Simulation
+
+class TestLayout:
+
+    def test_grid(self):
+        coords = layout.grid(9, 5)
+        assert coords.dtype == np.int64
+        assert coords.tolist()[:4] == [[-5, -5], [0, -5], [5, -5], [-5, 0]]
+        assert coords.min() == -5 and coords.max() == 5
+
+        coords = layout.grid(10001)
+        assert coords.shape == (10001, 2)
+        assert len(np.unique(coords, axis = 0)) == 10001
+
+    def test_random(self):
+        coords = layout.random(1000, 50, np.random.default_rng(0))
+        assert coords.shape == (1000, 2) and coords.dtype == np.int64
+        assert coords.min() >= -50 and coords.max() <= 50
+
+    def test_clustered(self):
+        generator = np.random.default_rng(0)
+        coords = layout.clustered(
+            5000, 1000, generator, num_clusters = 3, spread = 10
+        )
+        assert coords.shape == (5000, 2)
+
+        # Stations huddle around a handful of centres
+        assert len(np.unique(np.round(coords, -2), axis = 0)) < 50
+
+        with pytest.raises(ValueError):
+            layout.clustered(10, 10, generator, num_clusters = 0)
+
+    def test_load(self, tmp_path):
+        csv_path = tmp_path / 'stations.csv'
+        csv_path.write_text('x,y,name\n1.5,2.25,a\n-3,4,b\n')
+        coords = layout.load(csv_path, scale = 100)
+        assert coords.tolist() == [[150, 225], [-300, 400]]
+
+        no_header = tmp_path / 'plain.csv'
+        no_header.write_text('1,2\n')
+        assert layout.load(no_header).tolist() == [[1, 2]]
+
+        npy_path = tmp_path / 'stations.npy'
+        np.save(npy_path, np.array([[1, 2], [3, 4], [5, 6]]))
+        assert layout.load(npy_path).shape == (3, 2)
+
+        with pytest.raises(ValueError):
+            layout.load(npy_path, scale = 0)
+
+    def test_as_tuples(self):
+        for location in layout.as_tuples(layout.grid(4)):
+            Station(0, location, 1)
+
+        assert layout.as_tuples(np.array([[1.0, -2.0]])) == [(1, -2)]
+        with pytest.raises(ValueError):
+            layout.as_tuples([[40.71, -74.0], [40.72, -74.01]])
+        with pytest.raises(ValueError):
+            Simulation(layout = [[40.71, -74.0], [40.72, -74.01],
+                                 [40.75, -73.99]])
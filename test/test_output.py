@@ -0,0 +1,55 @@
+import io
+import json
+import numpy as np
+import pytest
+from sim.output import NullSink, MemorySink, TextSink, JSONLinesSink
+
+class TestSinks:
+
+    def test_null_sink(self):
+        sink = NullSink()
+        assert not sink.enabled, 'NullSink should ask to be skipped'
+        sink.emit('minute', time = 0)
+
+    def test_memory_sink(self):
+        sink = MemorySink()
+        sink.emit('check_out', time = 3, station = 1, dock = 2)
+        assert sink.events == [
+            {'event': 'check_out', 'time': 3, 'station': 1, 'dock': 2}
+        ]
+
+    def test_text_sink_buffers(self):
+        stream = io.StringIO()
+        sink = TextSink(stream, buffer_size = 3)
+
+        sink.emit('minute', time = 0)
+        sink.emit('minute', time = 1)
+        assert stream.getvalue() == '', 'TextSink wrote before buffer filled'
+
+        sink.emit('minute', time = 2)
+        assert stream.getvalue() == 'Minute: 0\nMinute: 1\nMinute: 2\n'
+
+    def test_text_sink_render(self):
+        stream = io.StringIO()
+        sink = TextSink(stream)
+        sink.emit('check_in', time = 3, station = 1, dock = 2)
+        sink.close()
+
+        assert stream.getvalue() == \
+            '---- Bike checked into Station: 1 Dock: 2\n---------\n'
+
+    def test_json_lines_sink(self):
+        stream = io.StringIO()
+        sink = JSONLinesSink(stream)
+        sink.emit('check_out', time = 3, station = np.int64(1), dock = 2)
+        sink.emit('minute', time = 4)
+        sink.close()
+
+        lines = stream.getvalue().splitlines()
+        assert json.loads(lines[0]) == \
+            {'event': 'check_out', 'time': 3, 'station': 1, 'dock': 2}
+        assert json.loads(lines[1]) == {'event': 'minute', 'time': 4}
+
+    def test_buffer_size_error(self):
+        with pytest.raises(ValueError):
+            TextSink(buffer_size = 0)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from sim.pricing import PerMinute, Membership, Surge, reprice
+from sim.bike import ClassicBike, ElectricBike
+from sim.fleet import CLASSIC, ELECTRIC
+from sim.sim import Simulation
+
+@pytest.fixture
+def trips():
+    # Every combination of a few durations, both types, membership and fill
+    generator = np.random.default_rng(0)
+    size = 1000
+    return {
+        'duration': generator.integers(0, 120, size),
+        'bike_type': generator.integers(0, 2, size).astype(np.int8),
+        'member': generator.random(size) < 0.5,
+        'start_fill': generator.random(size),
+    }
+
+PLANS = [
+    PerMinute(),
+    PerMinute(add_rates = (0.15, 0.25), included = 20),
+    Membership(member_share = 0.5),
+    Surge(low = 0.3, multiplier = 2),
+    Surge(Membership(), low = 0.1),
+]
+
+class TestPricing:
+
+    @pytest.mark.parametrize('duration', [0, 10, 30, 31, 45, 200])
+    def test_default_matches_bikes(self, duration):
+        plan = PerMinute()
+        assert plan.price(duration, CLASSIC) == ClassicBike(0).price(duration)
+        assert plan.price(duration, ELECTRIC) \
+            == ElectricBike(0).price(duration)
+
+    @pytest.mark.parametrize('plan', PLANS)
+    def test_price_trips_matches_price(self, plan, trips):
+        expected = [
+            plan.price(*row) for row in zip(
+                trips['duration'].tolist(), trips['bike_type'].tolist(),
+                trips['member'].tolist(), trips['start_fill'].tolist()
+            )
+        ]
+        assert np.array_equal(reprice(trips, plan), expected)\
+            , 'Bulk pricing should agree with pricing trip by trip'
+
+    def test_member_and_surge(self):
+        plan = Surge(Membership(), low = 0.2, multiplier = 2)
+        assert plan.member_share == 0.3
+        assert plan.price(40, CLASSIC, member = True) == 0
+        assert plan.price(50, CLASSIC, member = True, fill = 0.1) \
+            == pytest.approx(1.0)
+        assert plan.price(10, CLASSIC, fill = 0.1) == 7.0
+
+    def test_value_errors(self):
+        with pytest.raises(ValueError):
+            PerMinute(add_rates = (-0.1, 0.2))
+        with pytest.raises(ValueError):
+            Membership(member_share = 2)
+        with pytest.raises(ValueError):
+            Surge(low = 1.5)
+
+    @pytest.mark.parametrize('plan', PLANS)
+    def test_negative_duration(self, plan):
+        with pytest.raises(ValueError):
+            plan.price(-1, CLASSIC)
+        with pytest.raises(ValueError):
+            plan.price_trips(
+                np.array([10, -1]), np.array([CLASSIC, ELECTRIC]),
+                np.array([True, False]), np.array([0.5, 0.5])
+            )
+
+    @pytest.mark.parametrize('backend', ['objects', 'arrays'])
+    def test_reprice_simulation(self, backend):
+        plan = Surge(Membership(), low = 0.5)
+        options = dict(
+            seed = 0, backend = backend, electric_bikes = 0.3, pricing = plan
+        )
+        event_sim = Simulation(600, engine = 'event', **options)
+        minute_sim = Simulation(600, engine = 'minute', **options)
+        assert event_sim.full_log == minute_sim.full_log
+
+        trip_log = event_sim.trip_log
+        assert trip_log['member'].any()
+        assert (trip_log['start_fill'] < 0.5).any()
+        assert np.array_equal(reprice(trip_log, plan), trip_log['price'])\
+            , 'Repricing under the same plan should change nothing'
+
+        cheaper = reprice(trip_log, Surge(Membership(), low = 0.5,
+                                          multiplier = 1))
+        assert cheaper.sum() < trip_log['price'].sum()
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from sim.rebalance import Rebalancer, Trucks
+from sim.availability import AvailabilityIndex
+from sim.station import Station
+from sim.dock import Dock
+from sim.bike import ClassicBike
+from sim.sim import Simulation
+from sim.events import CHECK_IN
+
+@pytest.fixture
+def times():
+    # Stations on a line, one minute apart
+    positions = np.arange(5)
+    return np.abs(positions[:, np.newaxis] - positions[np.newaxis, :])
+
+class TestRebalancer:
+
+    def test_init_value_errors(self):
+        with pytest.raises(ValueError):
+            Rebalancer(num_trucks = 0)
+        with pytest.raises(ValueError):
+            Rebalancer(capacity = 0)
+        with pytest.raises(ValueError):
+            Rebalancer(low = 0.8, high = 0.2)
+
+    def test_plan(self, times):
+        rebalancer = Rebalancer(num_trucks = 2, capacity = 4)
+        bikes = np.array([10, 5, 5, 0, 1])
+        docks = np.array([0, 5, 5, 10, 9])
+        trucks = Trucks([2, 2], capacity = 4)
+
+        jobs = rebalancer.plan(bikes, docks, times, trucks)
+        assert jobs[0] == (0, 0, 3, 4)
+        assert jobs[1] == (1, 0, 3, 1)\
+            , 'Second truck should take what the first could not'
+
+    def test_plan_with_fill_levels(self, times):
+        stations = [
+            Station(i, (np.int64(i), np.int64(0)), 10) for i in range(5)
+        ]
+        for station, bikes in zip(stations, [10, 5, 5, 0, 1]):
+            for dock_id in range(10):
+                station[dock_id] = Dock(dock_id)
+            for dock_id in range(bikes):
+                station[dock_id].bike = ClassicBike(dock_id)
+        availability = AvailabilityIndex(stations)
+
+        rebalancer = Rebalancer(num_trucks = 2, capacity = 4)
+        jobs = rebalancer.plan(
+            availability.bikes, availability.docks, times, Trucks([2, 2], 4),
+            fill = availability.fill_levels()
+        )
+        assert jobs == [(0, 0, 3, 4), (1, 0, 3, 1)]
+
+    def test_plan_with_load(self, times):
+        rebalancer = Rebalancer(num_trucks = 1, capacity = 4)
+        trucks = Trucks([1], capacity = 4)
+        trucks.loads[0] = ['bike', 'bike', 'bike', 'bike']
+
+        jobs = rebalancer.plan([5, 5, 5, 5, 0], [5, 5, 5, 5, 10], times, trucks)
+        assert jobs == [(0, 1, 4, 0)]
+
+    def test_nothing_to_do(self, times):
+        rebalancer = Rebalancer()
+        trucks = rebalancer.trucks(5)
+        assert trucks.position.tolist() == [0, 4]
+        assert rebalancer.plan([5] * 5, [5] * 5, times, trucks) == []
+
+class TestRebalancing:
+
+    @pytest.mark.parametrize('backend', ['objects', 'arrays'])
+    def test_engines_agree(self, backend):
+        options = dict(
+            seed = 0, backend = backend, per_station = True, 
+            checkout_rate = 0.5, destinations = np.eye(9)[[1] * 9] + 0.01,
+            rebalancer = Rebalancer(num_trucks = 2, capacity = 6)
+        )
+        event_sim = Simulation(1200, engine = 'event', **options)
+        minute_sim = Simulation(1200, engine = 'minute', **options)
+
+        assert event_sim.stats.rebalanced > 0
+        assert event_sim.full_log == minute_sim.full_log
+        assert event_sim.stats.as_dict() == minute_sim.stats.as_dict()
+
+    def test_bikes_conserved_and_not_logged(self):
+        simulation = Simulation(
+            1200, seed = 0, rebalancer = Rebalancer(), checkout_rate = 0.5,
+            destinations = np.eye(9)[[1] * 9] + 0.01
+        )
+        docked = simulation.availability.bikes.sum()
+        riding = sum(
+            1 for _, kind, _ in simulation.events if kind == CHECK_IN
+        )
+        carried = sum(len(load) for load in simulation.trucks.loads)
+        assert simulation.stats.rebalanced > 0
+        assert docked + riding + carried == 80
+        assert simulation.stats.rides == len(simulation.trip_log)
+
+    def test_helps_unmet_demand(self):
+        options = dict(
+            seed = 0, per_station = True, checkout_rate = 0.5,
+            destinations = np.eye(9)[[1] * 9] + 0.01
+        )
+        without = Simulation(1440, **options)
+        with_trucks = Simulation(
+            1440, rebalancer = Rebalancer(num_trucks = 3), **options
+        )
+        assert with_trucks.stats.unmet_demand < without.stats.unmet_demand
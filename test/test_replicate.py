@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from sim.replicate import replicate, summarize, run_replication, METRICS
+
+class TestReplicate:
+
+    def test_value_errors(self):
+        with pytest.raises(ValueError):
+            replicate(0, 60)
+        with pytest.raises(ValueError):
+            replicate(2, 60, confidence = 1)
+
+    def test_run_replication(self):
+        summary = run_replication(600, 0, {})
+        assert summary.shape == (len(METRICS),)
+        assert summary[METRICS.index('rides')] > 0
+
+    def test_independent_of_workers(self):
+        serial = replicate(4, 600, seed = 0, workers = 1)
+        parallel = replicate(4, 600, seed = 0, workers = 2)
+
+        assert np.array_equal(serial['samples'], parallel['samples'])\
+            , 'Results depend on how replications are spread over workers'
+        assert len(np.unique(serial['samples'][:, 0])) > 1\
+            , 'Replications are not independent'
+
+    def test_options(self):
+        result = replicate(2, 600, seed = 0, workers = 1, checkout_rate = 0)
+        assert result['rides']['mean'] == 0
+
+    def test_summarize(self):
+        samples = np.tile([[1.0], [3.0]], (1, len(METRICS)))
+        result = summarize(samples, 0.95)
+
+        assert result['rides']['mean'] == 2.0
+        assert result['rides']['low'] < 2.0 < result['rides']['high']
+
+        single = summarize(samples[:1])
+        assert single['revenue']['low'] == single['revenue']['high'] == 1.0
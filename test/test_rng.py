@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from sim.rng import BlockRNG
+
+class TestBlockRNG:
+
+    def test_init_value_errors(self):
+        with pytest.raises(ValueError):
+            BlockRNG(0, block_size = 0)
+
+    def test_matches_generator(self):
+        rng = BlockRNG(3, block_size = 5)
+        draws = [rng.random() for _ in range(12)]
+
+        # Blocks are drawn back to back from the same Generator
+        generator = np.random.default_rng(3)
+        expected = np.concatenate([generator.random(5) for _ in range(3)])
+        assert draws == expected[:12].tolist()
+
+    def test_integers(self):
+        rng = BlockRNG(0)
+        draws = [rng.integers(3) for _ in range(3000)]
+
+        assert set(draws) == {0, 1, 2}
+        assert np.all(np.abs(np.bincount(draws) - 1000) < 150)
+
+    def test_state(self):
+        rng = BlockRNG(0, block_size = 7)
+        [rng.random() for _ in range(10)]
+        state = rng.state
+
+        expected = [rng.random() for _ in range(20)]
+        copy = BlockRNG(1, block_size = 7)
+        copy.state = state
+        assert [copy.random() for _ in range(20)] == expected
@@ -0,0 +1,279 @@
+import numpy as np
+import pytest
+from sim.sim import Simulation
+from sim.events import EventQueue, CHECK_OUT, CHECK_IN
+from sim.output import MemorySink
+
+def run_seeded(length, engine, seed = 0):
+    return Simulation(length, engine = engine, seed = seed)
+
+def same_results(first, second):
+    assert first.keys() == second.keys()
+    return all(
+        first[key] == second[key] if isinstance(first[key], dict)
+        else np.array_equal(first[key], second[key])
+        for key in first
+    )
+
+class TestEventQueue:
+
+    def test_order(self):
+        events = EventQueue()
+        events.push(5, CHECK_IN, 'a')
+        events.push(5, CHECK_OUT, 'b')
+        events.push(2, CHECK_IN, 'c')
+        events.push(5, CHECK_IN, 'd')
+
+        assert events.peek_time() == 2
+        order = [events.pop()[2] for _ in range(len(events))]
+        assert order == ['c', 'b', 'a', 'd']\
+            , 'Events not ordered by time, then kind, then insertion'
+        assert events.peek_time() is None
+
+class TestSimulation:
+
+    def test_engine_error(self):
+        with pytest.raises(ValueError):
+            Simulation(10, engine = 'hourly')
+
+    @pytest.mark.parametrize('backend', Simulation.backends)
+    def test_station_size_error(self, backend):
+        for station_size in [0, 25]:
+            with pytest.raises(ValueError):
+                Simulation(10, station_size = station_size, backend = backend)
+        with pytest.raises(TypeError):
+            Simulation(10, station_size = 10.0, backend = backend)
+
+    @pytest.mark.parametrize('seed', [0, 1, 2])
+    def test_engines_agree(self, seed):
+        event_sim = run_seeded(600, 'event', seed)
+        minute_sim = run_seeded(600, 'minute', seed)
+
+        assert event_sim.full_log == minute_sim.full_log\
+            , 'Event and minute engines produced different logs'
+        assert event_sim.generate_statistics()\
+            == minute_sim.generate_statistics()
+
+    def test_seed_reproducible(self):
+        first = run_seeded(600, 'event', 7)
+        second = run_seeded(600, 'event', 7)
+        other = run_seeded(600, 'event', 8)
+
+        assert first.full_log == second.full_log\
+            , 'Same seed gave different runs'
+        assert first.full_log != other.full_log
+
+    def test_silent_by_default(self, capsys):
+        run_seeded(120, 'event')
+        assert capsys.readouterr().out == '', 'Simulation printed by default'
+
+    def test_sink_events(self):
+        sink = MemorySink()
+        simulation = Simulation(600, sink = sink, seed = 0)
+        kinds = [event['event'] for event in sink.events]
+
+        assert kinds[0] == 'start' and kinds[-1] == 'end'
+        assert kinds.count('check_in') == simulation.generate_statistics()[0]\
+            , 'Every completed ride should be reported once'
+
+        minutes = [event['time'] for event in sink.events 
+                   if event['event'] == 'minute']
+        assert minutes and minutes == sorted(set(minutes))\
+            , 'Every minute with events should be marked once, in order'
+
+    def test_generate_checkouts(self):
+        simulation = run_seeded(10, 'event')
+
+        checkouts = simulation.generate_checkouts(100000, 0.25)
+        assert checkouts.shape == (100000,)
+        assert checkouts.dtype == np.uint8, 'Counts should be stored compactly'
+        assert abs(checkouts.mean() - 0.25) < 0.01
+
+        checkouts = simulation.generate_checkouts(100000, 0.9, True)
+        assert checkouts.shape == (100000, 9)
+        assert abs(checkouts.sum(axis = 1).mean() - 0.9) < 0.02
+
+    @pytest.mark.parametrize('seed', [0, 1])
+    def test_engines_agree_per_station(self, seed):
+        event_sim = Simulation(
+            600, engine = 'event', seed = seed, per_station = True, 
+            checkout_rate = 0.3
+        )
+        minute_sim = Simulation(
+            600, engine = 'minute', seed = seed, per_station = True,
+            checkout_rate = 0.3
+        )
+        assert event_sim.full_log == minute_sim.full_log
+
+    def test_full_log_cache(self):
+        simulation = run_seeded(600, 'event')
+        full_log = simulation.full_log
+        assert simulation.full_log is full_log\
+            , 'full_log rebuilt without any changes'
+
+        station = next(
+            station for station in simulation.stations 
+            if station.available_bikes
+        )
+        station[next(iter(station.occupied_docks))].check_out(600)
+        assert len(simulation.full_log) == len(full_log) + 1
+
+    @pytest.mark.parametrize('engine', ['event', 'minute'])
+    def test_step_matches_run(self, engine):
+        whole = run_seeded(3000, engine)
+
+        stepped = Simulation(engine = engine, seed = 0)
+        assert stepped.time == 0 and not stepped.trip_log
+        stepped.step()
+        stepped.step(999)
+        stepped.run_until(2500)
+        stepped.run(500)
+
+        assert stepped.time == 3000
+        assert stepped.full_log == whole.full_log\
+            , 'Running in pieces should not change the simulation'
+        assert same_results(stepped.results(), whole.results())
+
+    def test_reset(self):
+        simulation = run_seeded(600, 'event')
+        full_log = simulation.full_log
+        results = simulation.results()
+
+        simulation.reset()
+        assert simulation.time == 0 and simulation.full_log == []
+        simulation.run_until(600)
+        assert simulation.full_log == full_log
+        assert same_results(simulation.results(), results)
+
+        with pytest.raises(ValueError):
+            simulation.run_until(599)
+
+    def test_layout_options(self):
+        simulation = Simulation(
+            num_stations = 16, station_size = 10, num_bikes = 200, speed = 1
+        )
+        assert len(simulation.stations) == 16
+        assert len(set(simulation.locations)) == 16
+        assert all(station.size == 10 for station in simulation.stations)
+        assert sum(
+            station.available_bikes for station in simulation.stations
+        ) == 160, 'Bikes that do not fit should be left out'
+
+        with pytest.raises(ValueError):
+            Simulation(num_stations = 1)
+
+    def test_layouts(self):
+        simulation = Simulation(60, layout = 'clustered', seed = 0)
+        again = Simulation(60, layout = 'clustered', seed = 0)
+        assert simulation.locations == again.locations
+
+        locations = np.array([[0, 0], [10, 0], [0, 10], [10, 10], [5, 5]])
+        simulation = Simulation(600, layout = locations, seed = 0)
+        assert len(simulation.stations) == 5
+        assert simulation.stations[4].location == (5, 5)
+
+        with pytest.raises(ValueError):
+            Simulation(layout = 'hexagonal')
+        with pytest.raises(ValueError):
+            Simulation(layout = locations, num_stations = 4)
+
+    @pytest.mark.parametrize('engine', ['event', 'minute'])
+    def test_reroute_nearest(self, engine):
+        # Small stations and busy riders make for many full destinations
+        options = dict(
+            engine = engine, seed = 0, num_stations = 25, station_size = 4,
+            num_bikes = 90, checkout_rate = 2, layout = 'random'
+        )
+        nearest = Simulation(600, **options)
+        wandering = Simulation(600, reroute = 'random', **options)
+
+        assert nearest.stats.reroutes > 0
+        assert nearest.trip_log['duration'].mean() \
+            < wandering.trip_log['duration'].mean()\
+            , 'Rerouting to the nearest station should keep trips short'
+
+        with pytest.raises(ValueError):
+            Simulation(reroute = 'teleport')
+
+    @pytest.mark.parametrize('reroute_k', [1, 3])
+    def test_engines_agree_with_reroutes(self, reroute_k):
+        options = dict(
+            seed = 1, num_stations = 16, station_size = 3, num_bikes = 40,
+            checkout_rate = 1, reroute_k = reroute_k
+        )
+        event_sim = Simulation(600, engine = 'event', **options)
+        minute_sim = Simulation(600, engine = 'minute', **options)
+        assert event_sim.stats.reroutes > 0
+        assert event_sim.full_log == minute_sim.full_log
+
+    @pytest.mark.parametrize('backend', ['objects', 'arrays'])
+    def test_engines_agree_with_electric_bikes(self, backend):
+        options = dict(
+            seed = 2, backend = backend, checkout_rate = 1,
+            electric_bikes = 30
+        )
+        event_sim = Simulation(600, engine = 'event', **options)
+        minute_sim = Simulation(600, engine = 'minute', **options)
+        assert event_sim.full_log == minute_sim.full_log
+        assert event_sim.stats.as_dict() == minute_sim.stats.as_dict()
+
+    def test_electric_bikes_charge(self):
+        # More riders than bikes, so every bike that is ready gets taken
+        options = dict(seed = 0, checkout_rate = 2, num_bikes = 10)
+        classic = Simulation(600, **options)
+        electric = Simulation(600, electric_bikes = 10, **options)
+
+        assert electric.stats.unmet_demand > classic.stats.unmet_demand\
+            , 'Riders should be turned away while e-bikes charge'
+
+        with pytest.raises(ValueError):
+            Simulation(electric_bikes = 1000)
+
+    def test_fleet_mix(self):
+        simulation = Simulation(electric_bikes = 0.25, num_bikes = 40)
+        assert simulation.electric_bikes == 10
+        assert simulation.bike_types.sum() == 10
+        assert simulation.bike_types[:4].sum() == 1\
+            , 'Electric bikes should be spread through the fleet'
+
+        with pytest.raises(ValueError):
+            Simulation(electric_bikes = 1.5)
+        with pytest.raises(ValueError):
+            Simulation(prefer_electric = -0.1)
+
+    @pytest.mark.parametrize('engine', ['event', 'minute'])
+    def test_prefer_electric(self, engine):
+        options = dict(
+            engine = engine, seed = 0, checkout_rate = 2, 
+            electric_bikes = 0.5, prefer_electric = 1.0
+        )
+        choosy = Simulation(600, fallback = False, **options)
+        flexible = Simulation(600, **options)
+
+        assert choosy.stats.fallbacks == 0
+        assert flexible.stats.fallbacks > 0
+        assert flexible.stats.unmet_demand < choosy.stats.unmet_demand\
+            , 'Riders falling back to classic bikes should meet more demand'
+
+    @pytest.mark.parametrize('backend', ['objects', 'arrays'])
+    def test_engines_agree_with_preferences(self, backend):
+        options = dict(
+            seed = 3, backend = backend, checkout_rate = 1, 
+            electric_bikes = 0.3, prefer_electric = 0.6
+        )
+        event_sim = Simulation(600, engine = 'event', **options)
+        minute_sim = Simulation(600, engine = 'minute', **options)
+        assert event_sim.full_log == minute_sim.full_log
+        assert event_sim.stats.as_dict() == minute_sim.stats.as_dict()
+
+    @pytest.mark.parametrize('layout', ['clustered', 'random'])
+    def test_engines_agree_with_close_stations(self, layout):
+        # Crowded layouts put some stations less than a minute apart
+        options = dict(
+            layout = layout, num_stations = 200, num_bikes = 1000, seed = 1,
+            checkout_rate = 2
+        )
+        event_sim = Simulation(1000, engine = 'event', **options)
+        minute_sim = Simulation(1000, engine = 'minute', **options)
+        assert event_sim.full_log == minute_sim.full_log
+        assert event_sim.trip_log['duration'].min() >= 1
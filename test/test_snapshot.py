@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from sim.sim import Simulation
+from sim.events import CHECK_IN
+from sim.consts import NUM_BIKES
+from sim.rebalance import Rebalancer
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    return tmp_path / 'snapshot'
+
+class TestSnapshot:
+
+    @pytest.mark.parametrize('engine', ['event', 'minute'])
+    @pytest.mark.parametrize('backend', ['objects', 'arrays'])
+    def test_restore_continues_run(self, snapshot_dir, engine, backend):
+        whole = Simulation(3000, engine = engine, backend = backend, seed = 1)
+
+        first = Simulation(engine = engine, backend = backend, seed = 1)
+        first.run_until(1700)
+        first.save(snapshot_dir)
+
+        # The seed of the simulation restored into does not matter
+        second = Simulation(engine = engine, backend = backend, seed = 2)
+        second.restore(snapshot_dir)
+        assert second.time == 1700
+        second.run_until(3000)
+
+        for name, column in whole.trip_log.as_arrays().items():
+            assert np.array_equal(second.trip_log[name], column)\
+                , 'Restored run should carry on exactly where it stopped'
+        assert second.stats.as_dict() == whole.stats.as_dict()
+
+    def test_fork(self, snapshot_dir):
+        warm = Simulation(600, seed = 0)
+        warm.save(snapshot_dir)
+
+        busy = Simulation(checkout_rate = 1.0, seed = 0)
+        busy.restore(snapshot_dir)
+        busy.run(600)
+
+        assert len(busy.trip_log) > len(warm.trip_log)
+        assert np.array_equal(
+            busy.trip_log['trip_id'][:len(warm.trip_log)], 
+            warm.trip_log['trip_id']
+        ), 'Fork should keep the trips completed before the snapshot'
+
+    def test_bikes_conserved(self, snapshot_dir):
+        simulation = Simulation(500, seed = 3)
+        simulation.save(snapshot_dir)
+        simulation.restore(snapshot_dir)
+
+        docked = sum(
+            station.available_bikes for station in simulation.stations
+        )
+        riding = sum(
+            1 for _, kind, _ in simulation.events if kind == CHECK_IN
+        )
+        assert docked + riding == NUM_BIKES
+
+    def test_mismatch_errors(self, snapshot_dir):
+        Simulation(100, seed = 0).save(snapshot_dir)
+
+        with pytest.raises(ValueError):
+            Simulation(engine = 'minute').restore(snapshot_dir)
+
+    @pytest.mark.parametrize('engine', ['event', 'minute'])
+    def test_restore_with_trucks(self, snapshot_dir, engine):
+        options = dict(
+            engine = engine, seed = 0, checkout_rate = 0.5,
+            destinations = np.eye(9)[[1] * 9] + 0.01
+        )
+        whole = Simulation(1500, rebalancer = Rebalancer(), **options)
+
+        first = Simulation(rebalancer = Rebalancer(), **options)
+        first.run_until(707)
+        first.save(snapshot_dir)
+
+        second = Simulation(rebalancer = Rebalancer(), **options)
+        second.restore(snapshot_dir)
+        second.run_until(1500)
+
+        assert whole.stats.rebalanced > 0
+        assert second.stats.as_dict() == whole.stats.as_dict()
+        assert np.array_equal(second.trip_log['end_time'], 
+                              whole.trip_log['end_time'])
+
+        with pytest.raises(ValueError):
+            Simulation(
+                rebalancer = Rebalancer(num_trucks = 5), **options
+            ).restore(snapshot_dir)
+
+    def test_restore_with_electric_bikes(self, snapshot_dir):
+        options = dict(
+            seed = 0, checkout_rate = 1, electric_bikes = 40,
+            prefer_electric = 0.5
+        )
+        whole = Simulation(1200, **options)
+
+        first = Simulation(**options)
+        first.run_until(500)
+        first.save(snapshot_dir)
+
+        second = Simulation(**options)
+        second.restore(snapshot_dir)
+        second.run_until(1200)
+
+        assert second.stats.as_dict() == whole.stats.as_dict()
+        assert np.array_equal(second.trip_log['end_time'],
+                              whole.trip_log['end_time'])
+
+        with pytest.raises(ValueError):
+            Simulation(seed = 0).restore(snapshot_dir)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from sim.spatial import NearestStations
+from sim.indexset import IndexedSet
+from sim.layout import grid
+
+def brute_force(locations, station_id, candidates, k, p):
+    diffs = np.abs(locations - locations[station_id])
+    distances = (diffs ** p).sum(axis = 1) ** (1 / p)
+    order = [
+        i for i in np.argsort(distances, kind = 'stable').tolist()
+        if i != station_id and i in candidates
+    ]
+    return distances, order[:k]
+
+class TestNearestStations:
+
+    @pytest.mark.parametrize('metric, p', [('cityblock', 1), ('euclidean', 2)])
+    @pytest.mark.parametrize('fraction', [0.9, 0.01])
+    def test_matches_brute_force(self, metric, p, fraction):
+        generator = np.random.default_rng(0)
+        locations = generator.random((500, 2)) * 1000
+        candidates = IndexedSet(
+            np.flatnonzero(generator.random(500) < fraction).tolist()
+        )
+        index = NearestStations(locations, metric)
+
+        for station_id in range(0, 500, 25):
+            for k in (1, 4):
+                found = index.nearest(station_id, candidates, k)
+                distances, expected = brute_force(
+                    locations, station_id, candidates, k, p
+                )
+                assert np.allclose(distances[found], distances[expected])
+                assert all(i in candidates for i in found)
+                assert station_id not in found
+
+    def test_travel_times(self):
+        times = np.array([[0, 9, 1, 5], [9, 0, 2, 2], [1, 2, 0, 3], 
+                          [5, 2, 3, 0]])
+        index = NearestStations(np.zeros((4, 2)), times)
+        assert index.nearest(0, {1, 2, 3}, 2) == [2, 3]
+        assert index.nearest(0, {1}, 2) == [1]
+
+    def test_no_candidates(self):
+        index = NearestStations([[0, 0], [1, 1], [2, 2]])
+        assert index.nearest(0, IndexedSet([0])) == []
+        with pytest.raises(ValueError):
+            index.nearest(0, IndexedSet([1]), 0)
+
+    @pytest.mark.parametrize('metric, p', [('cityblock', 1), ('euclidean', 2)])
+    def test_grid_ties(self, metric, p):
+        # On a grid most distances are ties, which the tree may return in
+        # any order
+        locations = grid(2500, 5)
+        generator = np.random.default_rng(1)
+        index = NearestStations(locations, metric)
+
+        for _ in range(300):
+            station_id = int(generator.integers(2500))
+            k = int(generator.integers(1, 8))
+            candidates = IndexedSet(np.flatnonzero(
+                generator.random(2500) < generator.choice([0.05, 0.5, 0.95])
+            ).tolist())
+
+            found = index.nearest(station_id, candidates, k)
+            distances, expected = brute_force(
+                locations, station_id, candidates, k, p
+            )
+            assert len(set(found)) == len(found) == len(expected)
+            assert np.allclose(distances[found], distances[expected])
+            assert all(i in candidates for i in found)
+
+    def test_travel_times_cached(self):
+        generator = np.random.default_rng(2)
+        locations = generator.random((300, 2)) * 100
+        times = np.abs(locations[:, None] - locations[None]).sum(axis = -1)
+        index = NearestStations(locations, times)
+
+        for fraction in (0.9, 0.02):
+            candidates = set(
+                np.flatnonzero(generator.random(300) < fraction).tolist()
+            )
+            for station_id in range(0, 300, 10):
+                found = index.nearest(station_id, candidates, 3)
+                _, expected = brute_force(
+                    locations, station_id, candidates, 3, 1
+                )
+                assert np.allclose(times[station_id, found],
+                                   times[station_id, expected])
+
+        assert len(index._orders[0]) == NearestStations.ORDER_LENGTH\
+            , 'Only the nearest stations of a station should be kept'
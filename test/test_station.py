@@ -28,6 +28,13 @@ def station(loc):
     station.docks[0], station.docks[1] = get_docks()
     return station
 
+@pytest.fixture
+def docked_station(loc):
+    station = Station(0, loc, 2)
+    station[0] = Dock(0, ClassicBike(0))
+    station[1] = Dock(1, ClassicBike(1))
+    return station
+
 
 class TestStation: 
 
@@ -63,54 +70,89 @@ class TestStation:
         for i in range(station.size):
             assert station[i] == None, 'This dock space is not empty'
     
-    def test_log(self, station):
+    def test_log(self, docked_station):
         # Make sure empty log
-        assert station.log == []\
+        assert docked_station.log == []\
             , "Log was wrongly instantiated with some activity"
 
-        # Pretend a trip started and check log
-        station.docks[0].log.append({
-            'bike_id': 1,
-            'trip_id': 1,
-            'start_time': 10,
-            'start_station_id': 1
-        })
-        assert station.log[0] == {
-            'bike_id': 1,
+        # A trip starts and is stamped with this station's id
+        bike = docked_station[0].check_out(10)
+        assert docked_station.log[0] == {
+            'bike_id': 0,
             'trip_id': 1,
             'start_time': 10,
             'start_station_id': 0
         }, 'Not registering trips correctly (check out)'
 
-        # Pretend a trip finished at another dock and check again
-        station.docks[1].log.append({
-            'bike_id': 2,
-            'trip_id': 1,
-            'end_time': 10,
-            'end_station_id': 1
-        })
-        assert station.log[1] == {
-            'bike_id': 2,
+        # The trip finishes at another dock of the same station
+        docked_station[1].check_out(12)
+        docked_station[1].check_in(bike, 20, 10)
+        assert docked_station.log[2] == {
+            'bike_id': 0,
             'trip_id': 1,
-            'end_time': 10,
+            'end_time': 20,
+            'price': CLASSIC_BASE_RATE,
+            'duration': 10,
             'end_station_id': 0
         }, 'Not registering trips correctly (check in)'
+
+    def test_log_cache(self, docked_station):
+        log = docked_station.log
+        assert docked_station.log is log, 'Log rebuilt without any changes'
+
+        docked_station[0].check_out(10)
+        assert docked_station.log is not log, 'Log not rebuilt after a trip'
+        assert len(docked_station.log) == 1
+        assert docked_station.version == 1
     
-    def test_available_bikes(self, station):
+    def test_available_bikes(self, station, docked_station):
         assert station.available_bikes == 2, 'Not registering number of bikes'
+        assert docked_station.available_bikes == 2\
+            , 'Not registering number of bikes'
 
-        station.docks[0].bike = None
-        assert station.available_bikes == 1, 'Not registering change in bikes'
+        docked_station[0].check_out(10)
+        assert docked_station.available_bikes == 1\
+            , 'Not registering change in bikes'
     
-    def test_available_docks(self, station):
-        assert station.available_docks == 0\
+    def test_available_docks(self, docked_station):
+        assert docked_station.available_docks == 0\
             , 'Not registering correct no. of docks'
 
-        station.docks[1].bike = None
-        assert station.available_docks == 1, "Not registering change in bikes"
-
-        station.docks[0].bike = None
-        assert station.available_docks == 2, "Not registering change in bikes"
+        bike = docked_station[1].check_out(10)
+        assert docked_station.available_docks == 1\
+            , "Not registering change in bikes"
+
+        docked_station[0].bike = None
+        assert docked_station.available_docks == 2\
+            , "Not registering change in bikes"
+
+        docked_station[0].check_in(bike, 20, 10)
+        assert docked_station.available_docks == 1\
+            , "Not registering change in bikes"
+
+    def test_docks_list(self, loc):
+        # Docks placed straight into the list are tracked too
+        station = Station(0, loc, 2)
+        station.docks[0] = Dock(0, ClassicBike(0))
+        station.docks[-1] = Dock(1)
+        assert station.available_bikes == 1
+        assert station.available_docks == 1
+        assert list(station.docks) == [station[0], station[1]]
+
+        station.docks[0].check_out(10)
+        assert station.available_bikes == 0
+        assert station.log[0]['start_station_id'] == 0\
+            , 'Trips at docks placed in the list should be logged'
+
+    def test_occupancy_sets(self, docked_station):
+        docked_station[1].check_out(10)
+        assert list(docked_station.occupied_docks) == [0]
+        assert list(docked_station.free_docks) == [1]
+
+        # Replacing a dock re-registers its space
+        docked_station[0] = Dock(0)
+        assert len(docked_station.occupied_docks) == 0
+        assert sorted(docked_station.free_docks) == [0, 1]
     
     def test__getitem__(self, station):
         assert isinstance(station[0], Dock)\
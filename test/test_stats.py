@@ -0,0 +1,81 @@
+import pytest
+from sim.stats import RunningStats, report
+from sim.triplog import TripLog
+from sim.sim import Simulation
+from sim.writers import CSVTripWriter
+
+class TestRunningStats:
+
+    def test_empty(self):
+        stats = RunningStats()
+        assert stats.avg_price == 0.0, 'No rides should not divide by zero'
+        assert stats.avg_duration == 0
+
+    def test_record_trip(self):
+        stats = RunningStats()
+        stats.record_trip(10, 3.5)
+        stats.record_trip(45, 5.0)
+
+        assert stats.rides == 2
+        assert stats.revenue == 8.5
+        assert stats.max_price == 5.0
+        assert stats.avg_price == 4.25
+        assert stats.avg_duration == 27
+
+class TestReport:
+
+    def test_report(self):
+        trip_log = TripLog()
+        trip_log.append(0, 1, 0, 2, 0, 10, 10, 3.5)
+        trip_log.append(1, 1, 0, 1, 0, 40, 40, 4.5)
+        trip_log.append(2, 1, 2, 0, 5, 25, 20, 3.5)
+
+        result = report(trip_log, 3, percentiles = (50,))
+        assert result['logged_rides'] == 3
+        assert result['logged_revenue'] == 11.5
+        assert result['duration'] == {50: 20}
+        assert result['departures'].tolist() == [2, 0, 1]
+        assert result['arrivals'].tolist() == [1, 1, 1]
+        assert result['revenue_by_station'].tolist() == [8.0, 0.0, 3.5]
+        assert result['mean_duration_by_station'].tolist() == [25, 0, 20]
+
+    def test_empty_report(self):
+        result = report(TripLog(), 2)
+        assert result['logged_rides'] == 0
+        assert result['price'][50] == 0.0
+
+class TestSimulationStats:
+
+    def test_matches_trip_log(self):
+        simulation = Simulation(1440, seed = 0)
+        rides, revenue, avg_price, avg_duration = \
+            simulation.generate_statistics()
+
+        assert rides == len(simulation.trip_log)
+        assert revenue == pytest.approx(simulation.trip_log['price'].sum())
+        assert simulation.stats.max_price == \
+            simulation.trip_log['price'].max()
+
+    def test_no_rides(self):
+        simulation = Simulation(60, seed = 0, checkout_rate = 0)
+        assert simulation.generate_statistics() == (0, 0.0, 0.0, 0)
+
+    def test_unmet_demand(self):
+        # Far more customers than bikes
+        simulation = Simulation(60, seed = 0, checkout_rate = 5)
+        assert simulation.stats.unmet_demand > 0
+        assert simulation.report()['unmet_demand'] == \
+            simulation.stats.unmet_demand
+
+    def test_report_with_writer(self, tmp_path):
+        simulation = Simulation(
+            1440, seed = 0, trip_writer = CSVTripWriter(tmp_path / 'trips.csv')
+        )
+        simulation.trip_writer.close()
+        result = simulation.results()
+
+        assert simulation.stats.rides > 0
+        assert result['rides'] == simulation.stats.rides\
+            , 'Written out trips should still count towards the totals'
+        assert result['revenue'] == simulation.stats.revenue
+        assert result['logged_rides'] == len(simulation.trip_log) == 0
@@ -0,0 +1,111 @@
+import csv
+import numpy as np
+import pytest
+from mock import patch
+from sim import sweep as sweep_module
+from sim.sweep import grid, sweep, config_key, setting_label
+from sim.rebalance import Rebalancer
+from sim.replicate import METRICS
+
+class TestSweep:
+
+    def test_grid(self):
+        configs = grid(num_bikes = [40, 60], station_size = [10, 15, 20])
+        assert len(configs) == 6
+        assert configs[0] == {'num_bikes': 40, 'station_size': 10}
+        assert configs[-1] == {'num_bikes': 60, 'station_size': 20}
+
+    def test_value_errors(self):
+        with pytest.raises(ValueError):
+            sweep([{}], 60, replications = 0)
+
+    def test_rows(self, tmp_path):
+        path = tmp_path / 'sweep.csv'
+        configs = grid(num_bikes = [0, 80], num_stations = [4, 9])
+        rows = sweep(
+            configs, 300, replications = 2, seed = 0, workers = 1, 
+            path = path
+        )
+
+        assert len(rows) == 8
+        assert rows[0]['num_bikes'] == 0 and rows[0]['rides'] == 0
+        assert rows[-1]['replication'] == 1 and rows[-1]['rides'] > 0
+
+        with open(path) as file:
+            table = list(csv.DictReader(file))
+        assert list(table[0]) == (
+            ['num_bikes', 'num_stations', 'replication'] + list(METRICS)
+        )
+        assert len(table) == 8
+
+    def test_identical_configs_run_once(self, tmp_path):
+        configs = [{'num_bikes': 40}, {'num_bikes': 40}, {'num_bikes': 50}]
+        with patch.object(
+            sweep_module, 'run_replication', 
+            side_effect = sweep_module.run_replication
+        ) as run:
+            rows = sweep(
+                configs, 120, seed = 0, workers = 1, cache = tmp_path
+            )
+        assert run.call_count == 2
+        assert rows[0] == rows[1]
+
+        # Everything is in the cache now
+        with patch.object(sweep_module, 'run_replication') as run:
+            cached = sweep(
+                configs, 120, seed = 0, workers = 1, cache = tmp_path
+            )
+        assert run.call_count == 0
+        assert cached == rows
+
+    def test_interrupted_sweep_keeps_results(self, tmp_path):
+        configs = grid(num_bikes = [20, 40, 60])
+        run_replication = sweep_module.run_replication
+        finished = []
+
+        def interrupted(*args):
+            if len(finished) == 2:
+                raise KeyboardInterrupt
+            finished.append(args)
+            return run_replication(*args)
+
+        with patch.object(sweep_module, 'run_replication', interrupted):
+            with pytest.raises(KeyboardInterrupt):
+                sweep(configs, 120, seed = 0, workers = 1, cache = tmp_path)
+        assert len(list(tmp_path.glob('*.npy'))) == 2\
+            , 'Runs finished before the interruption should be cached'
+
+        with patch.object(
+            sweep_module, 'run_replication', 
+            side_effect = sweep_module.run_replication
+        ) as run:
+            sweep(configs, 120, seed = 0, workers = 1, cache = tmp_path)
+        assert run.call_count == 1
+
+    def test_object_settings(self):
+        seed = np.random.SeedSequence(0)
+        assert config_key({'rebalancer': Rebalancer(2)}, 60, seed) \
+            == config_key({'rebalancer': Rebalancer(2)}, 60, seed)\
+            , 'Equal objects should share a key'
+        assert config_key({'rebalancer': Rebalancer(2)}, 60, seed) \
+            != config_key({'rebalancer': Rebalancer(3)}, 60, seed)
+
+        rows = sweep(
+            grid(rebalancer = [None, Rebalancer(2)]), 120, seed = 0,
+            workers = 1
+        )
+        assert len(rows) == 2
+        assert rows[0]['rebalancer'] is None
+        assert rows[1]['rebalancer'].startswith('Rebalancer-')
+        assert rows[1]['rebalancer'] == setting_label(Rebalancer(2))\
+            , 'Equal settings should get the same label'
+        assert setting_label(np.int64(3)) == 3
+
+        with pytest.raises(TypeError):
+            config_key({'pricing': lambda trip: 0}, 60, seed)
+
+    def test_independent_of_workers(self):
+        configs = grid(num_bikes = [30, 60], checkout_rate = [0.1, 0.2])
+        serial = sweep(configs, 300, seed = 1, workers = 1)
+        parallel = sweep(configs, 300, seed = 1, workers = 2, chunksize = 2)
+        assert serial == parallel
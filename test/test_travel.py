@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from scipy.spatial.distance import cityblock, euclidean
+from sim.travel import travel_time_matrix, travel_times, TravelTimes
+
+@pytest.fixture
+def locations():
+    return np.array([[-5, -5], [0, 5], [5, 0], [3, -4]])
+
+class TestTravelTimeMatrix:
+
+    def test_cityblock(self, locations):
+        times = travel_time_matrix(locations, 0.5)
+
+        assert times.dtype == np.int16, 'Matrix should be stored compactly'
+        for i, loc_1 in enumerate(locations):
+            for j, loc_2 in enumerate(locations):
+                assert times[i, j] == int(cityblock(loc_1, loc_2) / 0.5)
+
+    def test_euclidean(self, locations):
+        times = travel_time_matrix(locations, 0.5, 'euclidean')
+
+        for i, loc_1 in enumerate(locations):
+            for j, loc_2 in enumerate(locations):
+                assert times[i, j] == int(euclidean(loc_1, loc_2) / 0.5)
+
+    def test_user_times(self, locations):
+        road_times = np.full((4, 4), 40000)
+        times = travel_time_matrix(locations, 0.5, road_times)
+
+        assert times.dtype == np.int32, 'Long trips should not overflow'
+        assert np.all(times == 40000)
+
+    def test_at_least_one_minute(self):
+        # Two stations at the same point and one a fraction of a minute away
+        locations = np.array([[0, 0], [0, 0], [3, 0]])
+        expected = np.ones((3, 3)) - np.eye(3)
+
+        assert np.array_equal(travel_time_matrix(locations, 5), expected)
+        lazy = TravelTimes(locations, 5, 'euclidean')
+        assert np.array_equal(lazy[np.arange(3)], expected)
+        assert np.array_equal(lazy[1], expected[1])
+        assert lazy[0, 1] == lazy[2, 0] == 1 and lazy[1, 1] == 0
+
+        road_times = np.array([[0, 0], [0, 0]])
+        assert np.array_equal(
+            travel_time_matrix(locations[:2], 5, road_times), [[0, 1], [1, 0]]
+        )
+
+    def test_errors(self, locations):
+        with pytest.raises(ValueError):
+            travel_time_matrix(locations, 0.5, 'chebyshev')
+        with pytest.raises(ValueError):
+            travel_time_matrix(locations, 0.5, np.ones((3, 3)))
+        with pytest.raises(ValueError):
+            travel_time_matrix(locations, 0)
+
+class TestTravelTimes:
+
+    @pytest.mark.parametrize('metric', ['cityblock', 'euclidean'])
+    def test_matches_matrix(self, metric):
+        locations = np.random.default_rng(0).integers(-50, 50, (30, 2))
+        matrix = travel_time_matrix(locations, 0.7, metric)
+        lazy = TravelTimes(locations, 0.7, metric)
+
+        assert lazy.shape == matrix.shape and lazy.dtype == matrix.dtype
+        assert np.array_equal(lazy[np.arange(30)], matrix)
+        assert np.array_equal(lazy[3], matrix[3])
+        assert np.array_equal(lazy[3, [1, 2]], matrix[3, [1, 2]])
+        assert all(
+            lazy[i, j] == matrix[i, j] for i in range(30) for j in range(30)
+        )
+
+    def test_travel_times(self, locations):
+        assert isinstance(travel_times(locations, 0.5), np.ndarray)
+        assert isinstance(
+            travel_times(locations, 0.5, matrix_limit = 3), TravelTimes
+        )
+        assert isinstance(
+            travel_times(locations, 0.5, np.ones((4, 4)), matrix_limit = 3),
+            np.ndarray
+        ), 'Given travel times are always kept'
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from sim.triplog import TripLog
+from sim.sim import Simulation
+
+@pytest.fixture
+def trip_log():
+    trip_log = TripLog(capacity = 2)
+    for i in range(5):
+        trip_log.append(i, 1, 0, 1, 10 * i, 10 * i + 5, 5, 3.5)
+    return trip_log
+
+class TestTripLog:
+
+    def test_init_value_errors(self):
+        with pytest.raises(ValueError):
+            TripLog(0)
+
+    def test_append_grows(self, trip_log):
+        assert len(trip_log) == 5
+        assert trip_log.capacity >= 5
+        assert trip_log['bike_id'].tolist() == [0, 1, 2, 3, 4]
+        assert trip_log['end_time'].tolist() == [5, 15, 25, 35, 45]
+        assert trip_log['price'].dtype == np.float64
+
+    def test_views(self, trip_log):
+        arrays = trip_log.as_arrays()
+        assert set(arrays) == {name for name, _ in TripLog.columns}
+
+        # Columns share memory with the log rather than copying it
+        arrays['price'][0] = 9.0
+        assert trip_log['price'][0] == 9.0
+
+    def test_clear(self, trip_log):
+        trip_log.clear()
+        assert len(trip_log) == 0
+        assert len(trip_log['duration']) == 0
+
+class TestSimulationTripLog:
+
+    def test_matches_dock_logs(self):
+        simulation = Simulation(1440, seed = 0)
+        check_ins = [
+            trip for trip in simulation.full_log if 'end_time' in trip
+        ]
+        trip_log = simulation.trip_log
+
+        assert len(trip_log) == len(check_ins)
+        assert sorted(trip_log['price'].tolist()) == \
+            sorted(trip['price'] for trip in check_ins)
+        assert np.all(trip_log['start_station'] != trip_log['end_station'])
+        assert np.all(
+            trip_log['end_time'] - trip_log['start_time'] 
+            == trip_log['duration']
+        ), 'Trips do not last as long as they are charged for'
+
+    def test_without_dock_logs(self):
+        with_logs = Simulation(1440, seed = 0)
+        without_logs = Simulation(1440, seed = 0, dock_logs = False)
+
+        assert without_logs.full_log == []
+        assert np.array_equal(
+            without_logs.trip_log['price'], with_logs.trip_log['price']
+        )
@@ -0,0 +1,74 @@
+import csv
+import json
+import pytest
+from sim.writers import (
+    CSVTripWriter, JSONLinesTripWriter, ParquetTripWriter, open_writer
+)
+from sim.triplog import TripLog
+from sim.sim import Simulation
+
+@pytest.fixture
+def trip_log():
+    trip_log = TripLog()
+    trip_log.append(0, 1, 0, 2, 0, 10, 10, 3.5)
+    trip_log.append(1, 1, 2, 1, 5, 50, 45, 5.0)
+    return trip_log
+
+class TestWriters:
+
+    def test_csv(self, trip_log, tmp_path):
+        with CSVTripWriter(tmp_path / 'trips.csv') as writer:
+            writer.write(trip_log.as_arrays())
+            writer.write(trip_log.as_arrays())
+
+        with open(tmp_path / 'trips.csv') as f:
+            rows = list(csv.DictReader(f))
+        assert writer.rows == len(rows) == 4
+        assert rows[1]['duration'] == '45' and rows[1]['price'] == '5.0'
+
+    def test_json_lines(self, trip_log, tmp_path):
+        with JSONLinesTripWriter(tmp_path / 'trips.jsonl') as writer:
+            writer.write(trip_log.as_arrays())
+
+        with open(tmp_path / 'trips.jsonl') as f:
+            rows = [json.loads(line) for line in f]
+        assert rows[0] == {
+            'bike_id': 0, 'trip_id': 1, 'start_station': 0, 'end_station': 2,
+            'start_time': 0, 'end_time': 10, 'duration': 10, 'price': 3.5,
+            'bike_type': 0, 'member': False, 'start_fill': 1.0
+        }
+
+    def test_parquet(self, trip_log, tmp_path):
+        pq = pytest.importorskip('pyarrow.parquet')
+        with ParquetTripWriter(tmp_path / 'trips.parquet') as writer:
+            writer.write(trip_log.as_arrays())
+            writer.write(trip_log.as_arrays())
+
+        table = pq.read_table(tmp_path / 'trips.parquet')
+        assert table.num_rows == 4
+        assert table.column('price').to_pylist() == [3.5, 5.0, 3.5, 5.0]
+
+    def test_open_writer(self, tmp_path):
+        with open_writer(tmp_path / 'trips.jsonl') as writer:
+            assert isinstance(writer, JSONLinesTripWriter)
+        with pytest.raises(ValueError):
+            open_writer(tmp_path / 'trips.txt')
+
+class TestSimulationStreaming:
+
+    def test_streams_all_trips(self, tmp_path):
+        in_memory = Simulation(2880, seed = 0)
+
+        with CSVTripWriter(tmp_path / 'trips.csv') as writer:
+            streamed = Simulation(
+                2880, seed = 0, trip_writer = writer, batch_size = 16
+            )
+
+        assert len(streamed.trip_log) == 0, 'Trips kept in memory'
+        assert streamed.trip_log.capacity <= 1024
+        assert streamed.full_log == [], 'Dock logs kept with a writer'
+        assert writer.rows == len(in_memory.trip_log)
+
+        with open(tmp_path / 'trips.csv') as f:
+            prices = [float(row['price']) for row in csv.DictReader(f)]
+        assert prices == in_memory.trip_log['price'].tolist()